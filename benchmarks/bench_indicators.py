@@ -0,0 +1,79 @@
+"""
+지표 엔진 마이크로 벤치마크: 기존 pandas 구현 vs NumPy 커널 레지스트리
+
+실행: python -m benchmarks.bench_indicators [봉 개수 ...]
+"""
+import sys
+import timeit
+import numpy as np
+import pandas as pd
+from src.indicators.registry import compute_indicators
+from src.indicators.memo import IndicatorMemo
+
+
+INDICATORS = ["MA", "RSI", "MACD", "Bollinger"]
+NO_MEMO = IndicatorMemo(max_bytes=0)  # 계산 시간만 측정하도록 메모이제이션 끔
+
+
+def legacy_pandas_indicators(data: pd.DataFrame, indicators: list) -> pd.DataFrame:
+    """기존 calculate_technical_indicators (pandas rolling/ewm) 구현"""
+    df = data.copy()
+    for indicator in indicators:
+        if indicator == "MA":
+            df["MA20"] = df["Close"].rolling(window=20).mean()
+            df["MA50"] = df["Close"].rolling(window=50).mean()
+        elif indicator == "RSI":
+            delta = df["Close"].diff()
+            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+            rs = gain / loss
+            df["RSI"] = 100 - (100 / (1 + rs))
+        elif indicator == "MACD":
+            exp1 = df["Close"].ewm(span=12).mean()
+            exp2 = df["Close"].ewm(span=26).mean()
+            df["MACD"] = exp1 - exp2
+            df["MACD_Signal"] = df["MACD"].ewm(span=9).mean()
+            df["MACD_Histogram"] = df["MACD"] - df["MACD_Signal"]
+        elif indicator == "Bollinger":
+            df["BB_Middle"] = df["Close"].rolling(window=20).mean()
+            bb_std = df["Close"].rolling(window=20).std()
+            df["BB_Upper"] = df["BB_Middle"] + (bb_std * 2)
+            df["BB_Lower"] = df["BB_Middle"] - (bb_std * 2)
+    return df
+
+
+def make_ohlcv(n: int, seed: int = 0) -> pd.DataFrame:
+    """랜덤워크 OHLCV 생성"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    spread = np.abs(rng.normal(0, 0.005, n)) * close
+    index = pd.date_range("2020-01-01", periods=n, freq="min", tz="America/New_York")
+    return pd.DataFrame({
+        "Open": close + rng.normal(0, 0.002, n) * close,
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+        "Volume": rng.integers(1_000, 100_000, n).astype(np.float64),
+    }, index=index)
+
+
+def bench(n: int, repeat: int = 5):
+    data = make_ohlcv(n)
+    legacy = legacy_pandas_indicators(data, INDICATORS)
+    engine = compute_indicators(data, INDICATORS, memo=NO_MEMO)
+    # pandas rolling std는 긴 시계열에서 온라인 갱신 오차가 누적되므로 상대오차 1e-7까지 허용
+    for col in legacy.columns:
+        np.testing.assert_allclose(engine[col].to_numpy(), legacy[col].to_numpy(), rtol=1e-7, atol=1e-8,
+                                   err_msg=f"{col} 값이 기존 구현과 다릅니다")
+
+    number = max(1, 200_000 // n)
+    legacy_time = min(timeit.repeat(lambda: legacy_pandas_indicators(data, INDICATORS), number=number, repeat=repeat)) / number
+    engine_time = min(timeit.repeat(lambda: compute_indicators(data, INDICATORS, memo=NO_MEMO), number=number, repeat=repeat)) / number
+    print(f"{n:>10,}봉 | pandas {legacy_time * 1e3:9.3f} ms | numpy {engine_time * 1e3:9.3f} ms | x{legacy_time / engine_time:5.2f}")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000, 1_000_000]
+    print(f"지표: {', '.join(INDICATORS)}")
+    for n in sizes:
+        bench(n)
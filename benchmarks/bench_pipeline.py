@@ -0,0 +1,42 @@
+"""
+네트워크 없이 yfinance_node 파이프라인 측정 (가상 시세 제공자 사용)
+
+실행: python -m benchmarks.bench_pipeline [종목 수] [기간] [간격]
+예: python -m benchmarks.bench_pipeline 20 10y 1m
+"""
+import os
+import sys
+import tempfile
+import time
+
+# 가상 시세 캐시는 임시 디렉터리에 (실제 캐시와 분리)
+os.environ.setdefault("CHART_CACHE_DIR", tempfile.mkdtemp(prefix="bench_cache_"))
+
+from src.data.providers import SyntheticProvider, set_provider
+from src.tools.yfinance_tool import yfinance_node
+
+
+INDICATORS = ["MA(20,60)", "RSI", "MACD", "Bollinger"]
+
+
+def run(tickers: list, period: str, interval: str) -> float:
+    state = {"chart_params": {"tickers": tickers, "period": period, "interval": interval,
+                              "chart_type": "candle", "indicators": INDICATORS}}
+    start = time.perf_counter()
+    result = yfinance_node(state)
+    elapsed = time.perf_counter() - start
+    if result.get("error_type"):
+        raise RuntimeError(result.get("chart_output"))
+    return elapsed
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    period = sys.argv[2] if len(sys.argv) > 2 else "1y"
+    interval = sys.argv[3] if len(sys.argv) > 3 else "1h"
+    tickers = [f"SYN{i:03d}" for i in range(count)]
+
+    set_provider(SyntheticProvider())
+    cold = run(tickers, period, interval)
+    warm = run(tickers, period, interval)
+    print(f"\n종목 {count}개, {period} {interval} | 최초 {cold * 1e3:,.1f} ms | 캐시 {warm * 1e3:,.1f} ms")
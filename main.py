@@ -5,6 +5,8 @@ import os
 from dotenv import load_dotenv
 from src.workflow.workflow import create_workflow
 from src.utils.graph_utils import show_graph
+from src.llm import warm_up
+from src.tools.chart_description import ready_descriptions
 
 # 환경 변수 로드
 load_dotenv()
@@ -14,6 +16,17 @@ os.environ["LANGCHAIN_TRACING_V2"] = "true"
 os.environ["LANGCHAIN_PROJECT"] = os.getenv("LANGSMITH_PROJECT", "stock-chart-agent")
 os.environ["LANGCHAIN_API_KEY"] = os.getenv("LANGSMITH_API_KEY")
 
+# LLM 클라이언트와 API 연결을 백그라운드에서 미리 준비 (CHART_LLM_WARMUP=0이면 생략)
+warm_up()
+
+
+def print_ready_descriptions():
+    """백그라운드에서 완료된 LLM 차트 설명 출력 (CHART_DESCRIPTION_MODE=deferred)"""
+    for chart_file, description in ready_descriptions():
+        print(f"📝 차트 설명 ({chart_file}):\n{description}")
+        print("-" * 50)
+
+
 # 워크플로우 생성
 workflow = create_workflow()
 show_graph(workflow)
@@ -32,6 +45,7 @@ if __name__ == "__main__":
     
     while True:
         try:
+            print_ready_descriptions()
             # 사용자 입력 받기
             user_input = input("💬 사용자: ").strip()
             
@@ -77,6 +91,7 @@ if __name__ == "__main__":
                     print(f"🤖 AI: {current_values['chart_output']}")
                 print("-" * 50)
                 
+                print_ready_descriptions()
                 # 사용자 입력 받기
                 while True:
                     additional_input = input("💬 사용자: ").strip()
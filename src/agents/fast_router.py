@@ -0,0 +1,190 @@
+"""
+빠른 라우터: LLM 호출 전에 키워드/종목 색인/차트 용어로 분류 (한국어·영어)
+- "NVDA 1년 봉차트", "안녕"처럼 분명한 메시지는 여기서 결정하고 LLM 라우터 호출을 생략
+- 신뢰도가 ROUTER_FAST_MIN_CONFIDENCE 미만이면 결정하지 않음 (→ LLM 라우터)
+- 빠른 경로 결정 비율과 LLM 단계별 지연을 집계해 출력하고, CHART_ROUTER_LOG를 지정하면 분류 기록을 JSONL로 남김 (기준 조정용)
+"""
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from .. import config
+from ..data.tickers import get_ticker_index, normalize_key
+
+
+# 차트/시세 용어 (있으면 차트 요청 근거)
+CHART_WORDS = {
+    "차트", "봉차트", "캔들", "캔들차트", "캔들스틱", "그래프", "시각화", "주가", "시세", "일봉", "주봉", "월봉", "분봉",
+    "시간봉", "이평선", "이동평균", "이동평균선", "일선", "지수이동평균", "거래량", "볼린저", "볼린저밴드", "스토캐스틱",
+    "라인차트", "선차트", "종가",
+    "chart", "charts", "candle", "candles", "candlestick", "graph", "price", "prices", "ohlc", "ohlcv",
+    "volume", "bollinger", "stochastic",
+}
+# 주식과 무관하게도 쓰는 일반 시각화 용어 ("sin(x) 그래프 그려줘") → 종목 없이 이것만 있으면 LLM이 판단
+GENERIC_CHART_WORDS = {"차트", "그래프", "시각화", "chart", "charts", "graph"}
+# 지표 약어 (대문자 티커와 겹치는 MA 등은 종목이 아니라 지표로 취급)
+INDICATOR_WORDS = {"ma", "sma", "ema", "rsi", "macd", "vwap", "obv", "atr", "bb"}
+# 보여달라는 표현
+SHOW_WORDS = ("보여", "그려", "띄워", "나타내", "뽑아", "show", "draw", "display", "visualize", "plot")
+# 인사/잡담 (차트 근거가 없으면 일반 대화)
+SMALLTALK_WORDS = {
+    "안녕", "안녕하세요", "안녕하십니까", "하이", "ㅎㅇ", "반가워", "반갑습니다", "고마워", "고맙습니다", "감사", "감사합니다",
+    "땡큐", "잘가", "수고", "수고하셨습니다", "ㅋㅋ", "ㅎㅎ", "누구야", "누구세요", "뭐해", "날씨", "심심해",
+    "hi", "hello", "hey", "thanks", "thank", "bye", "goodbye", "weather", "who",
+}
+# 설명을 묻는 표현 (지표 용어가 있어도 차트가 아니라 질문일 수 있음 → LLM)
+QUESTION_WORDS = ("뭐야", "뭔가요", "무엇", "뭐예요", "뭐에요", "의미", "설명", "알려줘", "어떻게", "왜", "추천",
+                  "what", "why", "how", "explain", "meaning", "recommend")
+# 조사 (종목명 뒤에 붙는 것: "엔비디아의", "삼성전자랑")
+JOSA = ("에서", "으로", "하고", "이랑", "이나", "의", "를", "을", "이", "가", "은", "는", "와", "과", "랑", "도", "로", "만", "나")
+
+_PERIOD_PATTERN = re.compile(
+    r"\d+\s*(년|개월|달|주일|주|일|분|시간|거래일|개\s*봉|봉)"
+    r"|\b\d+\s*(y|yr|years?|mo|months?|w|wk|weeks?|d|days?|m|min|h|hr|hours?)\b"
+    r"|\b(ytd|daily|weekly|monthly|intraday)\b|올해|작년|최근|하루|한\s*달|반년",
+    re.IGNORECASE)
+_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9^][A-Za-z0-9.\-^=]*|[가-힣ㄱ-ㅎ]+")
+
+
+@dataclass
+class FastRoute:
+    """빠른 분류 결과 (is_chart_request가 None이면 결정하지 않음)"""
+    is_chart_request: Optional[bool]
+    confidence: float
+    reasons: List[str] = field(default_factory=list)
+    tickers: List[str] = field(default_factory=list)
+
+
+def _strip_josa(word: str) -> List[str]:
+    candidates = [word]
+    for josa in JOSA:
+        if word.endswith(josa) and len(word) - len(josa) >= 2:
+            candidates.append(word[:-len(josa)])
+    return candidates
+
+
+def find_tickers(message: str) -> List[str]:
+    """메시지에서 종목 색인과 일치하는 티커 (대문자 심볼, 이름/별칭, 조사 제거한 한글 이름)"""
+    index = get_ticker_index()
+    found = []
+    for token in _TOKEN_PATTERN.findall(message):
+        key = normalize_key(token)
+        if not key or key in INDICATOR_WORDS:
+            continue
+        for candidate in _strip_josa(token) if re.match(r"[가-힣]", token) else [token]:
+            info = index.lookup(candidate)
+            if info is None:
+                continue
+            symbol_match = normalize_key(info.ticker) == normalize_key(candidate)
+            # 심볼은 대문자 2글자 이상으로 쓴 경우만 (on, all, v 같은 일반 단어 제외), 이름은 2글자 이상
+            if symbol_match and not (candidate.isupper() and len(candidate) >= 2) and not candidate[0].isdigit():
+                continue
+            if len(normalize_key(candidate)) < 2:
+                continue
+            if info.ticker not in found:
+                found.append(info.ticker)
+            break
+    return found
+
+
+def classify_fast(message: str) -> FastRoute:
+    """키워드 기반 분류 → FastRoute (신뢰도 0~1)"""
+    text = message.strip()
+    lowered = text.lower()
+    words = [w.lower() for w in _TOKEN_PATTERN.findall(text)]
+    stems = {stem for w in words for stem in _strip_josa(w)}
+
+    tickers = find_tickers(text)
+    # 한글은 붙여 쓴 경우("1년봉차트")도 찾도록 부분 문자열, 영어는 단어 단위
+    chart_words = sorted(w for w in CHART_WORDS if w in stems or (not w.isascii() and w in lowered))
+    indicators = sorted(stems & INDICATOR_WORDS)
+    has_period = bool(_PERIOD_PATTERN.search(text))
+    wants_show = any(word in lowered for word in SHOW_WORDS)
+    asks_question = any(word in lowered for word in QUESTION_WORDS) or text.endswith("?")
+    smalltalk = sorted(stems & SMALLTALK_WORDS)
+
+    reasons = []
+    if tickers:
+        reasons.append(f"종목 {', '.join(tickers)}")
+    if chart_words or indicators:
+        reasons.append(f"차트 용어 {', '.join(chart_words + indicators)}")
+    if has_period:
+        reasons.append("기간/간격 표현")
+    if wants_show:
+        reasons.append("표시 요청")
+
+    # 차트 근거 점수
+    score = (0.45 if tickers else 0) + (0.35 if chart_words else 0) + (0.2 if indicators else 0) \
+        + (0.2 if has_period else 0) + (0.15 if wants_show else 0)
+    if asks_question and not wants_show:
+        # "RSI가 뭐야?", "애플 주식 사도 될까?" → 설명/상담일 수 있어 LLM에 맡김
+        return FastRoute(None, 0.5, reasons + ["질문 표현"], tickers)
+    if tickers and (chart_words or indicators or has_period or wants_show):
+        return FastRoute(True, min(0.99, 0.5 + score), reasons, tickers)
+    stock_words = [w for w in chart_words if w not in GENERIC_CHART_WORDS]
+    if (stock_words or indicators) and (wants_show or has_period):
+        # 종목 없이 "캔들차트 그려줘" → 차트 요청 (종목은 파라미터 단계에서 질문)
+        return FastRoute(True, min(0.95, 0.45 + score), reasons, tickers)
+    if smalltalk and score == 0 and len(words) <= 6:
+        return FastRoute(False, 0.95, [f"인사/잡담 {', '.join(smalltalk)}"], tickers)
+    if not text:
+        return FastRoute(False, 0.99, ["빈 메시지"], tickers)
+    # 근거가 약하거나 없으면 LLM이 판단
+    return FastRoute(None, round(min(0.7, score), 2), reasons, tickers)
+
+
+class FastRouterStats:
+    """빠른 경로 결정 비율 집계 (+ 선택적 JSONL 기록)"""
+
+    def __init__(self, log_path: str = None):
+        self.log_path = log_path if log_path is not None else config.ROUTER_FAST_LOG
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {"total": 0, "fast_chart": 0, "fast_general": 0, "llm": 0}
+        self.latency: Dict[str, List[float]] = {}   # 단계 → [호출 수, 누적 초]
+
+    def record(self, message: str, route: FastRoute, path: str, is_chart_request: bool, seconds: float):
+        with self._lock:
+            self.counts["total"] += 1
+            self.counts[path] += 1
+            if self.log_path:
+                entry = {"ts": time.time(), "message": message, "path": path, "is_chart_request": is_chart_request,
+                         "fast_guess": route.is_chart_request, "confidence": route.confidence,
+                         "reasons": route.reasons, "ms": round(seconds * 1000, 2)}
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    @property
+    def fast_rate(self) -> float:
+        total = self.counts["total"]
+        return (self.counts["fast_chart"] + self.counts["fast_general"]) / total if total else 0.0
+
+    def record_latency(self, stage: str, seconds: float):
+        """LLM 단계별 지연 (router_llm, param_llm, combined_llm)"""
+        with self._lock:
+            entry = self.latency.setdefault(stage, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    def average_ms(self, stage: str) -> Optional[float]:
+        count, total = self.latency.get(stage, (0, 0.0))
+        return total / count * 1000 if count else None
+
+    def latency_summary(self) -> str:
+        """방식별 평균 지연: 통합 호출 vs 두 번 호출(라우터 + 파라미터 추출)"""
+        parts = []
+        combined = self.average_ms("combined_llm")
+        if combined is not None:
+            parts.append(f"통합 {combined:.0f}ms ({self.latency['combined_llm'][0]}회)")
+        router, param = self.average_ms("router_llm"), self.average_ms("param_llm")
+        if router is not None and param is not None:
+            parts.append(f"두 번 호출 {router + param:.0f}ms (라우터 {router:.0f} + 파라미터 {param:.0f})")
+        return " | ".join(parts) or "측정 없음"
+
+    def summary(self) -> str:
+        fast = self.counts["fast_chart"] + self.counts["fast_general"]
+        return f"빠른 경로 {fast}/{self.counts['total']} ({self.fast_rate:.0%})"
+
+
+router_stats = FastRouterStats()
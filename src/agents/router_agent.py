@@ -1,39 +1,96 @@
 """
 Router Agent: 사용자 메시지에서 차트 요청 의도를 판별
 """
-from typing import Dict, Any
-from langchain.chat_models import init_chat_model
-from ..schemas import State, RouterSchema
-from ..prompts import ROUTER_SYSTEM_PROMPT, ROUTER_USER_PROMPT
+import time
+from typing import Dict, Any, Optional
+from .. import config
+from ..llm import get_chat_model
+from ..schemas import State, RouterSchema, RoutedParamSchema
+from ..prompts import ROUTER_SYSTEM_PROMPT, ROUTER_USER_PROMPT, COMBINED_ROUTER_PARAM_SYSTEM_PROMPT
+from ..tools.param_tool import build_param_messages, build_param_update
+from .fast_router import FastRoute, classify_fast, router_stats
 
 
 def router_agent(state: State) -> State:
     """
     Router Agent: 사용자 메시지에서 차트 요청 의도를 판별
-    - 차트 관련 키워드 분석
-    - 일반 대화 vs 차트 요청 구분
+    - 키워드/종목 색인 기반 빠른 분류로 분명한 메시지는 바로 결정
+    - 애매하면 LLM으로 일반 대화 vs 차트 요청 구분
     """
     print("🔀 Router Agent 실행 중...")
-    
-    # LLM 초기화
-    llm = init_chat_model("openai:gpt-4o", temperature=0.0)
-    llm_router = llm.with_structured_output(RouterSchema) # llm이 출력값을 해당 schema에 맞게 반환하도록 하는 내장 method
+    started = time.perf_counter()
+    user_message = state["user_message"]
+
+    # 빠른 분류 (LLM 호출 없음)
+    route = classify_fast(user_message)
+    if route.is_chart_request is not None and route.confidence >= config.ROUTER_FAST_MIN_CONFIDENCE:
+        is_chart_request = route.is_chart_request
+        router_stats.record(user_message, route, "fast_chart" if is_chart_request else "fast_general",
+                            is_chart_request, time.perf_counter() - started)
+        print(f"⚡ 빠른 라우팅: {'차트 요청' if is_chart_request else '일반 대화'} "
+              f"(신뢰도 {route.confidence:.2f}, {'; '.join(route.reasons)}) | {router_stats.summary()}")
+        return {
+            "is_chart_request": is_chart_request,
+            "routing_decision": "chart_request" if is_chart_request else "general_chat",
+            "params_extracted": False
+        }
+
+    if config.ROUTER_COMBINED:
+        update = route_and_extract(state, route, started)
+        if update is not None:
+            return update
+
+    # 공용 LLM 인스턴스 (프로세스에서 한 번만 생성)
+    llm_router = get_chat_model(temperature=0.0, schema=RouterSchema, cache_site="router") # llm이 출력값을 해당 schema에 맞게 반환하도록 하는 공용 인스턴스
     
     # 프롬프트 구성
-    user_prompt = ROUTER_USER_PROMPT.format(user_message=state["user_message"])
+    user_prompt = ROUTER_USER_PROMPT.format(user_message=user_message)
     
     # LLM 호출
+    llm_started = time.perf_counter()
     result = llm_router.invoke([
         {"role": "system", "content": ROUTER_SYSTEM_PROMPT},
         {"role": "user", "content": user_prompt}
     ])
+    router_stats.record_latency("router_llm", time.perf_counter() - llm_started)
+    router_stats.record(user_message, route, "llm", result.is_chart_request, time.perf_counter() - started)
     
     # 결과 출력
     print(f"분류 근거: {result.reasoning}")
-    print(f"분류 결과: {result.is_chart_request}")
+    print(f"분류 결과: {result.is_chart_request} (빠른 분류 신뢰도 {route.confidence:.2f}) | {router_stats.summary()}")
+    if router_stats.latency:
+        print(f"⏱️  LLM 지연: {router_stats.latency_summary()}")
     
     # 상태 업데이트
     return {
         "is_chart_request": result.is_chart_request,
-        "routing_decision": "chart_request" if result.is_chart_request else "general_chat"
+        "routing_decision": "chart_request" if result.is_chart_request else "general_chat",
+        "params_extracted": False
     }
+
+
+def route_and_extract(state: State, route: FastRoute, started: float) -> Optional[State]:
+    """
+    라우팅 + 파라미터 추출을 LLM 한 번으로 (CHART_ROUTER_COMBINED=1)
+    - 차트 요청이면 param_tool 없이 파라미터 결과까지 반영 (→ yfinance_node 또는 param_interrupt)
+    - 호출/파싱이 실패하면 None → 기존 두 번 호출(라우터 → param_tool)로 진행
+    """
+    llm_combined = get_chat_model(temperature=0.0, schema=RoutedParamSchema, cache_site="router_param")
+    llm_started = time.perf_counter()
+    try:
+        result = llm_combined.invoke(build_param_messages(state, COMBINED_ROUTER_PARAM_SYSTEM_PROMPT, site="router_param"))
+    except Exception as e:
+        print(f"⚠️  통합 라우팅 실패 → 라우터/파라미터 두 번 호출로 진행: {str(e)}")
+        return None
+    router_stats.record_latency("combined_llm", time.perf_counter() - llm_started)
+    router_stats.record(state["user_message"], route, "llm", result.is_chart_request, time.perf_counter() - started)
+
+    print(f"분류 근거: {result.reasoning}")
+    print(f"분류 결과: {result.is_chart_request} (통합 호출) | {router_stats.summary()} | {router_stats.latency_summary()}")
+    if not result.is_chart_request:
+        return {"is_chart_request": False, "routing_decision": "general_chat", "params_extracted": False}
+
+    print(f"파라미터 추출 결과: {result}")
+    update = build_param_update(result)
+    update.update({"is_chart_request": True, "routing_decision": "chart_request", "params_extracted": True})
+    return update
@@ -0,0 +1,104 @@
+"""
+환경 변수 기반 설정값
+"""
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    """정수형 환경 변수 읽기 (잘못된 값이면 기본값 사용)"""
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """실수형 환경 변수 읽기 (잘못된 값이면 기본값 사용)"""
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+# 시세 제공자: yfinance | synthetic (네트워크 없는 가상 시세) | parquet (디렉터리의 Parquet 파일)
+DATA_PROVIDER = os.getenv("CHART_DATA_PROVIDER", "yfinance").strip().lower()
+SYNTHETIC_SEED = _env_int("CHART_SYNTHETIC_SEED", 0)
+PARQUET_DATA_DIR = os.getenv("CHART_PARQUET_DIR", os.path.join("data", "ohlcv"))
+
+# 추가 종목 목록 CSV (기본 목록 src/data/tickers.csv에 더해 색인)
+TICKER_UNIVERSE_PATH = os.getenv("CHART_TICKER_UNIVERSE", "")
+
+# OHLCV 디스크 캐시 설정
+CACHE_DIR = os.getenv("CHART_CACHE_DIR", os.path.join(".cache", "ohlcv"))
+CACHE_MAX_BYTES = _env_int("CHART_CACHE_MAX_BYTES", 512 * 1024 * 1024)  # 캐시 전체 최대 용량
+CACHE_MAX_AGE_SECONDS = _env_int("CHART_CACHE_MAX_AGE", 7 * 24 * 3600)  # 마지막 수집 후 보관 기간
+CACHE_FRESH_SECONDS = _env_int("CHART_CACHE_FRESH", 60)                 # 이 시간 안의 재요청은 네트워크 없이 응답
+
+# 분봉 장기 이력용 메모리 맵 저장소 (여러 워커 프로세스가 페이지 캐시를 공유)
+MMAP_STORE_DIR = os.getenv("CHART_MMAP_DIR", os.path.join(".cache", "series"))
+MMAP_STORE_INTERVALS = [i.strip() for i in os.getenv(
+    "CHART_MMAP_INTERVALS", "1m,2m,5m,15m,30m,60m,90m,1h,4h").split(",") if i.strip()]  # 비우면 사용 안 함
+
+# 여러 종목 동시 수집 시 최대 스레드 수
+FETCH_MAX_WORKERS = _env_int("CHART_FETCH_MAX_WORKERS", 8)
+
+# 시세 서버 보호 (yfinance 요청에만 적용)
+FETCH_RATE_PER_SECOND = _env_float("CHART_FETCH_RATE", 2.0)            # 초당 요청 수 (0이면 제한 없음)
+FETCH_BURST = _env_float("CHART_FETCH_BURST", 5)                       # 한 번에 몰아 보낼 수 있는 요청 수
+FETCH_MAX_ATTEMPTS = _env_int("CHART_FETCH_MAX_ATTEMPTS", 3)           # 일시적 오류 시 최대 시도 횟수
+FETCH_BACKOFF_BASE = _env_float("CHART_FETCH_BACKOFF_BASE", 0.5)       # 재시도 대기 기준 (초, 시도마다 2배)
+FETCH_BACKOFF_MAX = _env_float("CHART_FETCH_BACKOFF_MAX", 8.0)         # 재시도 대기 상한 (초)
+CIRCUIT_FAILURE_THRESHOLD = _env_int("CHART_CIRCUIT_FAILURES", 5)      # 연속 실패 몇 번이면 차단할지
+CIRCUIT_RESET_SECONDS = _env_float("CHART_CIRCUIT_RESET", 30.0)        # 차단 유지 시간 (초)
+
+# 실패한 조회 기억 (같은 (티커, 기간, 간격) 재요청은 네트워크 없이 바로 실패)
+NEGATIVE_CACHE_TTL_SECONDS = _env_float("CHART_NEGATIVE_TTL", 600.0)            # 없는 종목(잘못된 티커, 상장폐지)
+NEGATIVE_CACHE_EMPTY_TTL_SECONDS = _env_float("CHART_NEGATIVE_EMPTY_TTL", 30.0)  # 빈 응답 (일시적 제한일 수 있음)
+NEGATIVE_CACHE_ERROR_TTL_SECONDS = _env_float("CHART_NEGATIVE_ERROR_TTL", 60.0)  # 수집 오류
+NEGATIVE_CACHE_MAX_ENTRIES = _env_int("CHART_NEGATIVE_MAX_ENTRIES", 4096)
+CORRECTION_MAX_ATTEMPTS = _env_int("CHART_CORRECTION_MAX_ATTEMPTS", 2)          # 자동 보정 후 재수집 최대 횟수
+
+# 실시간 차트 (src.live)
+LIVE_HOST = os.getenv("CHART_LIVE_HOST", "127.0.0.1")
+LIVE_PORT = _env_int("CHART_LIVE_PORT", 8765)
+LIVE_POLL_SECONDS = _env_float("CHART_LIVE_POLL", 5.0)          # 차트별 시세 폴링 주기 (초)
+LIVE_MAX_POINTS = _env_int("CHART_LIVE_MAX_POINTS", 2000)       # 차트별 보관/표시하는 최대 봉 수
+LIVE_MAX_CHARTS = _env_int("CHART_LIVE_MAX_CHARTS", 64)         # 프로세스당 최대 실시간 차트 수
+LIVE_MAX_CONCURRENT_POLLS = _env_int("CHART_LIVE_MAX_POLLS", 8)  # 동시에 진행하는 폴링 수
+
+# 빠른 라우터: 이 신뢰도 이상이면 LLM 라우터 없이 결정 (1 초과면 항상 LLM)
+ROUTER_FAST_MIN_CONFIDENCE = _env_float("CHART_ROUTER_FAST_MIN_CONFIDENCE", 0.85)
+ROUTER_FAST_LOG = os.getenv("CHART_ROUTER_LOG", "")   # 분류 기록 JSONL 경로 (비우면 기록 안 함)
+# 라우팅 + 파라미터 추출을 LLM 한 번으로 (실패하면 라우터 → param_tool 두 번 호출로 대체)
+ROUTER_COMBINED = os.getenv("CHART_ROUTER_COMBINED", "0").strip().lower() in ("1", "true", "yes")
+
+# LLM 클라이언트 (src.llm): 프로세스 공용 인스턴스와 keep-alive 연결 풀
+LLM_MODEL = os.getenv("CHART_LLM_MODEL", "openai:gpt-4o")
+LLM_TIMEOUT_SECONDS = _env_float("CHART_LLM_TIMEOUT", 60.0)
+LLM_MAX_CONNECTIONS = _env_int("CHART_LLM_MAX_CONNECTIONS", 20)
+LLM_KEEPALIVE_SECONDS = _env_float("CHART_LLM_KEEPALIVE", 120.0)      # 쉬는 연결을 유지하는 시간 (초)
+LLM_WARMUP = os.getenv("CHART_LLM_WARMUP", "1").strip().lower() not in ("0", "false", "no", "")  # 시작 시 연결 미리 열기
+
+# 구조화 출력 LLM 응답 캐시 (라우터/파라미터 추출/편집 파싱/의도 분류, prompts.py가 바뀌면 무효화)
+LLM_CACHE_ENABLED = os.getenv("CHART_LLM_CACHE", "1").strip().lower() not in ("0", "false", "no", "")
+LLM_CACHE_PATH = os.getenv("CHART_LLM_CACHE_PATH", os.path.join(".cache", "llm_responses.sqlite"))
+LLM_CACHE_MEMORY_ENTRIES = _env_int("CHART_LLM_CACHE_MEMORY_ENTRIES", 1024)   # 메모리 LRU 항목 수
+LLM_CACHE_MAX_ROWS = _env_int("CHART_LLM_CACHE_MAX_ROWS", 100000)             # 디스크 최대 항목 수
+LLM_CACHE_TTL_SECONDS = _env_int("CHART_LLM_CACHE_TTL", 7 * 24 * 3600)
+
+# 차트 설명: template(LLM 없이 바로), deferred(템플릿으로 응답 후 LLM 설명을 백그라운드로), llm(LLM 설명을 기다림)
+DESCRIPTION_MODE = os.getenv("CHART_DESCRIPTION_MODE", "template").strip().lower()
+
+# param_tool LLM 입력 토큰 예산 (시스템 프롬프트 + 확정 파라미터 + 최근 대화 + 현재 요청)
+PARAM_TOKEN_BUDGET = _env_int("CHART_PARAM_TOKEN_BUDGET", 2500)
+PARAM_CONTEXT_MAX_MESSAGES = _env_int("CHART_PARAM_CONTEXT_MAX_MESSAGES", 8)    # 포함할 최근 대화 메시지 최대 수
+PARAM_CONTEXT_MESSAGE_CHARS = _env_int("CHART_PARAM_CONTEXT_MESSAGE_CHARS", 400)  # 이전 메시지 하나의 최대 글자 수
+
+# 대화 메모리 (src.memory): 세션별 최근 턴 원문 + 이전 턴 요약
+MEMORY_RECENT_TURNS = _env_int("CHART_MEMORY_RECENT_TURNS", 6)        # 원문으로 유지하는 최근 턴 수
+MEMORY_SUMMARY_BATCH = _env_int("CHART_MEMORY_SUMMARY_BATCH", 4)      # 몇 턴이 넘치면 한 번에 요약할지
+MEMORY_SUMMARY_MAX_CHARS = _env_int("CHART_MEMORY_SUMMARY_MAX_CHARS", 1200)
+MEMORY_SUMMARY_MODE = os.getenv("CHART_MEMORY_SUMMARY_MODE", "compact").strip().lower()   # compact 또는 llm
+
+# 지표 계산 결과 메모이제이션 최대 용량 (프로세스 공용, 0이면 사용 안 함)
+INDICATOR_MEMO_MAX_BYTES = _env_int("CHART_INDICATOR_MEMO_MAX_BYTES", 256 * 1024 * 1024)
@@ -0,0 +1,3 @@
+"""
+시세 데이터 모듈들
+"""
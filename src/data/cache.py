@@ -0,0 +1,192 @@
+"""
+OHLCV 디스크 캐시: (티커, 간격)별 Parquet 파일에 시세를 보관하고 증분 갱신
+"""
+import json
+import os
+import re
+import threading
+import time
+from typing import Optional, Dict, Any
+import pandas as pd
+from .. import config
+
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def merge_ohlcv(cached: Optional[pd.DataFrame], new: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """기존 시세와 새 시세를 합치기 (같은 시점은 새 값 우선, 시간순 정렬)"""
+    frames = [df for df in (cached, new) if df is not None and not df.empty]
+    if not frames:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+    if len(frames) == 1:
+        return frames[0]
+    merged = pd.concat(frames)
+    merged = merged[~merged.index.duplicated(keep="last")]
+    return merged.sort_index()
+
+
+class OHLCVCache:
+    """
+    (티커, 간격) 단위 Parquet 캐시
+    - {key}.parquet: OHLCV 시세
+    - {key}.json: 메타데이터 (수집 시각, 마지막 접근 시각, 커버 시작 시점)
+    - {key}.state.json: 증분 지표 상태 (지표 조합별, 시세와 함께 삭제)
+    - max_bytes 초과 시 가장 오래 사용되지 않은 항목부터 삭제
+    - 마지막 수집 후 max_age_seconds가 지난 항목은 만료
+    """
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = None, max_age_seconds: int = None):
+        self.cache_dir = cache_dir or config.CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else config.CACHE_MAX_BYTES
+        self.max_age_seconds = max_age_seconds if max_age_seconds is not None else config.CACHE_MAX_AGE_SECONDS
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _key(self, ticker: str, interval: str) -> str:
+        safe_ticker = re.sub(r"[^A-Za-z0-9._-]", "_", ticker.upper())
+        return f"{safe_ticker}__{interval}"
+
+    def _paths(self, ticker: str, interval: str):
+        key = self._key(ticker, interval)
+        return (os.path.join(self.cache_dir, f"{key}.parquet"),
+                os.path.join(self.cache_dir, f"{key}.json"))
+
+    def _read_meta(self, meta_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, meta_path: str, meta: Dict[str, Any]):
+        tmp_path = f"{meta_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def _state_path(self, data_path: str) -> str:
+        return data_path[:-len(".parquet")] + ".state.json"
+
+    def _remove(self, data_path: str, meta_path: str):
+        for path in (data_path, meta_path, self._state_path(data_path)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def get_meta(self, ticker: str, interval: str) -> Optional[Dict[str, Any]]:
+        """캐시 항목의 메타데이터 (없거나 만료되었으면 None)"""
+        data_path, meta_path = self._paths(ticker, interval)
+        meta = self._read_meta(meta_path)
+        if meta is None or not os.path.exists(data_path):
+            return None
+        if time.time() - meta.get("fetched_at", 0) > self.max_age_seconds:
+            print(f"🗑️  캐시 만료: {ticker} {interval}")
+            with self._lock:
+                self._remove(data_path, meta_path)
+            return None
+        return meta
+
+    def load(self, ticker: str, interval: str) -> Optional[pd.DataFrame]:
+        """캐시된 시세 읽기 (없거나 만료되었으면 None)"""
+        meta = self.get_meta(ticker, interval)
+        if meta is None:
+            return None
+        data_path, meta_path = self._paths(ticker, interval)
+        try:
+            data = pd.read_parquet(data_path)
+        except Exception as e:
+            print(f"⚠️  캐시 읽기 실패 ({ticker} {interval}): {str(e)}")
+            with self._lock:
+                self._remove(data_path, meta_path)
+            return None
+        meta["accessed_at"] = time.time()
+        self._write_meta(meta_path, meta)
+        return data
+
+    def save(self, ticker: str, interval: str, data: pd.DataFrame, covered_from: Optional[pd.Timestamp],
+             fetched_at: Optional[float] = None):
+        """
+        시세 저장
+        - covered_from: 이 시점 이후의 봉은 모두 캐시에 있음 (None이면 상장 이후 전체)
+        - fetched_at: 최근 봉까지 받은 시각 (None이면 지금, 앞 구간만 받은 경우 기존 값을 넘겨 유지)
+        """
+        data_path, meta_path = self._paths(ticker, interval)
+        tmp_path = f"{data_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        data[[col for col in OHLCV_COLUMNS if col in data.columns]].to_parquet(tmp_path)
+        now = time.time()
+        meta = {
+            "ticker": ticker,
+            "interval": interval,
+            "fetched_at": now if fetched_at is None else fetched_at,
+            "accessed_at": now,
+            "covered_from": covered_from.isoformat() if covered_from is not None else None,
+            "rows": len(data),
+        }
+        with self._lock:
+            os.replace(tmp_path, data_path)
+            self._write_meta(meta_path, meta)
+        self.evict()
+
+    def load_indicator_state(self, ticker: str, interval: str, key: str) -> Optional[Dict[str, Any]]:
+        """증분 지표 상태 읽기 (시세 캐시가 없거나 만료되었으면 None)"""
+        if self.get_meta(ticker, interval) is None:
+            return None
+        data_path, _ = self._paths(ticker, interval)
+        states = self._read_meta(self._state_path(data_path)) or {}
+        return states.get(key)
+
+    def save_indicator_state(self, ticker: str, interval: str, key: str, state: Dict[str, Any]):
+        """증분 지표 상태 저장 (지표 조합 key별로 같은 파일에 보관)"""
+        data_path, _ = self._paths(ticker, interval)
+        state_path = self._state_path(data_path)
+        with self._lock:
+            states = self._read_meta(state_path) or {}
+            states[key] = state
+            self._write_meta(state_path, states)
+
+    def evict(self):
+        """만료 항목 삭제 후, 용량 초과분을 LRU 순서로 삭제"""
+        with self._lock:
+            entries = []
+            now = time.time()
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(".parquet"):
+                    continue
+                data_path = os.path.join(self.cache_dir, name)
+                meta_path = data_path[:-len(".parquet")] + ".json"
+                meta = self._read_meta(meta_path) or {}
+                if now - meta.get("fetched_at", 0) > self.max_age_seconds:
+                    self._remove(data_path, meta_path)
+                    continue
+                try:
+                    size = os.path.getsize(data_path)
+                except OSError:
+                    continue
+                entries.append((meta.get("accessed_at", 0), size, data_path, meta_path))
+
+            total = sum(size for _, size, _, _ in entries)
+            for _, size, data_path, meta_path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                self._remove(data_path, meta_path)
+                total -= size
+
+
+_default_caches: Dict[str, OHLCVCache] = {}
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> OHLCVCache:
+    """
+    프로세스 공용 캐시 인스턴스 (시세 제공자별)
+    - yfinance는 CACHE_DIR, 다른 제공자는 CACHE_DIR/{제공자 이름} → 가상 시세가 실제 시세 캐시에 섞이지 않음
+    """
+    from .providers import get_provider
+    name = get_provider().name
+    with _default_lock:
+        if name not in _default_caches:
+            cache_dir = config.CACHE_DIR if name == "yfinance" else os.path.join(config.CACHE_DIR, name)
+            _default_caches[name] = OHLCVCache(cache_dir)
+        return _default_caches[name]
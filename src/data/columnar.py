@@ -0,0 +1,113 @@
+"""
+chart_data 컬럼 표현: NumPy 배열 + int64 epoch(ns, UTC) 타임스탬프
+- 리스트/문자열 변환 없이 DataFrame ↔ chart_data 왕복
+- 체크포인터용 직렬화기 (배열을 원시 바이트로 저장)
+"""
+from typing import Any, Tuple
+import numpy as np
+import pandas as pd
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+
+# chart_data["data"]의 기본 키 ↔ DataFrame 컬럼
+BASE_COLUMNS = {
+    "open": "Open",
+    "high": "High",
+    "low": "Low",
+    "close": "Close",
+    "volume": "Volume",
+}
+META_KEYS = ("dates", "tz")
+
+
+def frame_to_columns(df: pd.DataFrame) -> dict:
+    """DataFrame을 컬럼 dict로 변환 (지표 컬럼은 소문자 키, 값은 float64 배열)"""
+    index = pd.DatetimeIndex(df.index)
+    tz = str(index.tz) if index.tz is not None else None
+    columns = {
+        # tz-aware 인덱스의 asi8은 UTC 기준 epoch
+        "dates": np.ascontiguousarray(index.as_unit("ns").asi8, dtype=np.int64),
+        "tz": tz,
+    }
+    for key, col in BASE_COLUMNS.items():
+        columns[key] = df[col].to_numpy()
+
+    # 기술적 지표 데이터 추가
+    for col in df.columns:
+        if col not in BASE_COLUMNS.values():
+            columns[col.lower()] = df[col].to_numpy(dtype=np.float64)
+
+    return columns
+
+
+def columns_to_index(data: dict) -> pd.DatetimeIndex:
+    """컬럼 dict의 타임스탬프를 DatetimeIndex로 복원 (거래소 시간대)"""
+    dates = np.asarray(data.get("dates", []))
+    if dates.dtype.kind not in "iu":
+        # 이전 형식(문자열 리스트) 호환
+        return pd.DatetimeIndex(pd.to_datetime(dates))
+    index = pd.DatetimeIndex(dates.astype("datetime64[ns]", copy=False))
+    tz = data.get("tz")
+    return index.tz_localize("UTC").tz_convert(tz) if tz else index
+
+
+def columns_to_frame(data: dict) -> pd.DataFrame:
+    """컬럼 dict를 DataFrame으로 복원 (지표 컬럼은 대문자 이름)"""
+    index = columns_to_index(data)
+    frame = {col: np.asarray(data.get(key, []), dtype=np.float64 if key != "volume" else None)
+             for key, col in BASE_COLUMNS.items()}
+
+    # 기존 기술적 지표 복원
+    for key in data:
+        if key not in BASE_COLUMNS and key not in META_KEYS:
+            frame[key.upper()] = np.asarray(data[key], dtype=np.float64)
+
+    return pd.DataFrame(frame, index=index, copy=False)
+
+
+def plot_columns(data: dict) -> dict:
+    """렌더러용 컬럼 dict (dates를 거래소 현지 시각의 DatetimeIndex로 변환)"""
+    index = columns_to_index(data)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    plot_data = {key: value for key, value in data.items() if key not in META_KEYS}
+    plot_data["dates"] = index
+    return plot_data
+
+
+def _pack_arrays(obj: Any) -> Any:
+    """중첩 구조 안의 NumPy 배열을 (dtype, shape, bytes) 마커 dict로 교체"""
+    if isinstance(obj, np.ndarray):
+        array = np.ascontiguousarray(obj)
+        return {"__ndarray__": (array.dtype.str, list(array.shape), array.tobytes())}
+    if isinstance(obj, dict):
+        return {key: _pack_arrays(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_pack_arrays(value) for value in obj]
+    if isinstance(obj, tuple):
+        return tuple(_pack_arrays(value) for value in obj)
+    return obj
+
+
+def _unpack_arrays(obj: Any) -> Any:
+    """_pack_arrays의 역변환"""
+    if isinstance(obj, dict):
+        if "__ndarray__" in obj and len(obj) == 1:
+            dtype, shape, buffer = obj["__ndarray__"]
+            return np.frombuffer(buffer, dtype=np.dtype(dtype)).reshape(shape)
+        return {key: _unpack_arrays(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_unpack_arrays(value) for value in obj]
+    if isinstance(obj, tuple):
+        return tuple(_unpack_arrays(value) for value in obj)
+    return obj
+
+
+class ChartDataSerializer(JsonPlusSerializer):
+    """NumPy 배열을 원시 바이트로 저장하는 체크포인터 직렬화기"""
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        return super().dumps_typed(_pack_arrays(obj))
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        return _unpack_arrays(super().loads_typed(data))
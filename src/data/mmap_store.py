@@ -0,0 +1,292 @@
+"""
+메모리 맵 시계열 저장소: (티커, 간격)별 추가 전용(append-only) 고정폭 바이너리 컬럼 파일
+- dates(int64, UTC epoch ns), open/high/low/close(float64), volume(int64)를 컬럼별 파일로 보관
+- 읽기는 np.memmap 위의 슬라이스 (복사 없음) → 여러 워커 프로세스가 OS 페이지 캐시의 한 벌을 함께 사용
+- 쓰기는 파일 잠금 안에서 뒤에 붙이고, 커밋된 행 수(meta.json)를 마지막에 원자적으로 갱신
+  → 읽는 쪽은 커밋된 행까지만 보므로 쓰는 중에도 안전
+- 컬럼 파일에는 마감된 봉만 커밋: 받은 시세의 마지막 봉(진행 중일 수 있음)은 meta.json의 꼬리(tail) 기록에 두고
+  읽을 때 덧붙임 → 진행 중 봉 갱신은 O(1), 다음 봉이 들어오면 그때 컬럼 파일에 추가
+- 커밋된 행은 제자리에서 고치지 않음: 수정 주가로 겹치는 구간 값이 바뀌거나 기존보다 앞선 구간이 들어오면
+  새 세대 파일로 다시 씀 → 이미 나간 읽기 전용 뷰는 바뀌지 않음
+"""
+import json
+import os
+import re
+import threading
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from .. import config
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 프로세스 내 잠금만 사용
+    fcntl = None
+
+
+# 컬럼 이름 → (DataFrame 컬럼, dtype)
+STORE_COLUMNS = {
+    "dates": (None, np.dtype("<i8")),
+    "open": ("Open", np.dtype("<f8")),
+    "high": ("High", np.dtype("<f8")),
+    "low": ("Low", np.dtype("<f8")),
+    "close": ("Close", np.dtype("<f8")),
+    "volume": ("Volume", np.dtype("<i8")),
+}
+
+
+class _FileLock:
+    """디렉터리 단위 프로세스 간 잠금 (fcntl.flock) + 프로세스 내 잠금"""
+
+    _thread_locks: Dict[str, threading.Lock] = {}
+    _guard = threading.Lock()
+
+    def __init__(self, path: str):
+        self.path = path
+        with self._guard:
+            self._thread_lock = self._thread_locks.setdefault(path, threading.Lock())
+        self._file = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if fcntl is not None:
+            self._file = open(self.path, "a+")
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self._thread_lock.release()
+
+
+class MmapSeriesStore:
+    """
+    (티커, 간격)별 메모리 맵 시계열
+    - {root}/{TICKER}__{interval}/{컬럼}.{세대}.bin + meta.json(rows, generation, tz, tail)
+    - read()는 커밋된 행의 복사 없는 슬라이스를 chart_data 컬럼 dict 형태로 반환
+    """
+
+    def __init__(self, root: str = None):
+        self.root = root or config.MMAP_STORE_DIR
+        os.makedirs(self.root, exist_ok=True)
+        self._maps: Dict[str, np.memmap] = {}   # 파일 경로 → 열어 둔 memmap (행이 늘면 다시 매핑)
+        self._maps_lock = threading.Lock()
+
+    def _dir(self, ticker: str, interval: str) -> str:
+        safe_ticker = re.sub(r"[^A-Za-z0-9._-]", "_", ticker.upper())
+        return os.path.join(self.root, f"{safe_ticker}__{interval}")
+
+    def _column_path(self, directory: str, column: str, generation: int) -> str:
+        return os.path.join(directory, f"{column}.{generation}.bin")
+
+    def _read_meta(self, directory: str) -> Optional[dict]:
+        try:
+            with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, directory: str, meta: dict):
+        meta_path = os.path.join(directory, "meta.json")
+        tmp_path = f"{meta_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def _map(self, path: str, dtype: np.dtype, rows: int) -> np.ndarray:
+        """path의 앞 rows개를 읽기 전용으로 매핑 (이미 충분히 매핑되어 있으면 재사용)"""
+        with self._maps_lock:
+            mapped = self._maps.get(path)
+            if mapped is None or len(mapped) < rows:
+                mapped = np.memmap(path, dtype=dtype, mode="r", shape=(rows,)) if rows else np.empty(0, dtype)
+                self._maps[path] = mapped
+        # memmap 하위 클래스 대신 같은 버퍼를 보는 일반 ndarray 뷰
+        return mapped[:rows].view(np.ndarray)
+
+    @staticmethod
+    def _frame_columns(data: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """DataFrame → 저장 컬럼 배열 (시간순, 중복 시각은 마지막 값)"""
+        data = data[~data.index.duplicated(keep="last")].sort_index()
+        columns = {"dates": pd.DatetimeIndex(data.index).as_unit("ns").asi8.astype("<i8")}
+        for name, (col, dtype) in STORE_COLUMNS.items():
+            if col is None:
+                continue
+            values = data[col].to_numpy(dtype=np.float64)
+            columns[name] = np.rint(values).astype(dtype) if dtype.kind == "i" else values.astype(dtype)
+        return columns
+
+    @staticmethod
+    def _merge(new: Dict[str, np.ndarray], old: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """두 컬럼 dict를 시각순으로 합치기 (같은 시각은 new 값 우선)"""
+        dates = np.concatenate([new["dates"], old["dates"]])
+        # 새 값을 앞에 두고 첫 번째 것을 남김
+        _, keep = np.unique(dates, return_index=True)
+        return {name: np.concatenate([new[name], old[name]])[keep].astype(dtype)
+                for name, (_, dtype) in STORE_COLUMNS.items()}
+
+    @staticmethod
+    def _tail_columns(tail: Optional[dict]) -> Dict[str, np.ndarray]:
+        """꼬리 기록(봉 하나) → 길이 0/1 컬럼 dict"""
+        return {name: np.array([tail[name]] if tail else [], dtype=dtype) for name, (_, dtype) in STORE_COLUMNS.items()}
+
+    def append(self, ticker: str, interval: str, data: pd.DataFrame) -> int:
+        """
+        시세를 뒤에 붙이기 → 컬럼 파일에 새로 커밋된 행 수
+        - 마지막으로 커밋된 봉 이후의 봉 중 마지막 봉은 꼬리 기록으로, 나머지(와 그보다 앞선 이전 꼬리)는 컬럼 파일로
+        - 진행 중 봉만 바뀐 경우 meta.json만 다시 씀 (컬럼 파일, 세대 그대로)
+        - 커밋된 구간의 값이 다르거나(수정 주가) 저장된 첫 봉보다 앞선 봉이 있으면
+          합쳐서 새 세대로 다시 씀 (기존 매핑은 이전 세대 파일을 계속 사용)
+        """
+        data = data.dropna(subset=["Open", "High", "Low", "Close"])
+        if data.empty:
+            return 0
+        directory = self._dir(ticker, interval)
+        os.makedirs(directory, exist_ok=True)
+        new = self._frame_columns(data)
+        tz = str(data.index.tz) if getattr(data.index, "tz", None) is not None else None
+
+        with _FileLock(os.path.join(directory, ".lock")):
+            meta = self._read_meta(directory) or {"rows": 0, "generation": 0, "tz": tz, "tail": None}
+            rows, generation = meta["rows"], meta["generation"]
+            start = 0
+            if rows:
+                dates = self._map(self._column_path(directory, "dates", generation), STORE_COLUMNS["dates"][1], rows)
+                first, last = int(dates[0]), int(dates[-1])
+                if new["dates"][0] < first:
+                    return self._rewrite(ticker, interval, directory, meta, new)
+                start = int(np.searchsorted(new["dates"], last, side="right"))
+                if start and self._overlap_changed(directory, generation, rows, new, start) is not None:
+                    # 커밋된 마감 봉의 값이 바뀜 (분할/배당 수정 등)
+                    # → 이미 나간 뷰가 바뀌지 않도록 제자리에 쓰지 않고 새 세대로 다시 씀
+                    return self._rewrite(ticker, interval, directory, meta, new)
+            if start == len(new["dates"]):
+                return 0
+
+            # 이전 꼬리와 합친 뒤 마지막 봉만 다시 꼬리로 (이후 봉이 생긴 이전 꼬리는 마감된 것으로 커밋)
+            fresh = self._merge({name: values[start:] for name, values in new.items()},
+                                self._tail_columns(meta.get("tail")))
+            closed = len(fresh["dates"]) - 1
+            if closed:
+                for name, (_, dtype) in STORE_COLUMNS.items():
+                    path = self._column_path(directory, name, generation)
+                    with open(path, "ab") as f:
+                        # 커밋되지 않은 꼬리(쓰다가 중단된 행)는 잘라내고 이어 씀
+                        f.truncate(rows * dtype.itemsize)
+                        f.write(fresh[name][:closed].tobytes())
+            meta.update({"rows": rows + closed, "tz": meta.get("tz") or tz,
+                         "tail": {name: values[closed].item() for name, values in fresh.items()}})
+            self._write_meta(directory, meta)
+        return closed
+
+    def _overlap_changed(self, directory: str, generation: int, rows: int, new: Dict[str, np.ndarray],
+                         count: int) -> Optional[int]:
+        """
+        새 시세 앞 count개(마지막 커밋 봉 이하) 중 저장된 봉과 다른 첫 시각 (모두 같으면 None)
+        - 저장소에 없던 시각이거나 OHLCV 값이 다르면 다른 것으로 봄
+        """
+        stored = {name: self._map(self._column_path(directory, name, generation), dtype, rows)
+                  for name, (_, dtype) in STORE_COLUMNS.items()}
+        lo = int(np.searchsorted(stored["dates"], new["dates"][0]))
+        overlap = new["dates"][:count]
+        positions = lo + np.searchsorted(stored["dates"][lo:], overlap)
+        positions = np.minimum(positions, rows - 1)
+        differs = stored["dates"][positions] != overlap
+        for name, (_, dtype) in STORE_COLUMNS.items():
+            if name == "dates":
+                continue
+            a, b = stored[name][positions], new[name][:count]
+            differs |= (a != b) & ~(np.isnan(a) & np.isnan(b)) if dtype.kind == "f" else a != b
+        changed = np.flatnonzero(differs)
+        return int(overlap[changed[0]]) if len(changed) else None
+
+    def _rewrite(self, ticker: str, interval: str, directory: str, meta: dict, new: Dict[str, np.ndarray]) -> int:
+        """기존 행(꼬리 포함)과 새 행을 합쳐 다음 세대 파일로 다시 쓰기 (잠금 안에서 호출, 마지막 봉은 다시 꼬리로)"""
+        old = self.read(ticker, interval) or self._tail_columns(None)
+        rows, generation = meta["rows"], meta["generation"]
+        merged = self._merge(new, old)
+        committed = len(merged["dates"]) - 1
+        for name in STORE_COLUMNS:
+            with open(self._column_path(directory, name, generation + 1), "wb") as f:
+                f.write(merged[name][:committed].tobytes())
+        meta.update({"rows": committed, "generation": generation + 1,
+                     "tail": {name: values[committed].item() for name, values in merged.items()}})
+        self._write_meta(directory, meta)
+        print(f"🗂️  시계열 저장소 재작성: {ticker} {interval} ({rows} → {committed}행)")
+        for name in STORE_COLUMNS:
+            with self._maps_lock:
+                self._maps.pop(self._column_path(directory, name, generation), None)
+            try:
+                # 이미 매핑한 프로세스는 지워진 파일을 계속 볼 수 있음 (POSIX)
+                os.remove(self._column_path(directory, name, generation))
+            except OSError:
+                pass
+        return committed - rows
+
+    def read(self, ticker: str, interval: str, start: Optional[pd.Timestamp] = None,
+             end: Optional[pd.Timestamp] = None, bars: Optional[int] = None) -> Optional[dict]:
+        """
+        [start, end) 구간(그중 마지막 bars개)의 컬럼 dict (dates/tz/open/high/low/close/volume)
+        - 배열은 메모리 맵 위의 읽기 전용 뷰 (복사 없음), 저장된 시세가 없으면 None
+        - 꼬리 봉이 구간에 들어가면 요청 구간만 복사해 덧붙임
+        """
+        directory = self._dir(ticker, interval)
+        meta = self._read_meta(directory)
+        if not meta or not (meta["rows"] or meta.get("tail")):
+            return None
+        rows, generation = meta["rows"], meta["generation"]
+        arrays = {name: self._map(self._column_path(directory, name, generation), dtype, rows)
+                  for name, (_, dtype) in STORE_COLUMNS.items()}
+        tail = meta.get("tail")
+        if tail is not None and not self._in_range(tail["dates"], start, end):
+            tail = None
+        lo, hi = self._bounds(arrays["dates"], start, end, bars - 1 if bars and tail else bars)
+        if tail is not None and bars == 1:
+            lo = hi
+        columns = {name: values[lo:hi] for name, values in arrays.items()}
+        if tail is not None:
+            columns = {name: np.append(values, np.array([tail[name]], dtype=values.dtype))
+                       for name, values in columns.items()}
+        columns["tz"] = meta.get("tz")
+        return columns
+
+    @staticmethod
+    def _in_range(value: int, start, end) -> bool:
+        return ((start is None or value >= pd.Timestamp(start).value)
+                and (end is None or value < pd.Timestamp(end).value))
+
+    @staticmethod
+    def _bounds(dates: np.ndarray, start, end, bars) -> Tuple[int, int]:
+        """정렬된 시각에서 이진 탐색으로 [start, end) 위치, bars가 있으면 그중 마지막 bars개"""
+        lo = int(np.searchsorted(dates, pd.Timestamp(start).value)) if start is not None else 0
+        hi = int(np.searchsorted(dates, pd.Timestamp(end).value)) if end is not None else len(dates)
+        if bars:
+            lo = max(lo, hi - bars)
+        return lo, hi
+
+    def rows(self, ticker: str, interval: str) -> int:
+        """저장된 봉 수 (꼬리 봉 포함)"""
+        meta = self._read_meta(self._dir(ticker, interval))
+        return meta["rows"] + (1 if meta.get("tail") else 0) if meta else 0
+
+
+def uses_mmap_store(interval: str) -> bool:
+    """이 간격의 시세를 메모리 맵 저장소에서 읽을지 (CHART_MMAP_INTERVALS)"""
+    return interval in config.MMAP_STORE_INTERVALS
+
+
+_default_stores: Dict[str, MmapSeriesStore] = {}
+_default_lock = threading.Lock()
+
+
+def get_default_store() -> MmapSeriesStore:
+    """프로세스 공용 저장소 (시세 제공자별 디렉터리, 캐시와 같은 규칙)"""
+    from .providers import get_provider
+    name = get_provider().name
+    with _default_lock:
+        if name not in _default_stores:
+            root = config.MMAP_STORE_DIR if name == "yfinance" else os.path.join(config.MMAP_STORE_DIR, name)
+            _default_stores[name] = MmapSeriesStore(root)
+        return _default_stores[name]
@@ -0,0 +1,59 @@
+"""
+실패 조회 캐시 (negative cache)
+- 최근 실패한 (티커, 기간, 간격) 조회를 TTL 동안 기억해서, 같은 요청은 네트워크 없이 바로 같은 오류로 응답
+- 오류 종류별로 TTL을 다르게 지정 (없다고 확인된 종목은 길게, 빈 응답·일시적 수집 오류는 짧게)
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class NegativeCache:
+    """만료 시각이 있는 실패 기록 (최대 max_entries개, 오래된 것부터 제거)"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 4096):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """기록된 실패(오류 dict) 또는 None (만료된 기록은 삭제)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, error: Dict[str, Any], ttl: Optional[float] = None):
+        """실패 기록 (ttl 초 동안 유지, 0 이하면 기록하지 않음)"""
+        ttl = self.ttl_seconds if ttl is None else ttl
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, error)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: Hashable):
+        """기록 삭제 (조회가 성공한 경우 등)"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/미스 집계와 현재 기록 수"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
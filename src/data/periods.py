@@ -0,0 +1,197 @@
+"""
+기간(period)/간격(interval) 문자열 변환 유틸리티
+- DateRange: 명시적 시작/종료 시점 또는 최근 N개 봉 조회 범위
+"""
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+import numpy as np
+import pandas as pd
+
+
+# yfinance 기간 문자열 → 조회 시작 시점까지의 길이
+PERIOD_OFFSETS = {
+    "1d": pd.DateOffset(days=1),
+    "5d": pd.DateOffset(days=5),
+    "1w": pd.DateOffset(weeks=1),
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+
+# yfinance 간격 문자열 → 봉 하나의 길이
+INTERVAL_DELTAS = {
+    "1m": pd.Timedelta(minutes=1),
+    "2m": pd.Timedelta(minutes=2),
+    "5m": pd.Timedelta(minutes=5),
+    "15m": pd.Timedelta(minutes=15),
+    "30m": pd.Timedelta(minutes=30),
+    "60m": pd.Timedelta(hours=1),
+    "90m": pd.Timedelta(minutes=90),
+    "1h": pd.Timedelta(hours=1),
+    "4h": pd.Timedelta(hours=4),
+    "1d": pd.Timedelta(days=1),
+    "5d": pd.Timedelta(days=5),
+    "1wk": pd.Timedelta(weeks=1),
+    "1mo": pd.Timedelta(days=30),
+    "3mo": pd.Timedelta(days=91),
+}
+
+
+def period_start(period: str, now: Optional[pd.Timestamp] = None) -> Optional[pd.Timestamp]:
+    """기간 문자열이 가리키는 조회 시작 시점 (UTC). 'max'는 None(전체 기간)"""
+    now = now if now is not None else pd.Timestamp.now(tz="UTC")
+    if period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=now.year, month=1, day=1, tz="UTC")
+    offset = PERIOD_OFFSETS.get(period)
+    if offset is None:
+        raise ValueError(f"지원하지 않는 기간입니다: {period}")
+    return now - offset
+
+
+def interval_to_timedelta(interval: str) -> pd.Timedelta:
+    """간격 문자열을 Timedelta로 변환"""
+    delta = INTERVAL_DELTAS.get(interval)
+    if delta is None:
+        raise ValueError(f"지원하지 않는 간격입니다: {interval}")
+    return delta
+
+
+def is_intraday(interval: str) -> bool:
+    """분/시간 단위(일봉 미만) 간격인지 여부"""
+    return interval_to_timedelta(interval) < pd.Timedelta(days=1)
+
+
+# 기간 문자열을 짧은 것부터 (시작 시점을 덮는 가장 짧은 기간 찾기용)
+PERIODS_ASCENDING = ["1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y", "max"]
+
+# 일봉 미만 봉의 하루 거래 시간 (미국 정규장 기준, 24시간 시장은 여유분으로 충분)
+SESSION_HOURS = 6.5
+
+
+def to_utc(value: Any) -> pd.Timestamp:
+    """문자열/시각 → UTC 시각 (시간대가 없으면 UTC로 간주)"""
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tz is None else ts.tz_convert("UTC")
+
+
+def period_covering(start: Optional[pd.Timestamp], now: Optional[pd.Timestamp] = None) -> str:
+    """start 이후를 모두 포함하는 가장 짧은 기간 문자열 (start가 None이면 'max')"""
+    if start is None:
+        return "max"
+    now = now if now is not None else pd.Timestamp.now(tz="UTC")
+    for period in PERIODS_ASCENDING[:-1]:
+        if period_start(period, now) <= start:
+            return period
+    return "max"
+
+
+def _parse_bound(value: Any) -> pd.Timestamp:
+    """날짜만 있는 값("2023-03-01")은 시간대 없는 날짜 그대로, 시각이 있으면 UTC 시각"""
+    ts = pd.Timestamp(value)
+    if ts.tz is None and ts == ts.normalize() and len(str(value).strip()) <= 10:
+        return ts
+    return to_utc(ts)
+
+
+def localize_bound(ts: pd.Timestamp, tz: Any) -> pd.Timestamp:
+    """경계 시각을 시세 인덱스 시간대 기준으로 (날짜 경계는 거래소 현지 자정, 인덱스에 시간대가 없으면 UTC)"""
+    if ts.tz is not None:
+        return ts
+    return ts.tz_localize(tz or "UTC", ambiguous=True, nonexistent="shift_forward")
+
+
+@dataclass(frozen=True)
+class DateRange:
+    """
+    명시적 조회 범위 (period 문자열 대신 사용)
+    - start/end: end는 미포함 (날짜만 주면 그날 전체 포함)
+    - 날짜만 준 경계는 시간대 없는 날짜로 두고 자를 때 거래소 현지 날짜로 해석 (KRX 일봉 D는 D-1 15:00Z)
+    - 시각까지 준 경계는 UTC 시각
+    - bars: 최근 N개 봉 (end가 있으면 end 이전의 N개)
+    """
+    start: Optional[pd.Timestamp] = None
+    end: Optional[pd.Timestamp] = None
+    bars: Optional[int] = None
+
+    @classmethod
+    def from_params(cls, chart_params: Dict[str, Any]) -> Optional["DateRange"]:
+        """chart_params의 start/end/bars → DateRange (없으면 None)"""
+        start, end, bars = chart_params.get("start"), chart_params.get("end"), chart_params.get("bars")
+        if not (start or end or bars):
+            return None
+        start_ts = _parse_bound(start) if start else None
+        end_ts = None
+        if end:
+            end_ts = _parse_bound(end)
+            # "2023-06-30"처럼 날짜만 주면 그날 마지막 봉까지 포함
+            if end_ts.tz is None:
+                end_ts += pd.Timedelta(days=1)
+        if start_ts is not None and end_ts is not None and to_utc(start_ts) >= to_utc(end_ts):
+            raise ValueError(f"조회 시작({start})이 종료({end})보다 늦습니다.")
+        return cls(start_ts, end_ts, int(bars) if bars else None)
+
+    def fetch_start(self) -> Optional[pd.Timestamp]:
+        """수집용 UTC 시작 시점 (날짜 경계는 거래소 시간대를 모르므로 하루 앞당겨 현지 날짜 전체를 포함)"""
+        if self.start is None:
+            return None
+        return self.start if self.start.tz is not None else to_utc(self.start) - pd.Timedelta(days=1)
+
+    def fetch_end(self) -> Optional[pd.Timestamp]:
+        """수집용 UTC 종료 시점 (날짜 경계는 하루 늦춰 현지 날짜 전체를 포함)"""
+        if self.end is None:
+            return None
+        return self.end if self.end.tz is not None else to_utc(self.end) + pd.Timedelta(days=1)
+
+    def lookback_start(self, interval: str, now: Optional[pd.Timestamp] = None, factor: float = 1.0) -> Optional[pd.Timestamp]:
+        """
+        조회에 필요한 시작 시점
+        - start가 있으면 start
+        - bars만 있으면 거래 달력을 감안해 넉넉히 추정 (factor배), 봉이 모자라면 factor를 늘려 다시 호출
+        """
+        if self.start is not None:
+            return self.fetch_start()
+        if not self.bars:
+            return None
+        end = self.fetch_end() if self.end is not None else (now if now is not None else pd.Timestamp.now(tz="UTC"))
+        delta = interval_to_timedelta(interval)
+        if is_intraday(interval):
+            sessions = math.ceil(self.bars * delta / pd.Timedelta(hours=SESSION_HOURS))
+            span = pd.Timedelta(days=sessions * 7 / 5 + 4)
+        else:
+            span = self.bars * delta * 7 / 5 + pd.Timedelta(days=5)
+        return end - span * factor
+
+    def label(self) -> str:
+        """표시용 범위 문자열 (예: 2023-03-01~2023-06-30, 최근 90개 봉)"""
+        parts = []
+        if self.start is not None or self.end is not None:
+            start = self.start.strftime("%Y-%m-%d") if self.start is not None else ""
+            end = (self.end - pd.Timedelta(days=1)).strftime("%Y-%m-%d") if self.end is not None else "현재"
+            parts.append(f"{start}~{end}")
+        if self.bars:
+            parts.append(f"최근 {self.bars}개 봉")
+        return " ".join(parts)
+
+
+def slice_range(data: pd.DataFrame, date_range: Optional[DateRange]) -> pd.DataFrame:
+    """
+    정렬된 시각 인덱스를 이진 탐색해 범위만 잘라냄 (복사 없는 iloc 슬라이스)
+    - start 이상, end 미만, 그중 마지막 bars개
+    - 날짜만 준 경계는 인덱스 시간대(거래소 현지)의 자정으로 해석
+    """
+    if date_range is None or data.empty:
+        return data
+    stamps = data.index.as_unit("ns").asi8   # 시간대가 있으면 UTC 기준 ns
+    tz = getattr(data.index, "tz", None)
+    lo = int(np.searchsorted(stamps, localize_bound(date_range.start, tz).value)) if date_range.start is not None else 0
+    hi = int(np.searchsorted(stamps, localize_bound(date_range.end, tz).value)) if date_range.end is not None else len(stamps)
+    if date_range.bars:
+        lo = max(lo, hi - date_range.bars)
+    return data.iloc[lo:hi]
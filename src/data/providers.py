@@ -0,0 +1,284 @@
+"""
+시세 데이터 제공자
+- DataProvider: yfinance_node가 사용하는 시세 조회 인터페이스
+- YFinanceProvider: yfinance (기본)
+- SyntheticProvider: 네트워크 없이 결정적으로 생성하는 가상 시세 (부하 테스트/벤치마크/폐쇄망)
+- ParquetDirectoryProvider: 디렉터리의 Parquet 파일 (사내 시세 원본 연동)
+- CHART_DATA_PROVIDER 환경 변수로 선택 (yfinance | synthetic | parquet)
+"""
+import os
+import re
+import threading
+import warnings
+import zlib
+from typing import Optional, Protocol
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from yfinance.exceptions import YFPricesMissingError, YFTzMissingError
+from .. import config
+from .cache import OHLCV_COLUMNS
+from .periods import period_start, interval_to_timedelta, is_intraday
+from .resilience import ResilientProvider
+
+
+class DataProvider(Protocol):
+    """시세 조회 인터페이스"""
+    name: str
+
+    def history(self, ticker: str, interval: str, period: Optional[str] = None,
+                start: Optional[pd.Timestamp] = None, end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """
+        OHLCV 조회 (시간대가 있는 DatetimeIndex, 컬럼 Open/High/Low/Close/Volume)
+        - period 또는 start 중 하나로 시작 시점 지정, 데이터가 없으면 빈 DataFrame
+        - end를 주면 그 시점 이전 봉까지만 (end 미포함, 기본은 현재까지)
+        """
+        ...
+
+
+class SymbolNotFoundError(LookupError):
+    """시세 제공자가 종목 자체를 찾지 못함 (없는 심볼, 상장폐지) → 빈 결과와 달리 오래 기억해도 됨"""
+
+    def __init__(self, ticker: str, reason: str = ""):
+        super().__init__(f"종목을 찾을 수 없습니다: {ticker}" + (f" ({reason})" if reason else ""))
+        self.ticker = ticker
+
+
+class YFinanceProvider:
+    """
+    yfinance 시세
+    - yfinance 오류를 숨기지 않고 받아서 구분: 종목을 모르면 SymbolNotFoundError,
+      종목은 있지만 구간에 봉이 없으면 빈 DataFrame, 네트워크/요청 제한 오류는 그대로 전달 (재시도 대상)
+    """
+    name = "yfinance"
+
+    def history(self, ticker: str, interval: str, period: Optional[str] = None,
+                start: Optional[pd.Timestamp] = None, end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        try:
+            with warnings.catch_warnings():
+                # 최신 yfinance는 raise_errors 대신 설정값을 권장하지만 같은 동작
+                warnings.simplefilter("ignore", DeprecationWarning)
+                if start is not None:
+                    data = yf.Ticker(ticker).history(start=start, end=end, interval=interval, raise_errors=True)
+                else:
+                    data = yf.Ticker(ticker).history(period=period, interval=interval, raise_errors=True)
+        except YFTzMissingError as e:
+            # 시간대 조회에 Yahoo가 명시적 오류로 응답 = 모르는 심볼 (네트워크 오류는 여기로 오지 않고 그대로 전달됨)
+            raise SymbolNotFoundError(ticker, str(e)) from e
+        except YFPricesMissingError as e:
+            print(f"⚠️  yfinance 빈 응답: {str(e)}")
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        return data[OHLCV_COLUMNS] if not data.empty else data
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """정수 배열 → 의사난수 uint64 (같은 입력이면 항상 같은 값)"""
+    x = x.astype(np.uint64)
+    with np.errstate(over="ignore"):
+        x = x + np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+def _hash_normal(key: int, counter: np.ndarray) -> np.ndarray:
+    """(key, counter)마다 고정된 표준정규 난수 (Box-Muller)"""
+    # key를 먼저 섞어서 서로 다른 key의 난수열이 겹치지 않게 함
+    offset = _splitmix64(np.array([key], dtype=np.int64))[0]
+    with np.errstate(over="ignore"):
+        doubled = counter.astype(np.uint64) * np.uint64(2) + offset
+    bits1 = _splitmix64(doubled)
+    bits2 = _splitmix64(doubled + np.uint64(1))
+    u1 = ((bits1 >> np.uint64(11)).astype(np.float64) + 0.5) / 2.0 ** 53
+    u2 = (bits2 >> np.uint64(11)).astype(np.float64) / 2.0 ** 53
+    return np.sqrt(-2.0 * np.log(u1)) * np.cos(2.0 * np.pi * u2)
+
+
+class SyntheticProvider:
+    """
+    결정적 가상 시세
+    - 평일만, 일봉 미만은 정규장(09:30~16:00, 거래소 현지 시간) 봉만 생성
+    - 가격은 시각의 함수(여러 시간 척도의 보간 잡음 합)라서 조회 구간/간격과 무관하게 같은 시각은 같은 값
+      → 증분 갱신·리샘플링 결과가 원본과 어긋나지 않음
+    - 수백만 봉도 벡터 연산으로 생성
+    """
+    name = "synthetic"
+    SESSION_OPEN = pd.Timedelta(hours=9, minutes=30)
+    SESSION_CLOSE = pd.Timedelta(hours=16)
+    MAX_START = pd.Timestamp("1990-01-01", tz="UTC")   # period="max"의 시작
+    DAILY_VOL = 0.015
+    # (잡음 격자 간격, 진폭 배율): 브라운 운동처럼 진폭 ∝ √간격
+    SCALES = [(pd.Timedelta(minutes=30), 1.0), (pd.Timedelta(days=1), 1.0), (pd.Timedelta(days=7), 1.0),
+              (pd.Timedelta(days=30), 1.0), (pd.Timedelta(days=180), 1.0), (pd.Timedelta(days=720), 0.7)]
+
+    def __init__(self, seed: int = None, tz: str = "America/New_York"):
+        self.seed = seed if seed is not None else config.SYNTHETIC_SEED
+        self.tz = tz
+
+    def _ticker_key(self, ticker: str) -> int:
+        return zlib.crc32(f"{self.seed}:{ticker.upper()}".encode()) << 20
+
+    def _timestamps(self, interval: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DatetimeIndex:
+        """거래 달력에 맞는 봉 시작 시각"""
+        first_day = start.tz_convert(self.tz).normalize().tz_localize(None)
+        last_day = end.tz_convert(self.tz).normalize().tz_localize(None)
+        if interval == "1wk":
+            days = pd.date_range(first_day - pd.Timedelta(days=first_day.weekday()), last_day, freq="W-MON")
+        elif interval == "1mo":
+            days = pd.date_range(first_day.replace(day=1), last_day, freq="MS")
+        elif interval == "3mo":
+            days = pd.date_range(first_day.to_period("Q").start_time, last_day, freq="QS")
+        else:
+            days = pd.bdate_range(first_day, last_day)
+            if interval == "5d":
+                days = days[::5]
+        midnights = days.tz_localize(self.tz, ambiguous=False, nonexistent="shift_forward").as_unit("ns")
+        if not is_intraday(interval):
+            return midnights
+
+        step = interval_to_timedelta(interval).value
+        slots = np.arange(self.SESSION_OPEN.value, self.SESSION_CLOSE.value, step, dtype=np.int64)
+        # 평일 정규장은 일광절약시간 전환(일요일 새벽)과 겹치지 않으므로 자정 + 오프셋으로 계산
+        stamps = (midnights.asi8[:, None] + slots[None, :]).ravel()
+        return pd.DatetimeIndex(stamps.view("M8[ns]")).tz_localize("UTC").tz_convert(self.tz)
+
+    def _log_price(self, key: int, ns: np.ndarray) -> np.ndarray:
+        """시각(ns)의 로그 가격: 척도별 격자 잡음을 선형 보간해 합산"""
+        base = np.log(20 + (key >> 20) % 480)
+        log_price = np.full(len(ns), base)
+        for level, (spacing, weight) in enumerate(self.SCALES):
+            amplitude = self.DAILY_VOL * weight * np.sqrt(spacing / pd.Timedelta(days=1))
+            position = ns / spacing.value
+            k = np.floor(position).astype(np.int64)
+            frac = position - k
+            # 격자점 난수는 구간에 걸친 격자점마다 한 번만 계산
+            k0 = int(k.min())
+            grid = _hash_normal(key + (level << 12), np.arange(k0, int(k.max()) + 2, dtype=np.int64))
+            offset = k - k0
+            log_price += amplitude * ((1 - frac) * grid[offset] + frac * grid[offset + 1])
+        return log_price
+
+    def history(self, ticker: str, interval: str, period: Optional[str] = None,
+                start: Optional[pd.Timestamp] = None, end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        now = pd.Timestamp.now(tz="UTC")
+        if start is None:
+            start = period_start(period or "1mo", now)
+            start = self.MAX_START if start is None else start
+        start = pd.Timestamp(start)
+        start = start.tz_localize("UTC") if start.tz is None else start.tz_convert("UTC")
+        if end is not None:
+            end = pd.Timestamp(end)
+            end = end.tz_localize("UTC") if end.tz is None else end.tz_convert("UTC")
+        until = now if end is None else min(end, now)
+
+        index = self._timestamps(interval, start, until)
+        mask = (index >= start) & (index <= now)
+        if end is not None:
+            mask &= index < end
+        index = index[mask]
+        if len(index) == 0:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+        key = self._ticker_key(ticker)
+        bar_ns = interval_to_timedelta(interval).value
+        if is_intraday(interval):
+            bar_ns = min(bar_ns, self.SESSION_CLOSE.value - self.SESSION_OPEN.value)
+        opens_ns = index.asi8
+        closes_ns = opens_ns + bar_ns
+        open_ = np.exp(self._log_price(key, opens_ns))
+        close = np.exp(self._log_price(key, closes_ns))
+
+        counter = opens_ns // max(bar_ns, 1)
+        bar_vol = self.DAILY_VOL * np.sqrt(bar_ns / pd.Timedelta(days=1).value)
+        high = np.maximum(open_, close) * (1 + 0.5 * bar_vol * np.abs(_hash_normal(key + 1, counter)))
+        low = np.minimum(open_, close) * (1 - 0.5 * bar_vol * np.abs(_hash_normal(key + 2, counter)))
+        base_volume = 1e6 * (1 + (key >> 20) % 50)
+        volume = np.round(base_volume * (bar_ns / pd.Timedelta(days=1).value)
+                          * np.exp(0.3 * _hash_normal(key + 3, counter)))
+        return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume}, index=index)
+
+
+class ParquetDirectoryProvider:
+    """
+    디렉터리의 Parquet 시세
+    - {root}/{interval}/{TICKER}.parquet (없으면 {root}/{TICKER}.parquet)
+    - 인덱스가 시각이 아니면 Date/Datetime/timestamp 컬럼을 인덱스로 사용, 시간대가 없으면 UTC
+    - 컬럼 이름은 대소문자 무시 (open/high/low/close/volume)
+    """
+    name = "parquet"
+
+    def __init__(self, root: str = None):
+        self.root = root or config.PARQUET_DATA_DIR
+
+    def _path(self, ticker: str, interval: str) -> Optional[str]:
+        safe_ticker = re.sub(r"[^A-Za-z0-9._-]", "_", ticker.upper())
+        for path in (os.path.join(self.root, interval, f"{safe_ticker}.parquet"),
+                     os.path.join(self.root, f"{safe_ticker}.parquet")):
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _read(self, path: str) -> pd.DataFrame:
+        data = pd.read_parquet(path)
+        if not isinstance(data.index, pd.DatetimeIndex):
+            for col in data.columns:
+                if str(col).lower() in ("date", "datetime", "timestamp", "time"):
+                    data = data.set_index(col)
+                    break
+            data.index = pd.to_datetime(data.index)
+        if data.index.tz is None:
+            data.index = data.index.tz_localize("UTC")
+        columns = {str(col).lower(): col for col in data.columns}
+        missing = [col for col in OHLCV_COLUMNS if col.lower() not in columns]
+        if missing:
+            raise ValueError(f"Parquet 시세에 필요한 컬럼이 없습니다: {', '.join(missing)} ({path})")
+        data = data[[columns[col.lower()] for col in OHLCV_COLUMNS]]
+        data.columns = OHLCV_COLUMNS
+        return data.sort_index()
+
+    def history(self, ticker: str, interval: str, period: Optional[str] = None,
+                start: Optional[pd.Timestamp] = None, end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        path = self._path(ticker, interval)
+        if path is None:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        data = self._read(path)
+        start = start if start is not None else period_start(period or "max", pd.Timestamp.now(tz="UTC"))
+        if start is not None:
+            data = data[data.index >= pd.Timestamp(start)]
+        if end is not None:
+            data = data[data.index < pd.Timestamp(end)]
+        return data
+
+
+PROVIDERS = {
+    "yfinance": YFinanceProvider,
+    "synthetic": SyntheticProvider,
+    "parquet": ParquetDirectoryProvider,
+}
+
+_provider: Optional[DataProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_provider() -> DataProvider:
+    """프로세스 공용 시세 제공자 (CHART_DATA_PROVIDER로 선택)"""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            provider_cls = PROVIDERS.get(config.DATA_PROVIDER)
+            if provider_cls is None:
+                raise ValueError(f"지원하지 않는 시세 제공자입니다: {config.DATA_PROVIDER} "
+                                 f"(사용 가능: {', '.join(PROVIDERS)})")
+            _provider = provider_cls()
+            if _provider.name == "yfinance":
+                # 외부 서버는 속도 제한/재시도/회로 차단을 거쳐 호출
+                _provider = ResilientProvider(_provider)
+            print(f"📡 시세 제공자: {_provider.name}")
+        return _provider
+
+
+def set_provider(provider: Optional[DataProvider]):
+    """시세 제공자 교체 (None이면 환경 변수 설정으로 다시 선택)"""
+    global _provider
+    with _provider_lock:
+        _provider = provider
@@ -0,0 +1,93 @@
+"""
+OHLCV 리샘플링: 캐시된 짧은 간격 봉으로 긴 간격 봉 만들기
+- 시가는 첫 값, 고가는 최댓값, 저가는 최솟값, 종가는 마지막 값, 거래량은 합
+- 일봉 미만: 거래일마다 첫 봉 시각을 기준으로 구간을 나눔 (예: 09:30 시작 → 1h 봉은 09:30, 10:30, ...)
+- 일봉 이상: 거래소 현지 시간의 날짜/주(월요일)/월/분기 단위
+  (캐시 원본으로는 쓰지 않음: yfinance 일봉 이상은 배당/분할 수정 주가라 분봉을 합친 값과 다름)
+"""
+from typing import List
+import numpy as np
+import pandas as pd
+from .cache import OHLCV_COLUMNS
+from .periods import INTERVAL_DELTAS, interval_to_timedelta, is_intraday
+
+
+# yfinance가 직접 제공하는 간격
+YFINANCE_INTERVALS = {"1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "1d", "5d", "1wk", "1mo", "3mo"}
+
+# yfinance가 제공하지 않아 항상 로컬에서 만드는 간격 → 내려받을 원본 간격
+LOCAL_INTERVALS = {"4h": "1h"}
+
+
+def resample_sources(interval: str) -> List[str]:
+    """
+    interval 봉을 만들 수 있는 더 짧은 간격 목록 (긴 간격 우선 → 읽을 행 수가 적음)
+    - 일봉 미만끼리만: 원본 간격이 목표 간격을 나누어떨어져야 함
+    - 일봉 이상은 항상 직접 수집 (수정 주가 기준이 달라 어떤 캐시가 있었는지에 따라 차트가 바뀌지 않도록)
+    """
+    if interval not in INTERVAL_DELTAS or not is_intraday(interval):
+        return []
+    target = interval_to_timedelta(interval)
+    sources = []
+    for source, delta in INTERVAL_DELTAS.items():
+        if source == interval or source == "60m" or delta >= target or source not in YFINANCE_INTERVALS:
+            continue
+        if is_intraday(source) and target % delta == pd.Timedelta(0):
+            sources.append(source)
+    return sorted(sources, key=lambda s: INTERVAL_DELTAS[s], reverse=True)
+
+
+def _local_wall_times(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """거래소 현지 시각 (시간대 정보 제거)"""
+    return index.tz_localize(None) if index.tz is not None else index
+
+
+def _bucket_labels(index: pd.DatetimeIndex, interval: str) -> np.ndarray:
+    """봉마다 속할 구간의 시작 시각 (int64 ns, 정렬된 입력 기준 단조 증가)"""
+    if is_intraday(interval):
+        ts = index.as_unit("ns").asi8
+        days = _local_wall_times(index).normalize().as_unit("ns").asi8
+        starts = np.flatnonzero(np.concatenate(([True], days[1:] != days[:-1])))
+        lengths = np.diff(np.append(starts, len(ts)))
+        session_open = np.repeat(ts[starts], lengths)
+        step = interval_to_timedelta(interval).value
+        return session_open + (ts - session_open) // step * step
+
+    wall = _local_wall_times(index).normalize()
+    if interval == "1wk":
+        wall = wall - pd.to_timedelta(wall.weekday, unit="D")
+    elif interval == "1mo":
+        wall = wall.to_period("M").to_timestamp()
+    elif interval == "3mo":
+        wall = wall.to_period("Q").to_timestamp()
+    return wall.as_unit("ns").asi8
+
+
+def _labels_to_index(labels: np.ndarray, interval: str, source: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    index = pd.DatetimeIndex(labels.view("M8[ns]"))
+    if source.tz is None:
+        return index
+    if is_intraday(interval):
+        # 일봉 미만 구간 시작은 UTC 기준 절대 시각
+        return index.tz_localize("UTC").tz_convert(source.tz)
+    # 일봉 이상 구간 시작은 현지 자정
+    return index.tz_localize(source.tz, ambiguous=False, nonexistent="shift_forward")
+
+
+def resample_ohlcv(data: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """시간순으로 정렬된 OHLCV를 interval 봉으로 집계 (거래가 없는 구간은 만들지 않음)"""
+    if data.empty:
+        return data[[col for col in OHLCV_COLUMNS if col in data.columns]]
+    labels = _bucket_labels(data.index, interval)
+    starts = np.flatnonzero(np.concatenate(([True], labels[1:] != labels[:-1])))
+    ends = np.append(starts[1:], len(labels)) - 1
+
+    values = {col: data[col].to_numpy(dtype=np.float64) for col in OHLCV_COLUMNS}
+    bars = {
+        "Open": values["Open"][starts],
+        "High": np.maximum.reduceat(values["High"], starts),
+        "Low": np.minimum.reduceat(values["Low"], starts),
+        "Close": values["Close"][ends],
+        "Volume": np.add.reduceat(values["Volume"], starts),
+    }
+    return pd.DataFrame(bars, index=_labels_to_index(labels[starts], interval, data.index))
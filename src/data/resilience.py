@@ -0,0 +1,183 @@
+"""
+시세 수집 보호 장치
+- TokenBucket: 프로세스 공용 요청 속도 제한
+- 지수 백오프(+지터) 재시도: 일시적 오류(네트워크, 요청 제한)만 재시도
+- CircuitBreaker: 연속 실패가 쌓이면 일정 시간 즉시 실패 (요청 제한 중인 서버를 계속 두드리지 않음)
+- ResilientProvider: 위 장치들로 DataProvider를 감싸고 지표(시도/대기/차단 횟수)를 집계
+"""
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+import pandas as pd
+from .. import config
+
+
+class CircuitOpenError(RuntimeError):
+    """회로 차단 중이라 요청을 보내지 않고 실패"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"시세 서버 요청이 일시 차단되었습니다. {retry_after:.0f}초 후 다시 시도해주세요.")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """초당 rate개, 최대 capacity개까지 모아 쓰는 토큰 버킷"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """토큰 하나를 얻을 때까지 대기 → 대기한 시간(초)"""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class CircuitBreaker:
+    """
+    연속 실패 failure_threshold번이면 reset_seconds 동안 열림(즉시 실패)
+    - 열린 뒤 reset_seconds가 지나면 시험 요청 하나만 통과 (성공 시 닫힘, 실패 시 다시 열림)
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half_open" if time.monotonic() - self._opened_at >= self.reset_seconds else "open"
+
+    def before_call(self):
+        """요청 전 확인 (열려 있으면 CircuitOpenError)"""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            elapsed = time.monotonic() - self._opened_at
+            if elapsed < self.reset_seconds or self._probing:
+                raise CircuitOpenError(max(0.0, self.reset_seconds - elapsed))
+            self._probing = True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def release_probe(self):
+        """시험 요청이 서버 상태와 무관한 오류로 끝났을 때: 실패 횟수/열림 상태는 그대로 두고 다음 시험 요청 허용"""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> bool:
+        """실패 기록 → 이번 실패로 회로가 열렸으면 True"""
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._probing = False
+                return True
+            return False
+
+
+def is_transient_error(error: Exception) -> bool:
+    """재시도할 만한 일시적 오류인지 (네트워크/시간 초과/요청 제한)"""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    name = type(error).__name__.lower()
+    message = str(error).lower()
+    return (any(word in name for word in ("ratelimit", "timeout", "connection"))
+            or any(word in message for word in ("too many requests", "rate limit", "429", "timed out", "temporarily")))
+
+
+class ResilientProvider:
+    """DataProvider에 속도 제한, 재시도, 회로 차단을 적용한 래퍼"""
+
+    def __init__(self, provider, bucket: TokenBucket = None, breaker: CircuitBreaker = None,
+                 max_attempts: int = None, backoff_base: float = None, backoff_max: float = None):
+        self.provider = provider
+        self.name = provider.name
+        self.bucket = bucket or TokenBucket(config.FETCH_RATE_PER_SECOND, config.FETCH_BURST)
+        self.breaker = breaker or CircuitBreaker(config.CIRCUIT_FAILURE_THRESHOLD, config.CIRCUIT_RESET_SECONDS)
+        self.max_attempts = max_attempts or config.FETCH_MAX_ATTEMPTS
+        self.backoff_base = backoff_base if backoff_base is not None else config.FETCH_BACKOFF_BASE
+        self.backoff_max = backoff_max if backoff_max is not None else config.FETCH_BACKOFF_MAX
+        self._lock = threading.Lock()
+        self.metrics = {"calls": 0, "attempts": 0, "retries": 0, "failures": 0,
+                        "rate_limit_waits": 0, "rate_limit_wait_seconds": 0.0,
+                        "backoff_seconds": 0.0, "circuit_opened": 0, "circuit_rejected": 0}
+
+    def _count(self, key: str, value: float = 1):
+        with self._lock:
+            self.metrics[key] += value
+
+    def _backoff(self, attempt: int) -> float:
+        """지터를 준 지수 백오프 (full jitter)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def history(self, ticker: str, interval: str, period: Optional[str] = None,
+                start: Optional[pd.Timestamp] = None, end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        self._count("calls")
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                self._count("circuit_rejected")
+                raise
+
+            waited = self.bucket.acquire()
+            if waited > 0:
+                self._count("rate_limit_waits")
+                self._count("rate_limit_wait_seconds", waited)
+
+            self._count("attempts")
+            try:
+                data = self.provider.history(ticker, interval, period=period, start=start, end=end)
+            except Exception as e:
+                if not is_transient_error(e):
+                    # 잘못된 요청 등은 서버 상태와 무관하므로 회로에 반영하지 않음 (시험 요청 자리만 반납)
+                    self.breaker.release_probe()
+                    raise
+                self._count("failures")
+                if self.breaker.record_failure():
+                    # 방금 회로가 열렸으면 남은 재시도 없이 실패
+                    self._count("circuit_opened")
+                    print(f"🚧 시세 서버 회로 차단: {self.breaker.reset_seconds:.0f}초 동안 요청 중단")
+                    raise
+                if attempt == self.max_attempts:
+                    raise
+                delay = self._backoff(attempt)
+                self._count("retries")
+                self._count("backoff_seconds", delay)
+                print(f"🔁 일시적 오류로 재시도 ({attempt}/{self.max_attempts - 1}, {delay:.2f}초 후): {str(e)}")
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return data
+
+    def stats(self) -> Dict[str, Any]:
+        """시도/대기/차단 집계와 현재 회로 상태"""
+        with self._lock:
+            return {**self.metrics, "circuit_state": self.breaker.state}
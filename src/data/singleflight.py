@@ -0,0 +1,91 @@
+"""
+Single-flight: 같은 키의 동시 요청은 진행 중인 한 번의 호출 결과를 함께 사용
+- 스레드: do(key, fn)
+- asyncio: await do_async(key, coro_fn) (같은 이벤트 루프의 태스크끼리 합류)
+- 먼저 온 요청이 실패하면 합류한 요청도 같은 예외를 받음
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """키별 진행 중 호출을 공유하는 합류기"""
+
+    def __init__(self, name: str = "singleflight"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self._async_calls: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+        self.requests = 0     # 전체 요청 수
+        self.executions = 0   # 실제 실행 수
+        self.coalesced = 0    # 진행 중 호출에 합류한 요청 수
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """key로 진행 중인 호출이 있으면 그 결과를 기다리고, 없으면 fn 실행"""
+        with self._lock:
+            self.requests += 1
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            print(f"🔗 동시 요청 합류: {key}")
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    async def do_async(self, key: Hashable, coro_fn: Callable[[], Awaitable[Any]]) -> Any:
+        """asyncio 버전: 같은 루프에서 key로 진행 중인 코루틴이 있으면 그 결과를 기다림"""
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        with self._lock:
+            self.requests += 1
+            future = self._async_calls.get(loop_key)
+            leader = future is None
+            if leader:
+                future = loop.create_future()
+                self._async_calls[loop_key] = future
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            print(f"🔗 동시 요청 합류: {key}")
+            # 기다리던 태스크가 취소되어도 공유 결과는 취소하지 않음
+            return await asyncio.shield(future)
+
+        try:
+            result = await coro_fn()
+        except BaseException as e:
+            future.set_exception(e)
+            # 합류한 요청이 없으면 예외를 회수한 것으로 표시 (경고 방지)
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._async_calls.pop(loop_key, None)
+
+    def stats(self) -> Dict[str, int]:
+        """요청/실행/합류 집계"""
+        with self._lock:
+            return {"requests": self.requests, "executions": self.executions, "coalesced": self.coalesced}
@@ -0,0 +1,246 @@
+"""
+종목 색인: 로컬 종목 목록(티커, 영문명, 한글명, 거래소, 별칭)에서 티커를 찾고 정규화
+- 정확히 일치(티커/이름/별칭), 접두어, 오타 허용(한글은 자모 단위 편집 거리) 검색
+- 기본 목록은 tickers.csv, CHART_TICKER_UNIVERSE로 추가 목록(CSV, 같은 컬럼) 지정 가능
+- 다운로드 전에 param_tool/보정 단계에서 티커를 검증·정규화하는 데 사용
+"""
+import bisect
+import csv
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+from .. import config
+
+
+DEFAULT_UNIVERSE = os.path.join(os.path.dirname(__file__), "tickers.csv")
+
+# 한글 음절 → 초성/중성/종성 분해용
+_HANGUL_BASE, _HANGUL_END = 0xAC00, 0xD7A3
+_CHOSEONG = [chr(0x1100 + i) for i in range(19)]
+_JUNGSEONG = [chr(0x1161 + i) for i in range(21)]
+_JONGSEONG = [""] + [chr(0x11A8 + i) for i in range(27)]
+
+
+@dataclass(frozen=True)
+class TickerInfo:
+    """종목 정보"""
+    ticker: str                  # yfinance 심볼 (예: NVDA, 005930.KS)
+    name_en: str
+    name_ko: str
+    exchange: str                # NASDAQ, NYSE, KOSPI, KOSDAQ, INDEX, CRYPTO 등
+    aliases: Tuple[str, ...] = field(default=())
+
+    @property
+    def display_name(self) -> str:
+        return f"{self.name_ko}({self.ticker})" if self.name_ko and self.name_ko != self.ticker else self.ticker
+
+
+def normalize_key(text: str) -> str:
+    """검색 키: 소문자, 공백/기호 제거 (한글·영문·숫자만)"""
+    return re.sub(r"[^0-9a-z가-힣]", "", str(text).lower())
+
+
+def decompose_hangul(text: str) -> str:
+    """한글 음절을 자모로 분해 (오타 비교용: '엔비디야' ↔ '엔비디아'가 자모 하나 차이)"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_END:
+            offset = code - _HANGUL_BASE
+            out.append(_CHOSEONG[offset // 588] + _JUNGSEONG[(offset % 588) // 28] + _JONGSEONG[offset % 28])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def _bigrams(text: str) -> Set[str]:
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """편집 거리 (limit를 넘으면 limit + 1)"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class TickerIndex:
+    """메모리 내 종목 색인"""
+
+    def __init__(self, entries: List[TickerInfo]):
+        self.entries: Dict[str, TickerInfo] = {}
+        self._exact: Dict[str, str] = {}        # 검색 키 → 티커
+        self._keys: List[Tuple[str, str]] = []  # (검색 키, 티커) 정렬 목록 → 접두어 검색
+        self._fuzzy_keys: Dict[str, Tuple[str, str]] = {}   # 자모 분해 키 → (검색 키, 티커)
+        self._bigram_index: Dict[str, Set[str]] = {}        # 자모 bigram → 자모 분해 키들
+        for info in entries:
+            self.add(info)
+        self._keys.sort()
+
+    def add(self, info: TickerInfo):
+        self.entries[info.ticker] = info
+        names = [info.ticker, info.name_en, info.name_ko, *info.aliases]
+        # 한국 종목은 코드만으로도 검색 (005930 → 005930.KS)
+        if re.match(r"^\d{6}\.K[SQ]$", info.ticker):
+            names.append(info.ticker.split(".")[0])
+        for name in names:
+            key = normalize_key(name)
+            if not key:
+                continue
+            # 먼저 등록된 키 우선 (티커 자체가 다른 종목의 별칭보다 우선)
+            self._exact.setdefault(key, info.ticker)
+            self._keys.append((key, info.ticker))
+            fuzzy_key = decompose_hangul(key)
+            self._fuzzy_keys.setdefault(fuzzy_key, (key, info.ticker))
+            for gram in _bigrams(fuzzy_key):
+                self._bigram_index.setdefault(gram, set()).add(fuzzy_key)
+
+    def get(self, ticker: str) -> Optional[TickerInfo]:
+        return self.entries.get(ticker)
+
+    def lookup(self, query: str) -> Optional[TickerInfo]:
+        """티커/이름/별칭 정확히 일치 (대소문자·공백 무시)"""
+        ticker = self._exact.get(normalize_key(query))
+        return self.entries[ticker] if ticker else None
+
+    def prefix(self, query: str, limit: int = 10) -> List[TickerInfo]:
+        """접두어 검색"""
+        key = normalize_key(query)
+        if not key:
+            return []
+        results: List[TickerInfo] = []
+        start = bisect.bisect_left(self._keys, (key, ""))
+        for candidate, ticker in self._keys[start:]:
+            if not candidate.startswith(key):
+                break
+            if self.entries[ticker] not in results:
+                results.append(self.entries[ticker])
+                if len(results) >= limit:
+                    break
+        return results
+
+    def fuzzy(self, query: str, limit: int = 5, min_score: float = 0.6) -> List[Tuple[TickerInfo, float]]:
+        """오타 허용 검색 → [(종목, 유사도 0~1)] (한글은 자모 단위로 비교)"""
+        target = decompose_hangul(normalize_key(query))
+        if len(target) < 2:
+            return []
+        grams = _bigrams(target)
+        candidates: Dict[str, int] = {}
+        for gram in grams:
+            for fuzzy_key in self._bigram_index.get(gram, ()):
+                candidates[fuzzy_key] = candidates.get(fuzzy_key, 0) + 1
+
+        best: Dict[str, float] = {}
+        limit_distance = max(1, int(len(target) * (1 - min_score)))
+        # 편집 한 번은 bigram을 최대 2개 바꾸므로, 공유 bigram이 적은 후보는 거리 계산 없이 제외
+        min_shared = len(grams) - 2 * limit_distance
+        for fuzzy_key, shared in candidates.items():
+            if shared < min_shared or abs(len(fuzzy_key) - len(target)) > limit_distance:
+                continue
+            distance = _edit_distance(target, fuzzy_key, limit_distance)
+            if distance > limit_distance:
+                continue
+            score = 1 - distance / max(len(target), len(fuzzy_key))
+            ticker = self._fuzzy_keys[fuzzy_key][1]
+            if score >= min_score and score > best.get(ticker, 0):
+                best[ticker] = score
+        ranked = sorted(best.items(), key=lambda item: -item[1])[:limit]
+        return [(self.entries[ticker], score) for ticker, score in ranked]
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[TickerInfo, float]]:
+        """정확 일치(1.0) → 접두어(0.9) → 오타 허용 순으로 합친 검색 결과"""
+        results: Dict[str, float] = {}
+        exact = self.lookup(query)
+        if exact:
+            results[exact.ticker] = 1.0
+        for info in self.prefix(query, limit):
+            results.setdefault(info.ticker, 0.9)
+        if len(results) < limit:
+            for info, score in self.fuzzy(query, limit):
+                results.setdefault(info.ticker, round(score * 0.9, 3))
+        ranked = sorted(results.items(), key=lambda item: -item[1])[:limit]
+        return [(self.entries[ticker], score) for ticker, score in ranked]
+
+    def resolve(self, query: str, min_score: float = 0.8) -> Optional[str]:
+        """
+        사용자 입력/LLM 추출 값을 yfinance 티커로 정규화
+        - 정확 일치, 유일한 접두어 일치, 충분히 가까운 오타 순으로 시도
+        - 찾지 못하면 None
+        """
+        exact = self.lookup(query)
+        if exact:
+            return exact.ticker
+        prefixed = self.prefix(query, limit=2)
+        if len(prefixed) == 1 and len(normalize_key(query)) >= 2:
+            return prefixed[0].ticker
+        fuzzy = self.fuzzy(query, limit=2, min_score=min_score)
+        if fuzzy and (len(fuzzy) == 1 or fuzzy[0][1] > fuzzy[1][1]):
+            return fuzzy[0][0].ticker
+        return None
+
+
+def load_universe(path: str) -> List[TickerInfo]:
+    """종목 목록 CSV 읽기 (ticker,name_en,name_ko,exchange,aliases; 별칭은 '|'로 구분)"""
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            ticker = (row.get("ticker") or "").strip().upper()
+            if not ticker:
+                continue
+            aliases = tuple(a.strip() for a in (row.get("aliases") or "").split("|") if a.strip())
+            entries.append(TickerInfo(ticker, (row.get("name_en") or "").strip(), (row.get("name_ko") or "").strip(),
+                                      (row.get("exchange") or "").strip(), aliases))
+    return entries
+
+
+_index: Optional[TickerIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_ticker_index() -> TickerIndex:
+    """프로세스 공용 종목 색인 (처음 사용할 때 한 번 생성)"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            entries = load_universe(DEFAULT_UNIVERSE)
+            if config.TICKER_UNIVERSE_PATH and os.path.exists(config.TICKER_UNIVERSE_PATH):
+                entries += load_universe(config.TICKER_UNIVERSE_PATH)
+            _index = TickerIndex(entries)
+        return _index
+
+
+_SYMBOL_PATTERN = re.compile(r"^[A-Z0-9^][A-Z0-9.\-=^]{0,14}$")
+
+
+def looks_like_symbol(text: str) -> bool:
+    """yfinance 심볼 형태인지 (대문자/숫자와 . - ^ = 만 사용, 예: NVDA, 005930.KS, ^GSPC, BTC-USD)"""
+    return bool(_SYMBOL_PATTERN.match(str(text).strip()))
+
+
+def normalize_ticker(symbol: str) -> str:
+    """
+    티커 정규화: 색인에 있으면 yfinance 심볼, 없으면 대문자 + yfinance 표기('.' 대신 '-' 클래스 구분)
+    - "엔비디아" → "NVDA", "005930" → "005930.KS", "brk.b" → "BRK-B"
+    - 이미 심볼 형태(대문자)인 값은 색인에 없어도 접두어/오타 보정을 하지 않음 (색인 밖의 실제 종목일 수 있음)
+    """
+    index = get_ticker_index()
+    exact = index.lookup(symbol)
+    if exact:
+        return exact.ticker
+    if not looks_like_symbol(symbol):
+        resolved = index.resolve(symbol)
+        if resolved:
+            return resolved
+    symbol = str(symbol).strip().upper()
+    # 미국 주식 클래스 표기 (BRK.B → BRK-B), 거래소 접미사(.KS 등 2글자 이상)는 유지
+    return re.sub(r"^([A-Z]+)\.([A-Z])$", r"\1-\2", symbol)
@@ -0,0 +1,3 @@
+"""
+기술적 지표 모듈들
+"""
@@ -0,0 +1,525 @@
+"""
+증분 지표: 과거 데이터로 상태를 만든 뒤(seed) 새 봉마다 O(1)로 갱신
+- 결과는 registry의 일괄 계산(compute_indicators)과 같은 정의
+- 상태는 dict로 직렬화하여 캐시된 시세 옆에 저장
+"""
+import copy
+import math
+from collections import deque
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from . import kernels
+from .registry import group_indicator_specs, format_indicator_spec, _session_ids
+
+NAN = float("nan")
+BAR_FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+STATE_CLASSES: Dict[str, type] = {}
+
+
+def incremental_state(name: str):
+    """지표 이름(registry 대표 이름)에 증분 상태 클래스를 연결하는 데코레이터"""
+    def decorator(cls):
+        STATE_CLASSES[name] = cls
+        return cls
+    return decorator
+
+
+class IndicatorState:
+    """
+    증분 지표 상태 기본 클래스
+    - update(bar): 봉 하나 반영 후 {출력 컬럼: 값} 반환
+    - seed(inputs): 기본 구현은 마지막 lookback개 봉을 update로 재생 (창 기반 지표)
+    """
+    lookback = 1
+
+    def __init__(self, **params):
+        self.params = params
+
+    def seed(self, inputs: Dict[str, np.ndarray]):
+        n = len(inputs["Close"])
+        for i in range(max(0, n - self.lookback), n):
+            self.update({key: values[i] for key, values in inputs.items()})
+
+    def update(self, bar: Dict[str, float]) -> Dict[str, float]:
+        raise NotImplementedError
+
+    def to_dict(self) -> Dict[str, Any]:
+        state = {}
+        for key, value in self.__dict__.items():
+            state[key] = list(value) if isinstance(value, deque) else value
+        return state
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "IndicatorState":
+        obj = cls(**state["params"])
+        for key, value in state.items():
+            current = getattr(obj, key, None)
+            if isinstance(current, deque):
+                current.extend(tuple(v) if isinstance(v, list) else v for v in value)
+            elif key != "params":
+                setattr(obj, key, value)
+        return obj
+
+
+class _RollingSum:
+    """고정 길이 창의 합 (주기적으로 버퍼에서 다시 합산하여 오차 누적 방지)"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.buffer = deque(maxlen=window)
+        self.total = 0.0
+        self.updates = 0
+
+    def push(self, value: float) -> float:
+        if len(self.buffer) == self.window:
+            self.total -= self.buffer[0]
+        self.buffer.append(value)
+        self.total += value
+        self.updates += 1
+        if self.updates % 1024 == 0:
+            self.total = math.fsum(self.buffer)
+        return self.total
+
+    @property
+    def full(self) -> bool:
+        return len(self.buffer) == self.window
+
+    def to_dict(self):
+        return {"window": self.window, "buffer": list(self.buffer), "total": self.total, "updates": self.updates}
+
+    @classmethod
+    def from_dict(cls, state):
+        obj = cls(state["window"])
+        obj.buffer.extend(state["buffer"])
+        obj.total = state["total"]
+        obj.updates = state["updates"]
+        return obj
+
+
+class _AdjustedEWM:
+    """pandas ewm(adjust=True) 평균의 증분 계산: 분자/분모를 각각 재귀 갱신"""
+
+    def __init__(self, alpha: float):
+        self.decay = 1.0 - alpha
+        self.numerator = 0.0
+        self.denominator = 0.0
+
+    def seed(self, values: np.ndarray):
+        values = values[np.isfinite(values)]
+        if len(values):
+            self.numerator = float(kernels.linear_recurrence(values, self.decay)[-1])
+            self.denominator = (1.0 - self.decay ** len(values)) / (1.0 - self.decay)
+
+    def push(self, value: float) -> float:
+        if not math.isfinite(value):
+            return self.value
+        self.numerator = self.decay * self.numerator + value
+        self.denominator = self.decay * self.denominator + 1.0
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self.numerator / self.denominator if self.denominator else NAN
+
+    def to_dict(self):
+        return {"decay": self.decay, "numerator": self.numerator, "denominator": self.denominator}
+
+    @classmethod
+    def from_dict(cls, state):
+        obj = cls(1.0 - state["decay"])
+        obj.numerator = state["numerator"]
+        obj.denominator = state["denominator"]
+        return obj
+
+
+@incremental_state("MA")
+class MovingAverageState(IndicatorState):
+    def __init__(self, windows=(20, 50)):
+        super().__init__(windows=list(windows))
+        self.sums = {str(w): _RollingSum(w) for w in windows}
+        self.lookback = max(windows)
+
+    def update(self, bar):
+        close = bar["Close"]
+        out = {}
+        for key, rolling in self.sums.items():
+            total = rolling.push(close)
+            out[f"MA{key}"] = total / rolling.window if rolling.full else NAN
+        return out
+
+    def to_dict(self):
+        return {"params": self.params, "sums": {key: rolling.to_dict() for key, rolling in self.sums.items()}}
+
+    @classmethod
+    def from_dict(cls, state):
+        obj = cls(**state["params"])
+        obj.sums = {key: _RollingSum.from_dict(value) for key, value in state["sums"].items()}
+        return obj
+
+
+@incremental_state("EMA")
+class EMAState(IndicatorState):
+    def __init__(self, windows=(12, 26)):
+        super().__init__(windows=list(windows))
+        self.ewms = {str(w): _AdjustedEWM(2.0 / (w + 1.0)) for w in windows}
+
+    def seed(self, inputs):
+        for ewm in self.ewms.values():
+            ewm.seed(inputs["Close"])
+
+    def update(self, bar):
+        return {f"EMA{key}": ewm.push(bar["Close"]) for key, ewm in self.ewms.items()}
+
+    def to_dict(self):
+        return {"params": self.params, "ewms": {key: ewm.to_dict() for key, ewm in self.ewms.items()}}
+
+    @classmethod
+    def from_dict(cls, state):
+        obj = cls(**state["params"])
+        obj.ewms = {key: _AdjustedEWM.from_dict(value) for key, value in state["ewms"].items()}
+        return obj
+
+
+@incremental_state("RSI")
+class RSIState(IndicatorState):
+    def __init__(self, window=14):
+        super().__init__(window=window)
+        self.gains = _RollingSum(window)
+        self.losses = _RollingSum(window)
+        self.prev_close = None
+        self.lookback = window + 1
+
+    def update(self, bar):
+        close = bar["Close"]
+        # 첫 봉은 변화량이 없으므로 상승/하락 모두 0 (일괄 계산과 동일)
+        delta = close - self.prev_close if self.prev_close is not None else 0.0
+        self.prev_close = close
+        gain = self.gains.push(max(delta, 0.0))
+        loss = self.losses.push(max(-delta, 0.0))
+        if not self.gains.full:
+            return {"RSI": NAN}
+        if loss == 0:
+            return {"RSI": 100.0 if gain > 0 else NAN}
+        return {"RSI": 100 - 100 / (1 + gain / loss)}
+
+    def to_dict(self):
+        return {"params": self.params, "gains": self.gains.to_dict(), "losses": self.losses.to_dict(),
+                "prev_close": self.prev_close}
+
+    @classmethod
+    def from_dict(cls, state):
+        obj = cls(**state["params"])
+        obj.gains = _RollingSum.from_dict(state["gains"])
+        obj.losses = _RollingSum.from_dict(state["losses"])
+        obj.prev_close = state["prev_close"]
+        return obj
+
+
+@incremental_state("MACD")
+class MACDState(IndicatorState):
+    def __init__(self, fast=12, slow=26, signal=9):
+        super().__init__(fast=fast, slow=slow, signal=signal)
+        self.fast = _AdjustedEWM(2.0 / (fast + 1.0))
+        self.slow = _AdjustedEWM(2.0 / (slow + 1.0))
+        self.signal = _AdjustedEWM(2.0 / (signal + 1.0))
+
+    def seed(self, inputs):
+        close = inputs["Close"]
+        self.fast.seed(close)
+        self.slow.seed(close)
+        macd = kernels.ewm_mean(close, span=self.params["fast"]) - kernels.ewm_mean(close, span=self.params["slow"])
+        self.signal.seed(macd)
+
+    def update(self, bar):
+        macd = self.fast.push(bar["Close"]) - self.slow.push(bar["Close"])
+        signal = self.signal.push(macd)
+        return {"MACD": macd, "MACD_Signal": signal, "MACD_Histogram": macd - signal}
+
+    def to_dict(self):
+        return {"params": self.params, "fast": self.fast.to_dict(), "slow": self.slow.to_dict(),
+                "signal": self.signal.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state):
+        obj = cls(**state["params"])
+        obj.fast = _AdjustedEWM.from_dict(state["fast"])
+        obj.slow = _AdjustedEWM.from_dict(state["slow"])
+        obj.signal = _AdjustedEWM.from_dict(state["signal"])
+        return obj
+
+
+@incremental_state("Bollinger")
+class BollingerState(IndicatorState):
+    def __init__(self, window=20, num_std=2.0):
+        super().__init__(window=window, num_std=num_std)
+        self.buffer = deque(maxlen=window)
+        self.lookback = window
+
+    def update(self, bar):
+        self.buffer.append(bar["Close"])
+        window = self.params["window"]
+        if len(self.buffer) < window:
+            return {"BB_Middle": NAN, "BB_Upper": NAN, "BB_Lower": NAN}
+        # 창 길이는 상수이므로 버퍼에서 바로 계산 (전체 이력 길이와 무관)
+        middle = math.fsum(self.buffer) / window
+        std = math.sqrt(math.fsum((x - middle) ** 2 for x in self.buffer) / (window - 1))
+        band = std * self.params["num_std"]
+        return {"BB_Middle": middle, "BB_Upper": middle + band, "BB_Lower": middle - band}
+
+
+@incremental_state("ATR")
+class ATRState(IndicatorState):
+    def __init__(self, window=14):
+        super().__init__(window=window)
+        self.prev_close = None
+        self.atr = None
+
+    def seed(self, inputs):
+        high, low, close = inputs["High"], inputs["Low"], inputs["Close"]
+        if len(close) == 0:
+            return
+        prev_close = np.concatenate(([np.nan], close[:-1]))
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        self.atr = float(kernels.ewm_mean(true_range, alpha=1.0 / self.params["window"], adjust=False)[-1])
+        self.prev_close = float(close[-1])
+
+    def update(self, bar):
+        true_range = bar["High"] - bar["Low"]
+        if self.prev_close is not None:
+            true_range = max(true_range, abs(bar["High"] - self.prev_close), abs(bar["Low"] - self.prev_close))
+        alpha = 1.0 / self.params["window"]
+        self.atr = true_range if self.atr is None else (1 - alpha) * self.atr + alpha * true_range
+        self.prev_close = bar["Close"]
+        return {"ATR": self.atr}
+
+
+@incremental_state("Stochastic")
+class StochasticState(IndicatorState):
+    def __init__(self, k_window=14, d_window=3):
+        super().__init__(k_window=k_window, d_window=d_window)
+        self.count = 0
+        self.highs = deque()  # (봉 번호, 고가) 단조 감소 큐 → 창 최댓값
+        self.lows = deque()   # (봉 번호, 저가) 단조 증가 큐 → 창 최솟값
+        self.percent_k = deque(maxlen=d_window)
+        self.lookback = k_window + d_window - 1
+
+    def update(self, bar):
+        k_window = self.params["k_window"]
+        i = self.count
+        self.count += 1
+        while self.highs and self.highs[-1][1] <= bar["High"]:
+            self.highs.pop()
+        self.highs.append((i, bar["High"]))
+        while self.lows and self.lows[-1][1] >= bar["Low"]:
+            self.lows.pop()
+        self.lows.append((i, bar["Low"]))
+        while self.highs[0][0] <= i - k_window:
+            self.highs.popleft()
+        while self.lows[0][0] <= i - k_window:
+            self.lows.popleft()
+
+        percent_k = NAN
+        if self.count >= k_window:
+            highest, lowest = self.highs[0][1], self.lows[0][1]
+            if highest != lowest:
+                percent_k = 100 * (bar["Close"] - lowest) / (highest - lowest)
+        self.percent_k.append(percent_k)
+        values = list(self.percent_k)
+        valid = len(values) == self.params["d_window"] and all(math.isfinite(v) for v in values)
+        return {"STOCH_K": percent_k, "STOCH_D": math.fsum(values) / len(values) if valid else NAN}
+
+
+@incremental_state("VWAP")
+class VWAPState(IndicatorState):
+    def __init__(self, intraday: bool = False):
+        super().__init__(intraday=intraday)
+        self.session = None
+        self.cum_pv = 0.0
+        self.cum_v = 0.0
+
+    def seed(self, inputs):
+        sessions = inputs["Session"]
+        if len(sessions) == 0:
+            return
+        start = 0
+        if self.params["intraday"]:
+            start = int(np.flatnonzero(sessions == sessions[-1])[0])
+        typical = (inputs["High"][start:] + inputs["Low"][start:] + inputs["Close"][start:]) / 3
+        self.cum_pv = float(np.sum(typical * inputs["Volume"][start:]))
+        self.cum_v = float(np.sum(inputs["Volume"][start:]))
+        self.session = int(sessions[-1])
+
+    def update(self, bar):
+        # 분봉/시간봉이면 거래일이 바뀔 때 누적 초기화
+        if self.params["intraday"] and self.session is not None and bar["Session"] != self.session:
+            self.cum_pv = 0.0
+            self.cum_v = 0.0
+        self.session = int(bar["Session"])
+        self.cum_pv += (bar["High"] + bar["Low"] + bar["Close"]) / 3 * bar["Volume"]
+        self.cum_v += bar["Volume"]
+        return {"VWAP": self.cum_pv / self.cum_v if self.cum_v else NAN}
+
+
+@incremental_state("OBV")
+class OBVState(IndicatorState):
+    def __init__(self):
+        super().__init__()
+        self.prev_close = None
+        self.obv = 0.0
+
+    def seed(self, inputs):
+        close, volume = inputs["Close"], inputs["Volume"]
+        if len(close) == 0:
+            return
+        direction = np.sign(np.diff(close))
+        self.obv = float(np.sum(direction * volume[1:]))
+        self.prev_close = float(close[-1])
+
+    def update(self, bar):
+        if self.prev_close is not None:
+            self.obv += math.copysign(bar["Volume"], bar["Close"] - self.prev_close) if bar["Close"] != self.prev_close else 0.0
+        self.prev_close = bar["Close"]
+        return {"OBV": self.obv}
+
+
+@incremental_state("price")
+@incremental_state("Volume")
+class _NoOutputState(IndicatorState):
+    """기본 데이터에 이미 있는 항목 (계산 없음)"""
+
+    def seed(self, inputs):
+        pass
+
+    def update(self, bar):
+        return {}
+
+
+def _is_intraday(sessions: np.ndarray) -> bool:
+    return len(sessions) > 0 and len(np.unique(sessions)) < len(sessions)
+
+
+def _bar_inputs(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    inputs = {col: df[col].to_numpy(dtype=np.float64) for col in BAR_FIELDS}
+    inputs["Session"] = _session_ids(df.index)
+    return inputs
+
+
+class IncrementalIndicators:
+    """
+    여러 지표의 증분 상태 묶음
+    - seed(df): df의 모든 봉을 확정 상태로 반영
+    - append(bars): 새 봉을 반영하고 해당 봉들의 지표 값을 반환
+      마지막 봉은 아직 진행 중일 수 있으므로 임시로만 반영하고, 같은 시각의 봉이 다시 오면 교체
+    """
+
+    def __init__(self, indicators: List[str], intraday: Optional[bool] = None):
+        self.specs = [format_indicator_spec(indicator.name, params)
+                      for indicator, params in group_indicator_specs(indicators)]
+        self.intraday = intraday
+        self.states: Dict[str, IndicatorState] = {}
+        self.last_ts: Optional[pd.Timestamp] = None      # 마지막 확정 봉 시각
+        self.pending: Optional[Dict[str, Any]] = None    # 임시 반영된 마지막 봉
+
+    def _build_states(self):
+        for indicator, params in group_indicator_specs(self.specs):
+            state_cls = STATE_CLASSES.get(indicator.name)
+            if state_cls is None:
+                print(f"⚠️  증분 계산을 지원하지 않는 지표: {indicator.name}")
+                continue
+            merged = {**indicator.params, **params}
+            if indicator.name == "VWAP":
+                merged["intraday"] = bool(self.intraday)
+            self.states[indicator.name] = state_cls(**merged)
+
+    def seed(self, df: pd.DataFrame):
+        """과거 시세로 상태 초기화 (벡터 연산 또는 마지막 창만 재생)"""
+        inputs = _bar_inputs(df)
+        if self.intraday is None:
+            self.intraday = _is_intraday(inputs["Session"])
+        self._build_states()
+        for state in self.states.values():
+            state.seed(inputs)
+        self.last_ts = df.index[-1] if len(df) else None
+        self.pending = None
+
+    def _apply(self, states: Dict[str, IndicatorState], bar: Dict[str, float]) -> Dict[str, float]:
+        out = {}
+        for state in states.values():
+            out.update(state.update(bar))
+        return out
+
+    def append(self, bars: pd.DataFrame) -> pd.DataFrame:
+        """새 봉 반영 → 해당 봉들의 지표 값 DataFrame (인덱스는 봉 시각)"""
+        if self.last_ts is not None:
+            bars = bars[bars.index > self.last_ts]
+        if bars.empty:
+            return pd.DataFrame()
+
+        # 임시 반영했던 봉보다 새 봉만 왔다면, 임시 봉을 확정 반영
+        if self.pending is not None and bars.index[0] > pd.Timestamp(self.pending["ts"]):
+            self._apply(self.states, self.pending["bar"])
+            self.last_ts = pd.Timestamp(self.pending["ts"])
+        self.pending = None
+
+        inputs = _bar_inputs(bars)
+        rows = []
+        for i, ts in enumerate(bars.index):
+            bar = {key: values[i].item() for key, values in inputs.items()}
+            if i < len(bars) - 1:
+                rows.append(self._apply(self.states, bar))
+                self.last_ts = ts
+            else:
+                # 마지막 봉은 상태 사본에만 반영
+                rows.append(self._apply(copy.deepcopy(self.states), bar))
+                self.pending = {"ts": ts.isoformat(), "bar": bar}
+        return pd.DataFrame(rows, index=bars.index)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "specs": self.specs,
+            "intraday": self.intraday,
+            "last_ts": self.last_ts.isoformat() if self.last_ts is not None else None,
+            "pending": self.pending,
+            "states": {name: state.to_dict() for name, state in self.states.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IncrementalIndicators":
+        obj = cls(data["specs"], intraday=data["intraday"])
+        obj.last_ts = pd.Timestamp(data["last_ts"]) if data["last_ts"] else None
+        obj.pending = data["pending"]
+        obj.states = {name: STATE_CLASSES[name].from_dict(state) for name, state in data["states"].items()}
+        return obj
+
+
+def indicator_state_key(indicators: List[str]) -> str:
+    """지표 조합별 상태 저장 키"""
+    return ",".join(sorted(format_indicator_spec(indicator.name, params)
+                           for indicator, params in group_indicator_specs(indicators)))
+
+
+def advance_indicators(cache, ticker: str, interval: str, indicators: List[str], data: pd.DataFrame) -> pd.DataFrame:
+    """
+    캐시에 저장된 증분 상태로 새 봉의 지표만 계산 (폴링/실시간 갱신용)
+    - 저장된 상태가 없거나 시세와 맞지 않으면 data로 새로 seed (마지막 봉만 결과로 반환)
+    - 반환: 마지막 확정 봉 이후 봉들의 지표 값
+    """
+    key = indicator_state_key(indicators)
+    saved = cache.load_indicator_state(ticker, interval, key)
+    engine = None
+    if saved:
+        engine = IncrementalIndicators.from_dict(saved)
+        if engine.last_ts is None or engine.last_ts not in data.index:
+            engine = None
+
+    if engine is None:
+        engine = IncrementalIndicators(indicators)
+        engine.seed(data.iloc[:-1])
+        new_values = engine.append(data.iloc[-1:])
+    else:
+        new_values = engine.append(data)
+
+    cache.save_indicator_state(ticker, interval, key, engine.to_dict())
+    return new_values
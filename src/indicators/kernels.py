@@ -0,0 +1,207 @@
+"""
+NumPy 지표 커널
+- 입력은 float64 1차원 배열, 출력은 같은 길이의 배열 (워밍업 구간은 NaN)
+- 앞쪽 NaN(다른 지표의 워밍업 구간)은 건너뜀
+- 이동 창 커널은 중간 NaN이 포함된 창을 NaN으로, 지수가중 커널은 중간 NaN이 없다고 가정 (dropna 이후 데이터)
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _first_valid(x: np.ndarray) -> int:
+    """첫 번째 유한값 위치 (없으면 len(x))"""
+    valid = np.flatnonzero(np.isfinite(x))
+    return int(valid[0]) if len(valid) else len(x)
+
+
+def _check_window(window):
+    """창 길이 검증 (1 미만 창은 누적합 차분에서 배열 크기 오류로 이어지므로 먼저 막음)"""
+    if window < 1:
+        raise ValueError(f"window must be >= 1 (got {window})")
+
+
+def _mask_gaps(body: np.ndarray):
+    """중간 NaN(예: 0/0으로 생긴 값)을 0으로 바꾼 배열과 NaN 누적 개수 반환 (NaN이 없으면 None)"""
+    gaps = np.isnan(body)
+    if not gaps.any():
+        return body, None
+    return np.where(gaps, 0.0, body), np.concatenate(([0], np.cumsum(gaps)))
+
+
+def _rolling_moments(body: np.ndarray, windows, squares: bool = False, block: int = 8192) -> dict:
+    """
+    여러 창 길이의 이동평균(과 편차 제곱합)을 누적합 한 번으로 계산
+    - 끝 위치 기준 블록마다 (가장 긴 창만큼 앞을 포함한) 구간의 평균을 빼고 누적하여 정밀도 손실을 막음
+    - 같은 누적합에서 창 길이별 차분만 달리 취하므로 창이 여러 개여도 누적합은 한 번
+    - 반환: {창 길이: (이동평균, 편차 제곱합 또는 None)}, 각 배열은 body[w-1:]에 대응
+    - 중간 NaN이 포함된 창은 NaN (pandas min_periods=window와 같은 결과)
+    """
+    n = len(body)
+    windows = sorted(set(w for w in windows if w <= n))
+    body, gap_count = _mask_gaps(body)
+    moments = {w: (np.empty(n - w + 1), np.empty(n - w + 1) if squares else None) for w in windows}
+    if not windows:
+        return moments
+    longest = windows[-1]
+
+    for e0 in range(0, n, block):
+        e1 = min(e0 + block, n)
+        s0 = max(0, e0 - longest + 1)
+        z = body[s0:e1]
+        center = z.mean()
+        z = z - center
+        csum = np.concatenate(([0.0], np.cumsum(z)))
+        csq = np.concatenate(([0.0], np.cumsum(z * z))) if squares else None
+        for w in windows:
+            lo = max(e0, w - 1)
+            if lo >= e1:
+                continue
+            hi_idx = slice(lo - s0 + 1, e1 - s0 + 1)
+            lo_idx = slice(lo - s0 + 1 - w, e1 - s0 + 1 - w)
+            sums = csum[hi_idx] - csum[lo_idx]
+            means, m2 = moments[w]
+            means[lo - w + 1:e1 - w + 1] = center + sums / w
+            if squares:
+                m2[lo - w + 1:e1 - w + 1] = (csq[hi_idx] - csq[lo_idx]) - sums * sums / w
+
+    if gap_count is not None:
+        for w, (means, m2) in moments.items():
+            has_gap = (gap_count[w:] - gap_count[:-w]) > 0
+            means[has_gap] = np.nan
+            if m2 is not None:
+                m2[has_gap] = np.nan
+    return moments
+
+
+def rolling_means(x: np.ndarray, windows) -> dict:
+    """여러 창 길이의 단순 이동평균을 누적합 한 번으로 계산 → {창 길이: 배열}"""
+    for w in windows:
+        _check_window(w)
+    x = np.asarray(x, dtype=np.float64)
+    start = _first_valid(x)
+    moments = _rolling_moments(x[start:], windows)
+    result = {}
+    for w in windows:
+        out = np.full(len(x), np.nan)
+        if w in moments:
+            out[start + w - 1:] = moments[w][0]
+        result[w] = out
+    return result
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """단순 이동평균 (누적합 차분, O(n))"""
+    return rolling_means(x, (window,))[window]
+
+
+def rolling_std(x: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    """이동 표준편차 (누적합/누적 제곱합 차분, O(n))"""
+    _check_window(window)
+    x = np.asarray(x, dtype=np.float64)
+    out = np.full(len(x), np.nan)
+    start = _first_valid(x)
+    moments = _rolling_moments(x[start:], (window,), squares=True)
+    if window in moments:
+        m2 = moments[window][1]
+        out[start + window - 1:] = np.sqrt(np.maximum(m2 / (window - ddof), 0.0))
+    return out
+
+
+def rolling_max(x: np.ndarray, window: int) -> np.ndarray:
+    """이동 최댓값"""
+    _check_window(window)
+    x = np.asarray(x, dtype=np.float64)
+    out = np.full(len(x), np.nan)
+    start = _first_valid(x)
+    if len(x) - start < window:
+        return out
+    out[start + window - 1:] = sliding_window_view(x[start:], window).max(axis=1)
+    return out
+
+
+def rolling_min(x: np.ndarray, window: int) -> np.ndarray:
+    """이동 최솟값"""
+    _check_window(window)
+    x = np.asarray(x, dtype=np.float64)
+    out = np.full(len(x), np.nan)
+    start = _first_valid(x)
+    if len(x) - start < window:
+        return out
+    out[start + window - 1:] = sliding_window_view(x[start:], window).min(axis=1)
+    return out
+
+
+def linear_recurrence(x: np.ndarray, decay: float) -> np.ndarray:
+    """
+    s[t] = decay * s[t-1] + x[t] (s[-1] = 0) 를 블록 단위 닫힌 식으로 계산
+    - 블록 안에서 s[t0+k] = decay^k * Σ decay^-j * x[t0+j] + decay^(k+1) * carry
+    - decay^-j가 넘치지 않도록 블록 길이를 제한하고, 블록 간 carry는 같은 식으로 재귀 계산
+    """
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    if n == 0:
+        return np.empty(0)
+    if decay <= 1e-12:
+        return x.copy()
+
+    block = n if decay >= 1.0 else max(1, min(n, int(100 / -np.log10(decay))))
+    blocks = -(-n // block)
+    padded = np.zeros(blocks * block)
+    padded[:n] = x
+    k = np.arange(block, dtype=np.float64)
+
+    # 블록별로 carry=0이라고 보고 계산한 뒤 (제자리 연산), 이전 블록들의 carry를 더함
+    local = padded.reshape(blocks, block)
+    local *= decay ** -k
+    np.cumsum(local, axis=1, out=local)
+    local *= decay ** k
+    if blocks > 1:
+        carries = linear_recurrence(local[:, -1], decay ** block)
+        # decay^(k+1)이 배정밀도 이하로 작아진 뒤의 carry 기여는 무시
+        head = min(block, int(17 / -np.log10(decay)) + 1) if decay < 1.0 else block
+        local[1:, :head] += carries[:-1, None] * decay ** (k[:head] + 1)
+    return padded[:n]
+
+
+def ewm_mean(x: np.ndarray, span: float = None, alpha: float = None, adjust: bool = True) -> np.ndarray:
+    """
+    지수가중 이동평균 (pandas ewm(...).mean()과 동일한 정의)
+    - adjust=True: Σ(1-a)^i x[t-i] / Σ(1-a)^i
+    - adjust=False: y[t] = (1-a) y[t-1] + a x[t], y[0] = x[0]
+    """
+    if alpha is None:
+        if span is None or span < 1:
+            raise ValueError(f"span must be >= 1 (got {span})")
+        alpha = 2.0 / (span + 1.0)
+    if not 0 < alpha <= 1:
+        raise ValueError(f"alpha must be in (0, 1] (got {alpha})")
+    x = np.asarray(x, dtype=np.float64)
+    out = np.full(len(x), np.nan)
+    start = _first_valid(x)
+    body = x[start:]
+    if len(body) == 0:
+        return out
+
+    decay = 1.0 - alpha
+    if adjust:
+        numerator = linear_recurrence(body, decay)
+        # 가중치 합 Σ(1-a)^i = (1 - (1-a)^(t+1)) / a, (1-a)^(t+1)이 0으로 수렴한 뒤는 상수
+        denominator = np.full(len(body), 1.0 / alpha)
+        head = min(len(body), int(40 / -np.log10(decay)) + 1) if 0 < decay < 1 else len(body)
+        denominator[:head] = (1.0 - decay ** np.arange(1, head + 1)) / alpha
+        out[start:] = numerator / denominator
+    else:
+        weighted = alpha * body
+        weighted[0] = body[0]
+        out[start:] = linear_recurrence(weighted, decay)
+    return out
+
+
+def diff(x: np.ndarray) -> np.ndarray:
+    """1차 차분 (첫 값은 NaN)"""
+    x = np.asarray(x, dtype=np.float64)
+    out = np.empty(len(x))
+    if len(x):
+        out[0] = np.nan
+        out[1:] = x[1:] - x[:-1]
+    return out
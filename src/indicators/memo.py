@@ -0,0 +1,98 @@
+"""
+지표 계산 결과 메모이제이션
+- 키: (입력 데이터 지문, 지표 이름, 파라미터) → 같은 시세에 같은 지표를 다시 계산하지 않음
+- 프로세스 공용 LRU (세션/스레드 간 공유), 용량 기준 삭제, 적중/미스 집계
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+import numpy as np
+from .. import config
+
+
+def array_fingerprint(values: np.ndarray) -> str:
+    """배열 내용 해시 (dtype/길이 포함)"""
+    values = np.ascontiguousarray(values)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{values.dtype.str}:{values.shape}".encode())
+    digest.update(values.view(np.uint8) if values.size else b"")
+    return digest.hexdigest()
+
+
+def _freeze(params: Dict[str, Any]) -> Tuple:
+    return tuple(sorted((key, tuple(value) if isinstance(value, (list, tuple)) else value)
+                        for key, value in params.items()))
+
+
+class IndicatorMemo:
+    """지표 결과 LRU 캐시 ({출력 컬럼: 읽기 전용 배열} 보관)"""
+
+    def __init__(self, max_bytes: int = None):
+        self.max_bytes = max_bytes if max_bytes is not None else config.INDICATOR_MEMO_MAX_BYTES
+        self._entries: "OrderedDict[Hashable, Tuple[Dict[str, np.ndarray], int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(fingerprints: Tuple[str, ...], name: str, params: Dict[str, Any]) -> Hashable:
+        return (fingerprints, name, _freeze(params))
+
+    def get(self, key: Hashable) -> Optional[Dict[str, np.ndarray]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, outputs: Dict[str, np.ndarray]):
+        # 호출자가 결과 배열을 수정해 캐시가 오염되지 않도록 읽기 전용으로 보관
+        for values in outputs.values():
+            values.flags.writeable = False
+        size = sum(values.nbytes for values in outputs.values())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (outputs, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/미스 집계와 현재 용량"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+_default_memo: Optional[IndicatorMemo] = None
+_default_lock = threading.Lock()
+
+
+def get_default_memo() -> IndicatorMemo:
+    """프로세스 공용 지표 메모 인스턴스"""
+    global _default_memo
+    with _default_lock:
+        if _default_memo is None:
+            _default_memo = IndicatorMemo()
+        return _default_memo
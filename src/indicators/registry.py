@@ -0,0 +1,348 @@
+"""
+지표 레지스트리: 각 지표의 입력, 파라미터, 출력 컬럼, 워밍업 길이를 선언하고 NumPy 커널로 계산
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from . import kernels
+from .memo import get_default_memo, array_fingerprint
+
+
+@dataclass(frozen=True)
+class Indicator:
+    """지표 정의"""
+    name: str                                   # 대표 이름 (chart_params의 indicators 값)
+    compute: Callable[..., Dict[str, np.ndarray]]  # compute(inputs, **params) -> {출력 컬럼: 배열}
+    inputs: Tuple[str, ...]                     # 필요한 DataFrame 컬럼 ("Session"은 거래일 구분값)
+    params: Dict[str, Any]                      # 파라미터 기본값
+    outputs: Callable[[Dict[str, Any]], List[str]]  # 파라미터 → 출력 컬럼 이름
+    warmup: Callable[[Dict[str, Any]], int]     # 파라미터 → 값이 안정되기까지 필요한 봉 수
+    aliases: Tuple[str, ...] = field(default=())  # 한글명 등 별칭
+
+
+INDICATORS: Dict[str, Indicator] = {}
+_ALIASES: Dict[str, str] = {}
+
+
+def register_indicator(name: str, inputs: Tuple[str, ...], params: Dict[str, Any],
+                       outputs: Callable[[Dict[str, Any]], List[str]],
+                       warmup: Callable[[Dict[str, Any]], int],
+                       aliases: Tuple[str, ...] = ()):
+    """지표 계산 함수를 레지스트리에 등록하는 데코레이터"""
+    def decorator(compute):
+        indicator = Indicator(name, compute, inputs, params, outputs, warmup, aliases)
+        INDICATORS[name] = indicator
+        for key in (name,) + aliases:
+            _ALIASES[key.lower()] = name
+        return compute
+    return decorator
+
+
+_SPEC_CALL = re.compile(r"^\s*([^\s(]+)\s*\(([^)]*)\)\s*$")   # MA(20,60)
+_SPEC_SUFFIX = re.compile(r"^\s*([A-Za-z]+)\s*(\d+)\s*$")       # MA20
+
+
+def parse_indicator_spec(spec: str) -> Tuple[Optional[Indicator], Dict[str, Any]]:
+    """
+    지표 문자열 해석 → (지표 정의, 파라미터)
+    - "RSI", "이동평균": 기본 파라미터
+    - "MA(5,20,60)", "EMA(12,26)": windows 파라미터가 있는 지표는 숫자 전체가 창 길이
+    - "MACD(12,26,9)", "RSI(21)": 그 외 지표는 숫자를 파라미터 선언 순서대로 대입
+    - "MA20": 창 길이 하나
+    - 창 길이가 1 미만이거나 정수가 아니면(MA(0), MA(2.5)), 실수 파라미터가 0 이하이면 등록되지 않은 지표처럼 (None, {})
+    """
+    spec = str(spec)
+    args: List[str] = []
+    match = _SPEC_CALL.match(spec) or _SPEC_SUFFIX.match(spec)
+    if match and resolve_indicator(match.group(1)) is not None:
+        name = match.group(1)
+        args = re.findall(r"-?\d+(?:\.\d+)?", match.group(2))
+    else:
+        name = spec
+
+    indicator = resolve_indicator(name)
+    if indicator is None or not args:
+        return indicator, {}
+
+    values = [float(arg) if "." in arg else int(arg) for arg in args]
+    if "windows" in indicator.params:
+        params = {"windows": tuple(sorted(set(values)))}
+    else:
+        params = dict(zip(indicator.params, values))
+    if not all(_valid_param(indicator.params[key], value) for key, value in params.items()):
+        return None, {}
+    if "windows" in params:
+        params["windows"] = tuple(sorted(set(int(w) for w in params["windows"])))
+    return indicator, params
+
+
+def _valid_param(default: Any, value: Any) -> bool:
+    """파라미터 값 검증: 정수 기본값(창 길이)은 1 이상의 정수, 실수 기본값(num_std 등)은 0보다 큰 값"""
+    if isinstance(default, tuple):
+        return len(value) > 0 and all(_valid_param(default[0], v) for v in value)
+    if isinstance(default, int):
+        return float(value).is_integer() and value >= 1
+    return value > 0
+
+
+def format_indicator_spec(name: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """parse_indicator_spec의 역변환 (기본 파라미터면 이름만)"""
+    indicator = resolve_indicator(name)
+    canonical = indicator.name if indicator else str(name)
+    if not params:
+        return canonical
+    if "windows" in params:
+        values = params["windows"]
+    else:
+        values = [params[key] for key in (indicator.params if indicator else params) if key in params]
+    return f"{canonical}({','.join(str(v) for v in values)})"
+
+
+def resolve_indicator(name: str) -> Optional[Indicator]:
+    """이름/별칭으로 지표 정의 찾기 (대소문자 무시)"""
+    canonical = _ALIASES.get(str(name).strip().lower())
+    return INDICATORS.get(canonical) if canonical else None
+
+
+def indicator_name(spec: str) -> Optional[str]:
+    """지표 문자열의 대표 이름 ("MA(20,60)" → "MA", "볼린저밴드" → "Bollinger")"""
+    indicator, _ = parse_indicator_spec(spec)
+    return indicator.name if indicator else None
+
+
+def indicator_columns(spec: str, params: Optional[Dict[str, Any]] = None) -> List[str]:
+    """지표가 만드는 출력 컬럼 이름 (등록되지 않은 지표면 빈 리스트)"""
+    indicator, spec_params = parse_indicator_spec(spec)
+    if indicator is None:
+        return []
+    return indicator.outputs({**indicator.params, **spec_params, **(params or {})})
+
+
+def _session_ids(index: pd.Index) -> np.ndarray:
+    """거래일 구분값 (같은 날짜의 봉은 같은 값)"""
+    if isinstance(index, pd.DatetimeIndex):
+        return index.normalize().as_unit("ns").asi8
+    return np.zeros(len(index), dtype=np.int64)
+
+
+def _gather_inputs(df: pd.DataFrame, indicator: Indicator) -> Dict[str, np.ndarray]:
+    inputs = {}
+    for col in indicator.inputs:
+        if col == "Session":
+            inputs[col] = _session_ids(df.index)
+        else:
+            inputs[col] = df[col].to_numpy(dtype=np.float64)
+    return inputs
+
+
+def compute_indicator(df: pd.DataFrame, spec: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, np.ndarray]:
+    """지표 하나 계산 → {출력 컬럼: 배열}"""
+    indicator, spec_params = parse_indicator_spec(spec)
+    if indicator is None:
+        raise KeyError(f"등록되지 않은 지표입니다: {spec}")
+    merged = {**indicator.params, **spec_params, **(params or {})}
+    return indicator.compute(_gather_inputs(df, indicator), **merged)
+
+
+def group_indicator_specs(indicators: list) -> List[Tuple[Indicator, Dict[str, Any]]]:
+    """
+    지표 문자열 목록을 (지표, 파라미터) 목록으로 정리
+    - 같은 지표의 windows는 합쳐서 한 번에 계산 ("MA(20)", "MA60" → MA windows=(20, 60))
+    - 등록되지 않은 지표는 경고 후 제외
+    """
+    grouped: Dict[str, Tuple[Indicator, Dict[str, Any]]] = {}
+    for spec in indicators:
+        indicator, params = parse_indicator_spec(spec)
+        if indicator is None:
+            print(f"⚠️  지원하지 않는 지표: {spec}")
+            continue
+        if indicator.name in grouped and "windows" in indicator.params:
+            previous = grouped[indicator.name][1].get("windows", indicator.params["windows"])
+            current = params.get("windows", indicator.params["windows"])
+            params = {"windows": tuple(sorted(set(previous) | set(current)))}
+        grouped[indicator.name] = (indicator, params)
+    return list(grouped.values())
+
+
+def compute_indicators(data: pd.DataFrame, indicators: list, memo=None) -> pd.DataFrame:
+    """
+    여러 지표를 계산해 컬럼으로 추가한 DataFrame 반환 (원본 컬럼 데이터는 복사하지 않음)
+    - 같은 입력 데이터·지표·파라미터의 결과는 메모(기본: 프로세스 공용)에서 재사용
+    """
+    memo = memo if memo is not None else get_default_memo()
+    columns: Dict[str, np.ndarray] = {}
+    fingerprints: Dict[str, str] = {}
+
+    new_columns: Dict[str, np.ndarray] = {}
+    for indicator, params in group_indicator_specs(indicators):
+        if not indicator.inputs:
+            continue
+        merged = {**indicator.params, **params}
+        for col in indicator.inputs:
+            if col not in columns:
+                columns[col] = _session_ids(data.index) if col == "Session" else data[col].to_numpy(dtype=np.float64)
+        inputs = {col: columns[col] for col in indicator.inputs}
+        if memo.max_bytes <= 0:
+            new_columns.update(indicator.compute(inputs, **merged))
+            continue
+        for col in indicator.inputs:
+            if col not in fingerprints:
+                fingerprints[col] = array_fingerprint(columns[col])
+        key = memo.make_key(tuple(fingerprints[col] for col in indicator.inputs), indicator.name, merged)
+        outputs = memo.get(key)
+        if outputs is None:
+            outputs = indicator.compute(inputs, **merged)
+            memo.put(key, outputs)
+        new_columns.update(outputs)
+
+    if not new_columns:
+        return data
+    # 컬럼을 하나씩 삽입하지 않고 한 번에 붙임 (같은 이름의 기존 컬럼은 교체)
+    base = data.drop(columns=[col for col in new_columns if col in data.columns])
+    return pd.concat([base, pd.DataFrame(new_columns, index=data.index)], axis=1)
+
+
+# ---------------------------------------------------------------------------
+# 기본 지표
+# ---------------------------------------------------------------------------
+
+@register_indicator(
+    "MA", inputs=("Close",), params={"windows": (20, 50)},
+    outputs=lambda p: [f"MA{w}" for w in p["windows"]],
+    warmup=lambda p: max(p["windows"]) - 1,
+    aliases=("이동평균", "SMA"),
+)
+def _moving_average(inputs, windows):
+    # 모든 창 길이를 누적합 한 번으로 계산
+    return {f"MA{w}": values for w, values in kernels.rolling_means(inputs["Close"], windows).items()}
+
+
+@register_indicator(
+    "EMA", inputs=("Close",), params={"windows": (12, 26)},
+    outputs=lambda p: [f"EMA{w}" for w in p["windows"]],
+    warmup=lambda p: max(p["windows"]),
+    aliases=("지수이동평균",),
+)
+def _exponential_moving_average(inputs, windows):
+    return {f"EMA{w}": kernels.ewm_mean(inputs["Close"], span=w) for w in windows}
+
+
+@register_indicator(
+    "RSI", inputs=("Close",), params={"window": 14},
+    outputs=lambda p: ["RSI"],
+    warmup=lambda p: p["window"],
+)
+def _rsi(inputs, window):
+    delta = kernels.diff(inputs["Close"])
+    with np.errstate(invalid="ignore"):
+        gain = kernels.rolling_mean(np.where(delta > 0, delta, 0.0), window)
+        loss = kernels.rolling_mean(np.where(delta < 0, -delta, 0.0), window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = gain / loss
+        rsi = 100 - (100 / (1 + rs))
+    return {"RSI": rsi}
+
+
+@register_indicator(
+    "MACD", inputs=("Close",), params={"fast": 12, "slow": 26, "signal": 9},
+    outputs=lambda p: ["MACD", "MACD_Signal", "MACD_Histogram"],
+    warmup=lambda p: p["slow"] + p["signal"],
+)
+def _macd(inputs, fast, slow, signal):
+    close = inputs["Close"]
+    macd = kernels.ewm_mean(close, span=fast) - kernels.ewm_mean(close, span=slow)
+    macd_signal = kernels.ewm_mean(macd, span=signal)
+    return {"MACD": macd, "MACD_Signal": macd_signal, "MACD_Histogram": macd - macd_signal}
+
+
+@register_indicator(
+    "Bollinger", inputs=("Close",), params={"window": 20, "num_std": 2.0},
+    outputs=lambda p: ["BB_Middle", "BB_Upper", "BB_Lower"],
+    warmup=lambda p: p["window"] - 1,
+    aliases=("볼린저밴드", "BB"),
+)
+def _bollinger(inputs, window, num_std):
+    close = inputs["Close"]
+    middle = kernels.rolling_mean(close, window)
+    std = kernels.rolling_std(close, window)
+    return {"BB_Middle": middle, "BB_Upper": middle + std * num_std, "BB_Lower": middle - std * num_std}
+
+
+@register_indicator(
+    "ATR", inputs=("High", "Low", "Close"), params={"window": 14},
+    outputs=lambda p: ["ATR"],
+    warmup=lambda p: p["window"],
+)
+def _atr(inputs, window):
+    high, low, close = inputs["High"], inputs["Low"], inputs["Close"]
+    prev_close = np.concatenate(([np.nan], close[:-1]))
+    # 첫 봉은 전일 종가가 없으므로 고가-저가만 사용 (fmax는 NaN 무시)
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return {"ATR": kernels.ewm_mean(true_range, alpha=1.0 / window, adjust=False)}
+
+
+@register_indicator(
+    "Stochastic", inputs=("High", "Low", "Close"), params={"k_window": 14, "d_window": 3},
+    outputs=lambda p: ["STOCH_K", "STOCH_D"],
+    warmup=lambda p: p["k_window"] + p["d_window"] - 2,
+    aliases=("스토캐스틱", "STOCH"),
+)
+def _stochastic(inputs, k_window, d_window):
+    lowest = kernels.rolling_min(inputs["Low"], k_window)
+    highest = kernels.rolling_max(inputs["High"], k_window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent_k = 100 * (inputs["Close"] - lowest) / (highest - lowest)
+    return {"STOCH_K": percent_k, "STOCH_D": kernels.rolling_mean(percent_k, d_window)}
+
+
+@register_indicator(
+    "VWAP", inputs=("High", "Low", "Close", "Volume", "Session"), params={},
+    outputs=lambda p: ["VWAP"],
+    warmup=lambda p: 0,
+)
+def _vwap(inputs):
+    typical = (inputs["High"] + inputs["Low"] + inputs["Close"]) / 3
+    volume = inputs["Volume"]
+    sessions = inputs["Session"]
+    cum_pv = np.cumsum(typical * volume)
+    cum_v = np.cumsum(volume)
+    # 분봉/시간봉이면 거래일마다 누적을 초기화, 일봉 이상이면 전체 구간 누적
+    if len(sessions) and len(np.unique(sessions)) < len(sessions):
+        starts = np.flatnonzero(np.concatenate(([True], sessions[1:] != sessions[:-1])))
+        lengths = np.diff(np.append(starts, len(sessions)))
+        offset_pv = np.repeat(np.concatenate(([0.0], cum_pv[starts[1:] - 1])), lengths)
+        offset_v = np.repeat(np.concatenate(([0.0], cum_v[starts[1:] - 1])), lengths)
+        cum_pv = cum_pv - offset_pv
+        cum_v = cum_v - offset_v
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {"VWAP": cum_pv / cum_v}
+
+
+@register_indicator(
+    "OBV", inputs=("Close", "Volume"), params={},
+    outputs=lambda p: ["OBV"],
+    warmup=lambda p: 0,
+)
+def _obv(inputs):
+    direction = np.sign(kernels.diff(inputs["Close"]))
+    direction[0] = 0.0
+    return {"OBV": np.cumsum(direction * inputs["Volume"])}
+
+
+# 기본 데이터(Close, Volume)에 이미 포함되어 있어 별도 계산이 필요 없는 항목
+@register_indicator(
+    "price", inputs=(), params={}, outputs=lambda p: [], warmup=lambda p: 0,
+    aliases=("종가",),
+)
+def _price(inputs):
+    return {}
+
+
+@register_indicator(
+    "Volume", inputs=(), params={}, outputs=lambda p: [], warmup=lambda p: 0,
+    aliases=("거래량",),
+)
+def _volume(inputs):
+    return {}
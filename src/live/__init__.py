@@ -0,0 +1,3 @@
+"""
+실시간 차트 모드: 폴링으로 새 봉을 받아 지표를 증분 계산하고 WebSocket으로 변경분(extendTraces) push
+"""
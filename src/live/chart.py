@@ -0,0 +1,292 @@
+"""
+실시간 차트 상태: 새 봉을 받아 지표를 증분 계산하고, 브라우저에 보낼 변경분(delta)을 만듦
+- RingBuffer: 차트별 최근 max_points개 봉만 고정 크기 배열에 보관 (차트당 메모리 상한)
+- PollingSource: 캐시/시세 제공자를 주기적으로 조회 (yfinance 또는 CHART_DATA_PROVIDER=synthetic)
+- ReplaySource: 과거 시세를 한 봉씩 흘려보냄 (장 마감 후 시연/부하 테스트)
+- LiveChart: 첫 스냅숏(Plotly 그림)과 이후 extendTraces용 변경분 생성
+"""
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from .. import config
+from ..data.periods import is_intraday
+from ..data.providers import get_provider
+from ..indicators.incremental import IncrementalIndicators
+from ..indicators.registry import compute_indicators, group_indicator_specs, indicator_columns
+from ..tools.yfinance_tool import fetch_history_async
+
+
+# 가격 축에 겹쳐 그리는 지표 (나머지는 아래쪽 별도 패널)
+OVERLAY_INDICATORS = {"MA", "EMA", "Bollinger", "VWAP", "price"}
+BASE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# 간격별 폴링 조회 기간 (yfinance 분봉 조회 한도 안에서 max_points개 봉을 채울 수 있는 기간)
+LIVE_PERIODS = {"1m": "5d", "2m": "1mo", "5m": "1mo", "15m": "1mo", "30m": "1mo", "60m": "3mo", "90m": "1mo",
+                "1h": "3mo", "4h": "1y", "1d": "10y"}
+
+
+class RingBuffer:
+    """고정 크기 컬럼 배열 (가득 차면 가장 오래된 봉부터 덮어씀)"""
+
+    def __init__(self, capacity: int, columns: List[str]):
+        self.capacity = capacity
+        self.columns = columns
+        self.dates = np.zeros(capacity, dtype=np.int64)
+        self.values = {col: np.full(capacity, np.nan) for col in columns}
+        self.size = 0
+        self._head = 0   # 다음에 쓸 위치
+
+    def _last(self) -> int:
+        return (self._head - 1) % self.capacity
+
+    @property
+    def last_ts(self) -> Optional[int]:
+        return int(self.dates[self._last()]) if self.size else None
+
+    def append(self, ts: int, row: Dict[str, float]):
+        self.dates[self._head] = ts
+        for col in self.columns:
+            self.values[col][self._head] = row.get(col, np.nan)
+        self._head = (self._head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def replace_last(self, row: Dict[str, float]):
+        last = self._last()
+        for col in self.columns:
+            self.values[col][last] = row.get(col, np.nan)
+
+    def last_row(self) -> Dict[str, float]:
+        last = self._last()
+        return {col: self.values[col][last] for col in self.columns}
+
+    def snapshot(self) -> Dict[str, np.ndarray]:
+        """시간순으로 정렬한 사본 (새로 접속한 화면의 첫 그림용)"""
+        order = (np.arange(self.size) + self._head - self.size) % self.capacity
+        columns = {col: values[order] for col, values in self.values.items()}
+        columns["dates"] = self.dates[order]
+        return columns
+
+
+class PollingSource:
+    """캐시를 거쳐 최근 봉을 조회 (같은 종목의 여러 차트는 single-flight로 한 번만 수집)"""
+
+    def __init__(self, ticker: str, interval: str, max_points: int):
+        self.ticker = ticker
+        self.interval = interval
+        self.period = LIVE_PERIODS.get(interval, "1y")
+        self.max_points = max_points
+
+    async def fetch(self) -> pd.DataFrame:
+        data = await fetch_history_async(self.ticker, self.period, self.interval)
+        return data.iloc[-self.max_points:]
+
+
+class ReplaySource:
+    """
+    과거 시세를 호출마다 bars_per_tick개씩 내보냄 (네트워크 없이 실시간 흐름 재현)
+    - 첫 호출은 warmup개 봉, 이후 호출마다 다음 봉들 (끝나면 처음부터 반복하지 않고 멈춤)
+    """
+
+    def __init__(self, ticker: str, interval: str, warmup: int = 500, bars_per_tick: int = 1,
+                 history: Optional[pd.DataFrame] = None):
+        self.ticker = ticker
+        self.interval = interval
+        self.bars_per_tick = bars_per_tick
+        self.history = history if history is not None else self._load(ticker, interval)
+        self.position = min(warmup, len(self.history))
+        self._started = False
+
+    @staticmethod
+    def _load(ticker: str, interval: str) -> pd.DataFrame:
+        period = "1mo" if is_intraday(interval) else "5y"
+        return get_provider().history(ticker, interval, period=period).dropna()
+
+    async def fetch(self) -> pd.DataFrame:
+        if not self._started:
+            self._started = True
+            return self.history.iloc[:self.position]
+        if self.position < len(self.history):
+            self.position = min(self.position + self.bars_per_tick, len(self.history))
+        # 폴링처럼 최근 구간을 돌려주고, 이미 받은 봉은 LiveChart가 걸러냄
+        return self.history.iloc[max(0, self.position - self.bars_per_tick - 1):self.position]
+
+
+def _local_times(stamps: np.ndarray, tz: Optional[str]) -> List[str]:
+    """UTC epoch(ns) → 거래소 현지 시각 문자열 (Plotly x축)"""
+    index = pd.DatetimeIndex(stamps.astype("datetime64[ns]")).tz_localize("UTC")
+    if tz:
+        index = index.tz_convert(tz)
+    return index.strftime("%Y-%m-%d %H:%M:%S").tolist()
+
+
+def _json_values(values: np.ndarray) -> List[Optional[float]]:
+    """NaN은 null로 (JSON 호환)"""
+    return [None if v != v else float(v) for v in values.tolist()]
+
+
+class LiveChart:
+    """
+    한 종목·간격의 실시간 차트
+    - update(frame): 새로 들어온 봉(마지막 봉 갱신 포함)만 지표를 증분 계산해서 변경분 반환
+    - figure_message(): 현재 버퍼로 만든 Plotly 그림 JSON과 트레이스별 컬럼 매핑
+    """
+
+    def __init__(self, chart_id: str, ticker: str, interval: str, indicators: List[str],
+                 source=None, max_points: int = None):
+        self.chart_id = chart_id
+        self.ticker = ticker
+        self.interval = interval
+        self.indicators = list(indicators)
+        self.max_points = max_points or config.LIVE_MAX_POINTS
+        self.source = source or PollingSource(ticker, interval, self.max_points)
+        self.indicator_columns = [col for spec in self.indicators for col in indicator_columns(spec)]
+        self.buffer = RingBuffer(self.max_points, BASE_COLUMNS + self.indicator_columns)
+        self.state: Optional[IncrementalIndicators] = None
+        self.tz: Optional[str] = None
+        self.traces = self._trace_specs()
+        self.updates = 0
+
+    def _trace_specs(self) -> List[Dict[str, Any]]:
+        """트레이스 목록: {"name", "kind", "columns", "panel"} (panel 0은 가격)"""
+        traces = [{"name": self.ticker, "kind": "candlestick", "panel": 0,
+                   "columns": {"open": "Open", "high": "High", "low": "Low", "close": "Close"}}]
+        panel = 0
+        for indicator, params in group_indicator_specs(self.indicators):
+            outputs = indicator.outputs({**indicator.params, **params})
+            if indicator.name == "Volume":
+                panel += 1
+                traces.append({"name": "Volume", "kind": "bar", "panel": panel, "columns": {"y": "Volume"}})
+                continue
+            if not outputs:
+                continue
+            if indicator.name not in OVERLAY_INDICATORS:
+                panel += 1
+            target = 0 if indicator.name in OVERLAY_INDICATORS else panel
+            for col in outputs:
+                kind = "bar" if col == "MACD_Histogram" else "line"
+                traces.append({"name": col, "kind": kind, "panel": target, "columns": {"y": col}})
+        return traces
+
+    @property
+    def panels(self) -> int:
+        return 1 + max(trace["panel"] for trace in self.traces)
+
+    def _seed(self, frame: pd.DataFrame):
+        """첫 조회: 창 전체를 벡터 연산으로 계산해 버퍼를 채우고, 증분 상태를 준비"""
+        frame = frame.iloc[-self.max_points:]
+        self.tz = str(frame.index.tz) if frame.index.tz is not None else None
+        values = compute_indicators(frame, self.indicators)
+        stamps = frame.index.as_unit("ns").asi8
+        columns = {col: values[col].to_numpy(dtype=np.float64) for col in self.buffer.columns if col in values}
+        for i, ts in enumerate(stamps):
+            self.buffer.append(int(ts), {col: arr[i] for col, arr in columns.items()})
+        # 마지막 봉은 진행 중일 수 있으므로 임시 봉으로 둠
+        self.state = IncrementalIndicators(self.indicators, intraday=is_intraday(self.interval))
+        self.state.seed(frame.iloc[:-1])
+        self.state.append(frame.iloc[-1:])
+
+    def update(self, frame: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """
+        새 시세 반영 → 변경분 {"replace_last", "x", "columns"} 또는 None (바뀐 것이 없음)
+        - 버퍼의 마지막 봉과 같은 시각이면 그 봉을 교체, 이후 봉은 추가
+        """
+        frame = frame.dropna(subset=["Close"])
+        if frame.empty:
+            return None
+        if self.state is None:
+            self._seed(frame)
+            self.updates += 1
+            return {"reset": True}
+
+        last_ts = self.buffer.last_ts
+        stamps = frame.index.as_unit("ns").asi8
+        if stamps[0] > last_ts:
+            # 폴링이 멈춘 사이 봉이 빠졌으면 (지표 상태를 이어갈 수 없으므로) 새로 시작
+            self.buffer = RingBuffer(self.max_points, self.buffer.columns)
+            self._seed(frame)
+            self.updates += 1
+            return {"reset": True}
+        start = int(np.searchsorted(stamps, last_ts))
+        if start >= len(frame):
+            return None
+        new = frame.iloc[start:]
+        values = self.state.append(new)
+        rows = []
+        for i, ts in enumerate(new.index.as_unit("ns").asi8):
+            row = {col: float(new[col].iat[i]) for col in BASE_COLUMNS}
+            if not values.empty:
+                row.update({col: float(values[col].iat[i]) for col in self.indicator_columns if col in values})
+            rows.append((int(ts), row))
+
+        replace_last = rows[0][0] == last_ts
+        if replace_last and len(rows) == 1:
+            previous = self.buffer.last_row()
+            if all(previous[col] == rows[0][1].get(col) or (previous[col] != previous[col]) for col in BASE_COLUMNS):
+                return None   # 마지막 봉 값이 그대로면 보낼 것이 없음
+        for j, (ts, row) in enumerate(rows):
+            if j == 0 and replace_last:
+                self.buffer.replace_last(row)
+            else:
+                self.buffer.append(ts, row)
+        self.updates += 1
+        return {
+            "replace_last": replace_last,
+            "x": _local_times(np.array([ts for ts, _ in rows], dtype=np.int64), self.tz),
+            "columns": {col: [row.get(col) if row.get(col) == row.get(col) else None for _, row in rows]
+                        for col in self.buffer.columns},
+        }
+
+    def delta_message(self, delta: Dict[str, Any]) -> Dict[str, Any]:
+        """변경분 → 브라우저 메시지 (트레이스별 extendTraces 인자)"""
+        if delta.get("reset"):
+            return self.figure_message()
+        traces = []
+        for index, trace in enumerate(self.traces):
+            update = {"x": delta["x"]}
+            update.update({attr: delta["columns"][col] for attr, col in trace["columns"].items()})
+            traces.append({"index": index, "update": update})
+        return {"type": "extend", "chart": self.chart_id, "replace_last": delta["replace_last"],
+                "traces": traces, "max_points": self.max_points}
+
+    def figure_message(self) -> Dict[str, Any]:
+        """현재 버퍼 전체로 그린 Plotly 그림 (새 접속 또는 초기화 시)"""
+        snapshot = self.buffer.snapshot()
+        x = _local_times(snapshot["dates"], self.tz)
+        panels = self.panels
+        # 가격 패널이 절반 이상, 나머지 패널은 균등 분할
+        price_height = 1.0 if panels == 1 else 0.55
+        lower_height = (1.0 - price_height) / max(panels - 1, 1)
+        layout = {
+            "title": {"text": f"{self.ticker} {self.interval} (실시간)"},
+            "showlegend": True,
+            "xaxis": {"rangeslider": {"visible": False}},
+            "margin": {"l": 50, "r": 20, "t": 40, "b": 30},
+            "uirevision": self.chart_id,   # 갱신해도 확대/이동 상태 유지
+        }
+        data = []
+        for trace in self.traces:
+            panel = trace["panel"]
+            axis = "" if panel == 0 else str(panel + 1)
+            top = 1.0 if panel == 0 else 1.0 - price_height - lower_height * (panel - 1)
+            bottom = 1.0 - price_height if panel == 0 else top - lower_height
+            layout[f"yaxis{axis}"] = {"domain": [max(bottom, 0.0) + (0.02 if panel else 0.0), top], "anchor": "x"}
+            common = {"name": trace["name"], "x": x, "yaxis": f"y{axis}"}
+            columns = {attr: _json_values(snapshot[col]) for attr, col in trace["columns"].items()}
+            if trace["kind"] == "candlestick":
+                data.append({"type": "candlestick", **common, **columns})
+            elif trace["kind"] == "bar":
+                data.append({"type": "bar", **common, **columns})
+            else:
+                data.append({"type": "scatter", "mode": "lines", **common, **columns})
+        return {"type": "figure", "chart": self.chart_id, "figure": {"data": data, "layout": layout},
+                "max_points": self.max_points}
+
+    def memory_bytes(self) -> int:
+        """버퍼가 차지하는 바이트 (차트당 상한 확인용)"""
+        return self.buffer.dates.nbytes + sum(values.nbytes for values in self.buffer.values.values())
+
+    async def poll(self) -> Optional[Dict[str, Any]]:
+        """소스에서 시세를 받아 반영 → 브라우저 메시지 또는 None"""
+        frame = await self.source.fetch()
+        delta = self.update(frame)
+        return self.delta_message(delta) if delta else None
@@ -0,0 +1,252 @@
+"""
+실시간 차트 서버: 여러 LiveChart를 한 이벤트 루프에서 폴링하고, 로컬 WebSocket으로 변경분을 push
+- GET /            : 차트 페이지 (?charts=id1,id2 로 일부만 표시)
+- GET /plotly.min.js: 로컬 plotly.js (인터넷 없이 동작)
+- WS  /ws          : 접속 시 현재 그림 전체, 이후 extendTraces 변경분
+- 차트별 폴링 주기와 동시 폴링 수를 제한하고, 구독자가 없는 차트는 폴링을 쉼 (차트당 CPU 상한)
+- 쓰기 버퍼가 밀린 느린 화면에는 변경분을 보내지 않고, 따라잡으면 그림 전체를 다시 보냄 (메모리 상한)
+
+실행 예: python -m src.live.server --chart NVDA 1m "MA(5,20)" RSI --chart 005930.KS 5m MACD
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from http import HTTPStatus
+from typing import Dict, List, Optional, Set
+from urllib.parse import parse_qs, urlparse
+from plotly.offline import get_plotlyjs
+from websockets.asyncio.server import ServerConnection, broadcast, serve
+from .. import config
+from ..data.resilience import CircuitOpenError
+from .chart import LiveChart, ReplaySource
+
+
+# 화면 하나의 쓰기 버퍼가 이보다 커지면 변경분을 건너뜀
+MAX_CLIENT_BUFFER_BYTES = 1024 * 1024
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>실시간 차트</title>
+<script src="/plotly.min.js"></script>
+<style>body{margin:0;font-family:sans-serif}.chart{height:480px}</style></head>
+<body><div id="status">연결 중...</div>
+<script>
+const status = document.getElementById("status");
+const ws = new WebSocket(`ws://${location.host}/ws${location.search}`);
+ws.onopen = () => status.textContent = "";
+ws.onclose = () => status.textContent = "연결이 끊겼습니다. 새로고침해주세요.";
+ws.onmessage = (event) => {
+  const msg = JSON.parse(event.data);
+  let div = document.getElementById(msg.chart);
+  if (!div) {
+    div = document.createElement("div");
+    div.id = msg.chart;
+    div.className = "chart";
+    document.body.appendChild(div);
+  }
+  if (msg.type === "figure") {
+    Plotly.react(div, msg.figure.data, msg.figure.layout, {responsive: true});
+    return;
+  }
+  // 같은 속성을 갱신하는 트레이스끼리 묶어서 extendTraces 한 번으로 반영
+  const groups = {};
+  for (const t of msg.traces) {
+    const trace = div.data[t.index];
+    if (msg.replace_last) {
+      for (const key of Object.keys(t.update)) trace[key].pop();
+    }
+    const keys = Object.keys(t.update).sort().join(",");
+    groups[keys] = groups[keys] || {update: {}, indices: []};
+    for (const [key, values] of Object.entries(t.update)) {
+      (groups[keys].update[key] = groups[keys].update[key] || []).push(values);
+    }
+    groups[keys].indices.push(t.index);
+  }
+  for (const group of Object.values(groups)) {
+    Plotly.extendTraces(div, group.update, group.indices, msg.max_points);
+  }
+};
+</script></body></html>
+"""
+
+
+class LiveChartHub:
+    """실시간 차트 묶음: 폴링 루프, 구독자 관리, 변경분 전송"""
+
+    def __init__(self, poll_seconds: float = None, max_charts: int = None, max_concurrent_polls: int = None):
+        self.poll_seconds = poll_seconds if poll_seconds is not None else config.LIVE_POLL_SECONDS
+        self.max_charts = max_charts or config.LIVE_MAX_CHARTS
+        self.charts: Dict[str, LiveChart] = {}
+        self.subscribers: Dict[str, Set[ServerConnection]] = {}
+        self._stale: Set[ServerConnection] = set()   # 변경분을 건너뛰어 그림 전체가 필요한 화면
+        self._semaphore = asyncio.Semaphore(max_concurrent_polls or config.LIVE_MAX_CONCURRENT_POLLS)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._wakeups: Dict[str, asyncio.Event] = {}
+        self.metrics: Dict[str, Dict[str, float]] = {}
+
+    def add_chart(self, ticker: str, interval: str = "1m", indicators: Optional[List[str]] = None,
+                  source=None, max_points: int = None) -> LiveChart:
+        """차트 추가 (이벤트 루프가 돌고 있으면 바로 폴링 시작)"""
+        if len(self.charts) >= self.max_charts:
+            raise ValueError(f"실시간 차트는 최대 {self.max_charts}개까지 열 수 있습니다.")
+        chart_id = f"{ticker}-{interval}-{len(self.charts) + 1}".replace(".", "_").replace("^", "")
+        chart = LiveChart(chart_id, ticker, interval, indicators or [], source=source, max_points=max_points)
+        self.charts[chart_id] = chart
+        self.subscribers[chart_id] = set()
+        self.metrics[chart_id] = {"polls": 0, "messages": 0, "errors": 0, "poll_seconds_total": 0.0}
+        try:
+            asyncio.get_running_loop()
+            self._start(chart)
+        except RuntimeError:
+            pass   # serve()에서 시작
+        print(f"📡 실시간 차트 추가: {chart_id} ({ticker} {interval}, {', '.join(chart.indicators) or '지표 없음'})")
+        return chart
+
+    def remove_chart(self, chart_id: str):
+        task = self._tasks.pop(chart_id, None)
+        if task:
+            task.cancel()
+        self.charts.pop(chart_id, None)
+        self.subscribers.pop(chart_id, None)
+        self._wakeups.pop(chart_id, None)
+
+    def _start(self, chart: LiveChart):
+        if chart.chart_id not in self._tasks:
+            self._wakeups[chart.chart_id] = asyncio.Event()
+            self._tasks[chart.chart_id] = asyncio.create_task(self._poll_loop(chart))
+
+    async def _poll_loop(self, chart: LiveChart):
+        """차트 하나의 폴링 루프 (시작 시각을 흩어서 폴링이 한꺼번에 몰리지 않게 함)"""
+        wakeup = self._wakeups[chart.chart_id]
+        metrics = self.metrics[chart.chart_id]
+        await asyncio.sleep(random.uniform(0, self.poll_seconds))
+        while True:
+            if not self.subscribers.get(chart.chart_id):
+                # 보는 화면이 없으면 쉬다가 구독자가 생기면 바로 갱신
+                wakeup.clear()
+                await wakeup.wait()
+            started = time.perf_counter()
+            try:
+                async with self._semaphore:
+                    message = await chart.poll()
+            except CircuitOpenError as e:
+                print(f"🚧 실시간 차트 갱신 보류 ({chart.chart_id}): {str(e)}")
+                message = None
+            except Exception as e:
+                metrics["errors"] += 1
+                print(f"⚠️  실시간 차트 갱신 실패 ({chart.chart_id}): {str(e)}")
+                message = None
+            metrics["polls"] += 1
+            metrics["poll_seconds_total"] += time.perf_counter() - started
+            if message is not None:
+                metrics["messages"] += 1
+                self._send(chart, message)
+            await asyncio.sleep(self.poll_seconds)
+
+    def _send(self, chart: LiveChart, message: dict):
+        """구독자에게 전송 (버퍼가 밀린 화면은 건너뛰고, 따라잡으면 그림 전체)"""
+        payload = json.dumps(message, ensure_ascii=False)
+        ready, resync = [], []
+        for connection in list(self.subscribers.get(chart.chart_id, ())):
+            transport = connection.transport
+            if transport is None or transport.get_write_buffer_size() > MAX_CLIENT_BUFFER_BYTES:
+                self._stale.add(connection)
+            elif connection in self._stale and message["type"] != "figure":
+                resync.append(connection)
+            else:
+                ready.append(connection)
+        broadcast(ready, payload)
+        if resync:
+            broadcast(resync, json.dumps(chart.figure_message(), ensure_ascii=False))
+            self._stale.difference_update(resync)
+
+    async def handler(self, connection: ServerConnection):
+        """WebSocket 접속: 요청한 차트(없으면 전체)를 구독"""
+        query = parse_qs(urlparse(connection.request.path).query)
+        wanted = [c for c in ",".join(query.get("charts", [])).split(",") if c] or list(self.charts)
+        chart_ids = [chart_id for chart_id in wanted if chart_id in self.charts]
+        for chart_id in chart_ids:
+            chart = self.charts[chart_id]
+            if chart.state is not None:
+                await connection.send(json.dumps(chart.figure_message(), ensure_ascii=False))
+            self.subscribers[chart_id].add(connection)
+            self._wakeups[chart_id].set()
+        try:
+            await connection.wait_closed()
+        finally:
+            for chart_id in chart_ids:
+                self.subscribers.get(chart_id, set()).discard(connection)
+            self._stale.discard(connection)
+
+    def _process_request(self, connection: ServerConnection, request):
+        """WebSocket이 아닌 HTTP 요청에 페이지/스크립트 응답"""
+        path = urlparse(request.path).path
+        if path == "/ws":
+            return None
+        if path == "/plotly.min.js":
+            response = connection.respond(HTTPStatus.OK, get_plotlyjs())
+            content_type = "application/javascript; charset=utf-8"
+        elif path == "/":
+            response = connection.respond(HTTPStatus.OK, PAGE)
+            content_type = "text/html; charset=utf-8"
+        else:
+            return connection.respond(HTTPStatus.NOT_FOUND, "Not Found\n")
+        del response.headers["Content-Type"]
+        response.headers["Content-Type"] = content_type
+        return response
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """차트별 폴링/전송 집계, 평균 폴링 시간, 버퍼 메모리"""
+        result = {}
+        for chart_id, metrics in self.metrics.items():
+            chart = self.charts.get(chart_id)
+            if chart is None:
+                continue
+            polls = metrics["polls"] or 1
+            result[chart_id] = {**metrics, "avg_poll_ms": metrics["poll_seconds_total"] / polls * 1000,
+                                "points": chart.buffer.size, "buffer_bytes": chart.memory_bytes(),
+                                "subscribers": len(self.subscribers.get(chart_id, ()))}
+        return result
+
+    async def serve(self, host: str = None, port: int = None):
+        """서버 실행 (종료될 때까지)"""
+        host = host or config.LIVE_HOST
+        port = port or config.LIVE_PORT
+        for chart in self.charts.values():
+            self._start(chart)
+        try:
+            async with serve(self.handler, host, port, process_request=self._process_request) as server:
+                print(f"🟢 실시간 차트 서버: http://{host}:{port}/")
+                await server.serve_forever()
+        finally:
+            for task in self._tasks.values():
+                task.cancel()
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+            self._tasks.clear()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="실시간 차트 서버")
+    parser.add_argument("--chart", nargs="+", action="append", metavar="ARG", required=True,
+                        help="티커 [간격] [지표...] (예: --chart NVDA 1m \"MA(5,20)\" RSI)")
+    parser.add_argument("--replay", action="store_true", help="과거 시세를 한 봉씩 재생 (네트워크/장 시간과 무관)")
+    parser.add_argument("--poll", type=float, default=None, help="폴링 주기 (초)")
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    hub = LiveChartHub(poll_seconds=args.poll)
+    for ticker, *rest in args.chart:
+        interval = rest[0] if rest else "1m"
+        indicators = rest[1:]
+        source = ReplaySource(ticker, interval) if args.replay else None
+        hub.add_chart(ticker, interval, indicators, source=source)
+    try:
+        asyncio.run(hub.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("👋 실시간 차트 서버 종료")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""
+LLM 호출 공용 모듈
+"""
+from .pool import get_chat_model, warm_up
+from .cache import get_response_cache
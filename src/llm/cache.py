@@ -0,0 +1,207 @@
+"""
+LLM 응답 캐시: 같은(정규화 후) 입력의 구조화 출력 호출은 저장된 결과로 응답
+- 키: 모델, temperature, 출력 스키마, 프롬프트 버전(prompts.py 내용 해시), 정규화한 메시지
+- 1단계 메모리 LRU → 2단계 SQLite (프로세스 재시작/여러 워커 간 공유), 항목마다 만료 시각
+- prompts.py가 바뀌면 프롬프트 버전이 달라져 이전 항목은 쓰이지 않고, 열 때 정리됨
+- 호출 위치(site)별 적중률 집계: router, param, edit, intent 등
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.messages import AIMessage
+from .. import config
+from .tokens import message_parts
+
+
+# 호출 위치별 보관 시간 (초, 없으면 CHART_LLM_CACHE_TTL): 파라미터는 "작년", "올해" 같은 상대 날짜가 있어 짧게
+SITE_TTL_SECONDS = {"param": 24 * 3600, "router_param": 24 * 3600}
+
+
+def prompt_version() -> str:
+    """prompts.py 내용 해시 (프롬프트를 고치면 캐시 키가 바뀜)"""
+    path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "prompts.py")
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def normalize_text(text: str) -> str:
+    """비교용 정규화: 유니코드 호환 문자 통일, 소문자, 공백 정리, 끝 문장부호 반복 축약"""
+    text = unicodedata.normalize("NFKC", str(text)).lower().strip()
+    text = re.sub(r"\s+", " ", text)
+    return re.sub(r"([!?.~])\1+$", r"\1", text)
+
+
+@lru_cache(maxsize=64)
+def _schema_id(schema: type) -> str:
+    """스키마 이름 + 필드 정의 해시 (필드 설명을 고쳐도 키가 바뀜)"""
+    schema_json = json.dumps(schema.model_json_schema(), sort_keys=True, ensure_ascii=False)
+    return f"{schema.__name__}:{hashlib.sha256(schema_json.encode()).hexdigest()[:12]}"
+
+
+def cache_key(model: str, temperature: float, schema: Optional[type], messages: List[Any], version: str) -> str:
+    normalized = [(role, normalize_text(content)) for role, content in map(message_parts, messages)]
+    schema_id = _schema_id(schema) if schema is not None else None
+    payload = json.dumps([model, float(temperature), schema_id, version, normalized], ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LLMResponseCache:
+    """메모리 LRU + SQLite 2단계 응답 캐시 (값은 직렬화한 문자열)"""
+
+    def __init__(self, path: str = None, memory_entries: int = None, ttl_seconds: float = None,
+                 max_rows: int = None, version: str = None):
+        self.path = path if path is not None else config.LLM_CACHE_PATH
+        self.memory_entries = memory_entries if memory_entries is not None else config.LLM_CACHE_MEMORY_ENTRIES
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else config.LLM_CACHE_TTL_SECONDS
+        self.max_rows = max_rows if max_rows is not None else config.LLM_CACHE_MAX_ROWS
+        self.version = version or prompt_version()
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()   # 키 → (값, 만료 시각)
+        self._lock = threading.Lock()
+        self.metrics: Dict[str, Dict[str, int]] = {}
+        self._db = None
+        if self.path:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=5.0)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, site TEXT, version TEXT, "
+                             "value TEXT, created REAL, expires REAL)")
+            self._purge()
+
+    def _purge(self):
+        """만료 항목과 이전 프롬프트 버전 항목 삭제, 최대 항목 수 초과분은 오래된 것부터 삭제"""
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM responses WHERE expires < ? OR version != ?",
+                                      (time.time(), self.version))
+            removed = cursor.rowcount
+            cursor = self._db.execute("DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                                      "ORDER BY created DESC LIMIT -1 OFFSET ?)", (self.max_rows,))
+            removed += cursor.rowcount
+            self._db.commit()
+        if removed > 0:
+            print(f"🧹 LLM 응답 캐시 정리: {removed}개 삭제")
+
+    def _count(self, site: str, event: str):
+        site_metrics = self.metrics.setdefault(site, {"memory_hits": 0, "disk_hits": 0, "misses": 0})
+        site_metrics[event] += 1
+
+    def get(self, key: str, site: str = "default") -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[1] > now:
+                self._memory.move_to_end(key)
+                self._count(site, "memory_hits")
+                return entry[0]
+            if entry is not None:
+                del self._memory[key]
+            row = None
+            if self._db is not None:
+                row = self._db.execute("SELECT value, expires FROM responses WHERE key = ? AND version = ?",
+                                       (key, self.version)).fetchone()
+            if row is not None and row[1] > now:
+                self._remember(key, row[0], row[1])
+                self._count(site, "disk_hits")
+                return row[0]
+            self._count(site, "misses")
+            return None
+
+    def put(self, key: str, value: str, site: str = "default", ttl_seconds: float = None):
+        now = time.time()
+        expires = now + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+        with self._lock:
+            self._remember(key, value, expires)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                                 (key, site, self.version, value, now, expires))
+                self._db.commit()
+
+    def _remember(self, key: str, value: str, expires: float):
+        self._memory[key] = (value, expires)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def invalidate(self, site: str = None):
+        """전체 또는 호출 위치(site) 하나의 항목 삭제"""
+        with self._lock:
+            self._memory.clear()   # 메모리 항목은 site를 보관하지 않으므로 모두 비움 (디스크에서 다시 채워짐)
+            if self._db is not None:
+                if site is None:
+                    self._db.execute("DELETE FROM responses")
+                else:
+                    self._db.execute("DELETE FROM responses WHERE site = ?", (site,))
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """site별 적중 수와 적중률"""
+        result = {}
+        for site, m in self.metrics.items():
+            total = m["memory_hits"] + m["disk_hits"] + m["misses"]
+            result[site] = {**m, "hit_rate": (m["memory_hits"] + m["disk_hits"]) / total if total else 0.0}
+        return result
+
+
+class CachedChatModel:
+    """
+    채팅 모델 invoke() 앞단 캐시
+    - 스키마가 있으면 pydantic 결과를 JSON으로, 없으면 응답 텍스트를 저장
+    - 캐시에서 꺼낸 결과는 매번 새 객체 (호출한 쪽이 고쳐도 캐시에 영향 없음)
+    """
+
+    def __init__(self, llm, cache: LLMResponseCache, site: str, model: str, temperature: float,
+                 schema: Optional[type] = None, ttl_seconds: float = None):
+        self.llm = llm
+        self.cache = cache
+        self.site = site
+        self.model = model
+        self.temperature = temperature
+        self.schema = schema
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else SITE_TTL_SECONDS.get(site)
+
+    def invoke(self, messages, *args, **kwargs):
+        key = cache_key(self.model, self.temperature, self.schema, messages, self.cache.version)
+        cached = self.cache.get(key, self.site)
+        if cached is not None:
+            print(f"💾 LLM 응답 캐시 적중 ({self.site}, 적중률 {self.cache.stats()[self.site]['hit_rate']:.0%})")
+            return self.schema.model_validate_json(cached) if self.schema is not None else AIMessage(content=cached)
+        result = self.llm.invoke(messages, *args, **kwargs)
+        value = result.model_dump_json() if self.schema is not None else result.content
+        if isinstance(value, str):
+            self.cache.put(key, value, self.site, self.ttl_seconds)
+        return result
+
+
+_default_cache: Optional[LLMResponseCache] = None
+_default_lock = threading.Lock()
+
+
+def get_response_cache() -> LLMResponseCache:
+    """프로세스 공용 응답 캐시"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = LLMResponseCache()
+        return _default_cache
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="LLM 응답 캐시 관리")
+    parser.add_argument("--clear", nargs="?", const="", metavar="SITE", help="전체(또는 SITE 하나) 삭제")
+    args = parser.parse_args()
+    cache = get_response_cache()
+    if args.clear is not None:
+        cache.invalidate(args.clear or None)
+        print(f"🗑️  LLM 응답 캐시 삭제: {args.clear or '전체'}")
+    rows = cache._db.execute("SELECT site, COUNT(*) FROM responses GROUP BY site").fetchall() if cache._db else []
+    print(f"프롬프트 버전 {cache.version} | " + (", ".join(f"{site}: {count}개" for site, count in rows) or "비어 있음"))
@@ -0,0 +1,126 @@
+"""
+LLM 클라이언트 풀: (모델, temperature, 출력 스키마)별 채팅 모델을 한 번만 만들어 재사용
+- 노드마다 init_chat_model()을 호출하면 매 호출 클라이언트와 HTTP 연결 풀을 새로 만들어
+  턴마다 최대 4번의 LLM 호출이 각각 클라이언트 생성 + TLS 핸드셰이크 비용을 냄
+- OpenAI 모델은 keep-alive 연결 풀(httpx)을 프로세스 전체가 공유
+- warm_up()으로 자주 쓰는 모델을 미리 만들고 API 서버와의 연결을 미리 열어 둠 (백그라운드)
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Type
+import httpx
+from langchain.chat_models import init_chat_model
+from .. import config
+
+
+_models: Dict[tuple, Any] = {}   # (모델, temperature, 스키마[, 캐시 site]) → 인스턴스
+_lock = threading.Lock()
+_http_clients: Dict[str, Any] = {}
+stats = {"created": 0, "reused": 0}
+
+
+def _is_openai(model: str) -> bool:
+    return model.startswith("openai:") or (":" not in model and model.startswith(("gpt-", "o1", "o3", "o4")))
+
+
+def _openai_base_url() -> str:
+    return os.getenv("OPENAI_BASE_URL") or os.getenv("OPENAI_API_BASE") or "https://api.openai.com/v1"
+
+
+def _shared_http_clients() -> Dict[str, Any]:
+    """OpenAI 호출용 공용 httpx 클라이언트 (동기/비동기, _lock 안에서 호출)"""
+    if not _http_clients:
+        limits = httpx.Limits(max_connections=config.LLM_MAX_CONNECTIONS,
+                              max_keepalive_connections=config.LLM_MAX_CONNECTIONS,
+                              keepalive_expiry=config.LLM_KEEPALIVE_SECONDS)
+        timeout = httpx.Timeout(config.LLM_TIMEOUT_SECONDS, connect=10.0)
+        _http_clients["http_client"] = httpx.Client(limits=limits, timeout=timeout)
+        _http_clients["http_async_client"] = httpx.AsyncClient(limits=limits, timeout=timeout)
+    return _http_clients
+
+
+def get_chat_model(temperature: float = 0.0, schema: Optional[Type] = None, model: str = None,
+                   cache_site: str = None):
+    """
+    공용 채팅 모델 (스키마가 있으면 with_structured_output 적용본)
+    - 같은 (모델, temperature, 스키마)는 같은 인스턴스를 반환 (스레드 안전, 호출 간 상태 없음)
+    - cache_site를 주면 응답 캐시를 거치는 모델 (같은 입력이면 LLM 호출 없이 응답, site별 적중률 집계)
+    """
+    model = model or config.LLM_MODEL
+    if cache_site and config.LLM_CACHE_ENABLED:
+        return _cached_chat_model(temperature, schema, model, cache_site)
+    key: Hashable = (model, float(temperature), schema)
+    llm = _models.get(key)
+    if llm is not None:
+        stats["reused"] += 1
+        return llm
+    with _lock:
+        llm = _models.get(key)
+        if llm is None:
+            base = _models.get((model, float(temperature), None))
+            if base is None:
+                kwargs = dict(_shared_http_clients()) if _is_openai(model) else {}
+                base = init_chat_model(model, temperature=temperature, **kwargs)
+                _models[(model, float(temperature), None)] = base
+                stats["created"] += 1
+            if schema is not None:
+                llm = base.with_structured_output(schema)
+                _models[key] = llm
+                stats["created"] += 1
+                return llm
+            llm = base
+    stats["reused"] += 1
+    return llm
+
+
+def _cached_chat_model(temperature: float, schema: Optional[Type], model: str, site: str):
+    key = (model, float(temperature), schema, site)
+    wrapped = _models.get(key)
+    if wrapped is None:
+        from .cache import CachedChatModel, get_response_cache
+        llm = get_chat_model(temperature, schema, model)
+        with _lock:
+            wrapped = _models.setdefault(key, CachedChatModel(llm, get_response_cache(), site, model, temperature, schema))
+    return wrapped
+
+
+def warm_up(specs=None, connect: bool = True, background: bool = True) -> Optional[threading.Thread]:
+    """
+    자주 쓰는 모델을 미리 만들고 API 서버 연결(TLS)을 열어 둠
+    - specs: [(temperature, schema), ...] (기본: 라우터/파라미터/편집 스키마와 일반 대화)
+    - background면 스레드로 실행하고 바로 반환 (시작이 늦어지지 않게)
+    """
+    if not config.LLM_WARMUP:
+        return None
+
+    def run():
+        started = time.perf_counter()
+        try:
+            from ..schemas import RouterSchema, ParamExtractionSchema, EditPlanSchema
+            for temperature, schema in specs or [(0.0, RouterSchema), (0.0, ParamExtractionSchema),
+                                                 (0.0, EditPlanSchema), (0.0, None), (0.1, None)]:
+                get_chat_model(temperature, schema)
+            if connect and _is_openai(config.LLM_MODEL):
+                # 응답 내용과 상관없이 연결만 맺어 풀에 남겨 둠 (토큰 사용 없음)
+                _shared_http_clients()["http_client"].head(_openai_base_url())
+            print(f"🔥 LLM 클라이언트 준비 완료 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+        except Exception as e:
+            print(f"⚠️  LLM 클라이언트 미리 준비 실패 (첫 호출 때 다시 시도): {str(e)}")
+
+    if not background:
+        run()
+        return None
+    thread = threading.Thread(target=run, name="llm-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def reset():
+    """공용 모델/연결 정리 (설정 변경 후 다시 만들 때)"""
+    with _lock:
+        _models.clear()
+        client = _http_clients.pop("http_client", None)
+        _http_clients.pop("http_async_client", None)
+    if client is not None:
+        client.close()
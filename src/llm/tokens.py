@@ -0,0 +1,80 @@
+"""
+토큰 수 계산: LLM에 보내는 메시지의 입력 토큰 수 (tiktoken)
+- 모델 인코딩을 처음 쓸 때 한 번 불러오고, 불러올 수 없으면(오프라인 등) 글자 수 기반 추정으로 대체
+- 메시지당 고정 오버헤드를 더한 채팅 형식 토큰 수
+- 호출 위치(site)별 누적 토큰 수 집계
+"""
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+from .. import config
+
+# 채팅 형식 오버헤드 (메시지마다 역할/구분자, 응답 시작 표시)
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str):
+    """모델 인코딩 (없으면 None → 추정)"""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    name = model.split(":", 1)[-1]
+    try:
+        try:
+            return tiktoken.encoding_for_model(name)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        print(f"⚠️  tiktoken 인코딩을 불러오지 못함 (글자 수로 추정): {str(e)[:120]}")
+        return None
+
+
+def count_tokens(text: str, model: str = None) -> int:
+    """문자열 토큰 수 (인코딩이 없으면 ASCII 4글자당 1, 그 외 글자당 1로 넉넉하게 추정)"""
+    text = str(text)
+    encoding = _encoding(model or config.LLM_MODEL)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    ascii_chars = sum(1 for ch in text if ch.isascii())
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def message_parts(message) -> Tuple[str, str]:
+    """dict 메시지와 LangChain 메시지를 (role, content)로"""
+    if isinstance(message, dict):
+        return message.get("role", ""), str(message.get("content", ""))
+    role = {"human": "user", "ai": "assistant"}.get(getattr(message, "type", ""), getattr(message, "type", ""))
+    return role, str(getattr(message, "content", ""))
+
+
+def count_message_tokens(messages: List[Any], model: str = None) -> int:
+    """채팅 메시지 목록의 입력 토큰 수"""
+    total = TOKENS_PER_REPLY
+    for message in messages:
+        role, content = message_parts(message)
+        total += TOKENS_PER_MESSAGE + count_tokens(role, model) + count_tokens(content, model)
+    return total
+
+
+class TokenUsage:
+    """호출 위치별 입력 토큰 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sites: Dict[str, List[int]] = {}   # site → [호출 수, 누적 토큰]
+
+    def record(self, site: str, tokens: int):
+        with self._lock:
+            entry = self.sites.setdefault(site, [0, 0])
+            entry[0] += 1
+            entry[1] += tokens
+
+    def average(self, site: str) -> float:
+        calls, total = self.sites.get(site, (0, 0))
+        return total / calls if calls else 0.0
+
+
+token_usage = TokenUsage()
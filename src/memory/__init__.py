@@ -0,0 +1,4 @@
+"""
+대화 메모리 모듈
+"""
+from .conversation import ConversationMemory, thread_namespace
@@ -0,0 +1,117 @@
+"""
+대화 메모리: BaseStore에 세션(thread_id)별 대화 턴 기록
+- 턴마다 키 하나(turn:00000012)에 저장, 메타 항목(next/first/summary)으로 위치를 알아 O(1) 추가 (search 없음)
+- 최근 MEMORY_RECENT_TURNS개 턴만 원문 유지, 넘치면 오래된 턴을 MEMORY_SUMMARY_BATCH개씩 요약에 합치고 삭제
+- 요약도 MEMORY_SUMMARY_MAX_CHARS를 넘지 않게 유지 → 세션이 길어져도 저장 용량과 프롬프트 길이가 일정
+- MEMORY_SUMMARY_MODE=llm이면 LLM으로 요약 (기본 compact는 턴마다 한 줄로 줄여 붙임)
+"""
+import time
+from typing import Dict, List, Optional
+from langgraph.store.base import BaseStore
+from .. import config
+
+APP_NAMESPACE = "stock_chart_agent"
+META_KEY = "meta"
+
+
+def thread_namespace(thread_id: Optional[str], kind: str) -> tuple:
+    """세션별 namespace (thread_id가 없으면 공용 "default")"""
+    return (APP_NAMESPACE, str(thread_id or "default"), kind)
+
+
+def _turn_key(number: int) -> str:
+    return f"turn:{number:08d}"
+
+
+def _shorten(text: str, limit: int) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def _compact_summary(summary: str, turns: List[Dict[str, str]], max_chars: int) -> str:
+    """턴마다 한 줄 요약을 붙이고, 길이를 넘으면 오래된 줄부터 버림"""
+    lines = [line for line in summary.split("\n") if line]
+    lines += [f"- 사용자: {_shorten(t['user'], 60)} → AI: {_shorten(t['ai'], 80)}" for t in turns]
+    while lines and len("\n".join(lines)) > max_chars:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+def _llm_summary(summary: str, turns: List[Dict[str, str]], max_chars: int) -> str:
+    """이전 요약 + 접을 턴 → LLM 요약 (실패하면 compact 요약)"""
+    from ..llm import get_chat_model
+    dialogue = "\n".join(f"사용자: {t['user']}\nAI: {t['ai']}" for t in turns)
+    prompt = (f"다음은 주식 차트 도우미와 사용자의 이전 대화 요약과 그 뒤의 대화입니다. "
+              f"이후 대화에 필요한 사실(종목, 기간, 선호 지표, 사용자의 관심사)만 남겨 {max_chars}자 이내로 요약해주세요.\n\n"
+              f"이전 요약:\n{summary or '없음'}\n\n대화:\n{dialogue}")
+    try:
+        content = get_chat_model(temperature=0.0).invoke([{"role": "user", "content": prompt}]).content
+        return str(content)[:max_chars]
+    except Exception as e:
+        print(f"⚠️  대화 요약 실패 (간단 요약 사용): {str(e)}")
+        return _compact_summary(summary, turns, max_chars)
+
+
+class ConversationMemory:
+    """namespace 하나의 대화 턴 기록 (최근 턴 원문 + 이전 턴 요약)"""
+
+    def __init__(self, store: BaseStore, namespace: tuple, recent_turns: int = None, summary_batch: int = None,
+                 summary_max_chars: int = None, summary_mode: str = None):
+        self.store = store
+        self.namespace = namespace
+        self.recent_turns = max(1, recent_turns if recent_turns is not None else config.MEMORY_RECENT_TURNS)
+        self.summary_batch = max(1, summary_batch if summary_batch is not None else config.MEMORY_SUMMARY_BATCH)
+        self.summary_max_chars = summary_max_chars if summary_max_chars is not None else config.MEMORY_SUMMARY_MAX_CHARS
+        self.summary_mode = summary_mode or config.MEMORY_SUMMARY_MODE
+
+    def _meta(self) -> Dict:
+        item = self.store.get(self.namespace, META_KEY)
+        return dict(item.value) if item is not None else {"first": 0, "next": 0, "summary": ""}
+
+    def append(self, user_message: str, ai_response: str):
+        """턴 하나 추가 (넘치면 오래된 턴을 요약으로 접음)"""
+        meta = self._meta()
+        self.store.put(self.namespace, _turn_key(meta["next"]),
+                       {"user": str(user_message), "ai": str(ai_response), "ts": time.time()})
+        meta["next"] += 1
+        if meta["next"] - meta["first"] >= self.recent_turns + self.summary_batch:
+            self._fold(meta)
+        self.store.put(self.namespace, META_KEY, meta)
+
+    def _fold(self, meta: Dict):
+        """최근 recent_turns개만 남기고 나머지를 요약에 합친 뒤 삭제 (meta를 고침)"""
+        keep_from = meta["next"] - self.recent_turns
+        folded = []
+        for number in range(meta["first"], keep_from):
+            item = self.store.get(self.namespace, _turn_key(number))
+            if item is not None:
+                folded.append(item.value)
+            self.store.delete(self.namespace, _turn_key(number))
+        summarize = _llm_summary if self.summary_mode == "llm" else _compact_summary
+        meta["summary"] = summarize(meta["summary"], folded, self.summary_max_chars)
+        meta["first"] = keep_from
+
+    def recent(self) -> List[Dict[str, str]]:
+        """요약하지 않은 최근 턴 (오래된 순)"""
+        meta = self._meta()
+        turns = []
+        for number in range(meta["first"], meta["next"]):
+            item = self.store.get(self.namespace, _turn_key(number))
+            if item is not None:
+                turns.append(item.value)
+        return turns
+
+    def render(self, empty: str = "대화 히스토리 없음") -> str:
+        """프롬프트용 문자열: 이전 대화 요약 + 최근 턴"""
+        meta = self._meta()
+        parts = []
+        if meta["summary"]:
+            parts.append(f"[이전 대화 요약]\n{meta['summary']}")
+        parts += [f"사용자: {t['user']}\nAI: {t['ai']}" for t in self.recent()]
+        return "\n".join(parts) if parts else empty
+
+    def clear(self):
+        meta = self._meta()
+        for number in range(meta["first"], meta["next"]):
+            self.store.delete(self.namespace, _turn_key(number))
+        self.store.delete(self.namespace, META_KEY)
@@ -48,11 +48,22 @@ GENERAL_CHAT_USER_PROMPT = """이전 대화:
 PARAM_EXTRACTION_SYSTEM_PROMPT = """당신은 차트 생성에 필요한 파라미터를 추출하는 도구입니다.
 
 ## 필수 파라미터 (모두 있어야 함)
-- ticker: 주식 심볼 (주식명을 심볼로 변환)
+- tickers: 주식 심볼 리스트 (주식명을 심볼로 변환, 여러 종목 비교 요청이면 모두 포함)
 - period: 기간 (1d, 1w, 1mo, 3mo, 6mo, 1y, 2y)
 - interval: 간격 (1m, 5m, 15m, 1h, 4h, 1d)
 - chart_type: 차트 타입 (candlestick, line, bar, area)
-- indicators: 기술적 지표 (종가, 이동평균, RSI, MACD, 거래량, 볼린저밴드) - 리스트로 반환
+- indicators: 기술적 지표 (종가, 이동평균, EMA, RSI, MACD, 거래량, 볼린저밴드, ATR, 스토캐스틱, VWAP, OBV) - 리스트로 반환
+
+## 이동평균 기간
+- 사용자가 이동평균/일선 기간을 말하면 ma_windows에 숫자 리스트로 반환 (예: "20·60일선" → [20, 60], "5, 20, 60, 120일 이평선" → [5, 20, 60, 120])
+- 지수이동평균(EMA) 기간은 ema_windows에 반환 (예: "EMA 12, 26" → [12, 26])
+- 기간을 말하지 않았으면 null
+
+## 날짜 범위 / 봉 개수
+- 특정 날짜 범위를 말하면 start/end에 YYYY-MM-DD로 반환 (예: "2023년 3월부터 6월까지" → start=2023-03-01, end=2023-06-30)
+- "최근 90거래일", "최근 200개 봉"처럼 개수를 말하면 bars에 숫자로 반환 (예: 90)
+- start/end/bars 중 하나라도 있으면 period는 없어도 됨 (missing_params에 넣지 않음)
+- 범위를 말하지 않았으면 모두 null
 
 ## 주식명 → 심볼 변환 예시
 - 엔비디아 → NVDA
@@ -60,6 +71,7 @@ PARAM_EXTRACTION_SYSTEM_PROMPT = """당신은 차트 생성에 필요한 파라
 - 마이크로소프트 → MSFT
 - 테슬라 → TSLA
 - 삼성전자 → 005930.KS (한국 주식)
+- "애플이랑 마이크로소프트 비교" → [AAPL, MSFT]
 
 ## 중요
 - 모든 파라미터가 있으면 is_complete=True
@@ -74,6 +86,17 @@ PARAM_EXTRACTION_USER_PROMPT = """사용자 메시지: {user_message}
 
 위 메시지에서 차트 생성에 필요한 파라미터를 추출해주세요."""
 
+# 라우팅 + 파라미터 추출 통합 프롬프트 (CHART_ROUTER_COMBINED=1일 때 LLM 한 번으로 처리)
+COMBINED_ROUTER_PARAM_SYSTEM_PROMPT = """당신은 마지막 사용자 메시지가 주식 차트 요청인지 분류하고, 차트 요청이면 차트 파라미터까지 추출하는 도구입니다.
+
+## 1단계: 분류 (is_chart_request)
+- True: 주식/주가/종목명/티커가 언급되며 차트, 그래프, 시각화, 봉차트, 지표 등을 원하는 경우, 또는 진행 중인 차트 설정 대화에 대한 답변
+- False: 인사, 날씨, 뉴스 등 일반 대화, 주식 관련이지만 차트나 시각화 요청이 아닌 경우
+- False이면 나머지 파라미터는 비워 두고 is_complete=False
+
+## 2단계: 파라미터 추출 (is_chart_request=True일 때만)
+""" + PARAM_EXTRACTION_SYSTEM_PROMPT.split("\n", 1)[1].replace("\n## ", "\n### ")
+
 # Enhancement Tool 프롬프트
 ENHANCE_EDIT_SYSTEM_PROMPT = """당신은 차트 편집 요청을 분석하는 도구입니다.
 
@@ -81,13 +104,18 @@ ENHANCE_EDIT_SYSTEM_PROMPT = """당신은 차트 편집 요청을 분석하는 
 
 ### add_indicator (지표 추가)
 사용자가 새로운 기술적 지표를 추가하고 싶어하는 경우
-- 지원 지표: RSI, MACD, 이동평균, 볼린저밴드, 거래량
+- 지원 지표: RSI, MACD, 이동평균, EMA, 볼린저밴드, ATR, 스토캐스틱, VWAP, OBV, 거래량
 - 예시: "RSI 추가해줘", "MACD 넣어줘", "이동평균 추가"
+- 기간을 지정하면 indicator를 "MA(20,60)", "EMA(12,26)" 형식으로 반환 (예: "5일, 120일선 추가" → "MA(5,120)")
 
 ### remove_indicator (지표 제거)  
 사용자가 기존 지표를 제거하고 싶어하는 경우
 - 예시: "이동평균 제거해줘", "RSI 빼줘", "MACD 없애줘"
 
+### set_indicator (지표 기간 변경)
+사용자가 이미 있는 지표의 기간/설정을 바꾸고 싶어하는 경우 (기존 설정을 대체)
+- 예시: "이평선을 20, 60일로 바꿔줘" → "MA(20,60)", "RSI 기간 21로" → "RSI(21)"
+
 ### change_chart_type (차트 타입 변경)
 사용자가 차트 형태를 변경하고 싶어하는 경우
 - 지원 타입: candlestick, line, bar, area
@@ -97,6 +125,11 @@ ENHANCE_EDIT_SYSTEM_PROMPT = """당신은 차트 편집 요청을 분석하는 
 사용자가 차트의 색상, 크기 등을 변경하고 싶어하는 경우
 - 예시: "빨간색으로 바꿔줘", "크게 해줘", "색상 변경"
 
+## 여러 변경
+- 한 문장에 여러 변경을 요청하면 actions에 요청한 순서대로 모두 담기 (지표마다 액션 하나)
+- 예시: "RSI랑 MACD 넣고 라인차트로 바꿔줘" → [add_indicator RSI, add_indicator MACD, change_chart_type line]
+- 예시: "이평선 빼고 볼린저밴드 추가" → [remove_indicator MA, add_indicator Bollinger]
+
 ## 응답 형식
 사용자 요청을 분석하여 적절한 액션과 파라미터를 결정해주세요."""
 
@@ -17,9 +17,14 @@ class State(MessagesState):
     chart_params: dict          # 차트 생성에 필요한 파라미터(dict)
     pending_params: dict        # 사용자 확인 대기 중인 파라미터(dict)
     data_available: bool        # 데이터 수집 성공 여부
-    chart_data: dict            # 수집된 차트 데이터(dict)
+    chart_data: dict            # 수집된 차트 데이터(dict, data는 NumPy 컬럼 배열)
     chart_output: str           # 차트 생성 결과 메시지(또는 에러 메시지)
+    chart_file: str             # 마지막으로 렌더링한 차트 HTML 경로 (/export html)
     enhancement_mode: bool      # 차트 추가 편집/개선 모드 여부 (True/False)
+    error_type: str             # 데이터 수집 실패 종류 (period_interval_mismatch, no_data, download_error, rate_limited 등)
+    correction_attempts: int    # 자동 보정 후 재수집한 횟수 (상한: CORRECTION_MAX_ATTEMPTS)
+    correction_applied: bool    # 이번 보정 단계에서 파라미터를 고쳤는지 (True면 재수집)
+    params_extracted: bool      # 라우터 통합 호출에서 파라미터까지 추출했는지 (True면 param_tool 생략)
 
 
 class RouterSchema(BaseModel):
@@ -33,22 +38,37 @@ class RouterSchema(BaseModel):
 class ParamExtractionSchema(BaseModel):
     """파라미터 추출 결과"""
     reasoning: str = Field(description="파라미터 추출 근거")
-    ticker: str = Field(description="주식 심볼 (예: NVDA, AAPL)")
+    tickers: List[str] = Field(description="주식 심볼 목록, 비교 요청이면 여러 개 (예: [NVDA], [AAPL, MSFT])")
     period: Optional[str] = Field(description="기간 (예: 1y, 6mo, 3mo)")
     interval: Optional[str] = Field(description="간격 (예: 1d, 1h, 5m)")
     chart_type: Optional[str] = Field(description="차트 타입 (예: candlestick, line)")
     indicators: Optional[List[str]] = Field(description="기술적 지표 (예: MA, RSI, MACD)")
+    ma_windows: Optional[List[int]] = Field(default=None, description="이동평균 기간 목록 (예: 20·60일선 → [20, 60])")
+    ema_windows: Optional[List[int]] = Field(default=None, description="지수이동평균 기간 목록 (예: [12, 26])")
+    start: Optional[str] = Field(default=None, description="조회 시작일 YYYY-MM-DD (예: 2023년 3월부터 → 2023-03-01)")
+    end: Optional[str] = Field(default=None, description="조회 종료일 YYYY-MM-DD, 그날 포함 (예: 6월까지 → 2023-06-30)")
+    bars: Optional[int] = Field(default=None, description="최근 N개 봉 (예: 최근 90거래일 → 90)")
     missing_params: List[str] = Field(description="부족한 파라미터 목록")
     is_complete: bool = Field(description="모든 필수 파라미터가 있는지 여부")
     is_continue: bool = Field(description="사용자가 진행을 원하는지 여부")
 
 
+class RoutedParamSchema(ParamExtractionSchema):
+    """라우팅 + 파라미터 추출 통합 결과 (차트 요청이 아니면 파라미터는 무시)"""
+    is_chart_request: bool = Field(
+        description="마지막 사용자 메시지가 차트 요청인지 여부 (True: 차트 요청, False: 일반 대화)"
+    )
+
+
 class ChartParams(TypedDict):
     """차트 파라미터 모델"""
-    ticker: str
+    tickers: List[str]          # 첫 번째 종목이 대표 종목 (지표 계산 대상)
     period: str
     interval: str
-    indicators: Optional[List[str]]
+    indicators: Optional[List[str]]   # 파라미터가 있으면 "MA(20,60)", "EMA(12,26)" 형태
+    start: Optional[str]        # 범위 조회 시작일 (있으면 period 대신 사용)
+    end: Optional[str]          # 범위 조회 종료일 (그날 포함)
+    bars: Optional[int]         # 최근 N개 봉
     chart_type: Optional[str]
 
 
@@ -60,11 +80,16 @@ class ChartResponse(TypedDict):
     chart_type: str
 
 
-class EditRequestSchema(BaseModel):
-    """편집 요청 파싱 결과"""
+class EditAction(BaseModel):
+    """편집 액션 하나"""
+    action: str = Field(description="편집 액션 (add_indicator, remove_indicator, set_indicator, change_chart_type, change_style)")
+    indicator: Optional[str] = Field(default=None, description="추가/제거/변경할 지표 (기간이 있으면 MA(20,60) 형식)")
+    chart_type: Optional[str] = Field(default=None, description="변경할 차트 타입")
+    style_change: Optional[str] = Field(default=None, description="스타일 변경 내용")
+
+
+class EditPlanSchema(BaseModel):
+    """편집 요청 파싱 결과: 한 문장의 여러 변경을 순서대로 (함께 검증하고 한 번에 적용)"""
     reasoning: str = Field(description="편집 요청 분석 근거")
-    action: str = Field(description="편집 액션 (add_indicator, remove_indicator, change_chart_type, change_style)")
-    indicator: Optional[str] = Field(description="추가/제거할 지표명")
-    chart_type: Optional[str] = Field(description="변경할 차트 타입")
-    style_change: Optional[str] = Field(description="스타일 변경 내용")
+    actions: List[EditAction] = Field(description="요청한 순서대로의 편집 액션 목록 (예: RSI랑 MACD 넣고 라인차트로 → 3개)")
     is_edit_request: bool = Field(description="편집 요청인지 여부")
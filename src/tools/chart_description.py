@@ -0,0 +1,176 @@
+"""
+차트 설명 문구: 렌더링 뒤 보여 주는 2~3줄 설명
+- template (기본): chart_data에 이미 있는 종목/기간/간격/차트 타입/지표로 LLM 없이 바로 작성
+- deferred: 템플릿 설명으로 바로 응답하고 LLM 설명은 백그라운드에서 만들어 다음 입력 전에 표시
+- llm: 기존처럼 LLM 설명이 나올 때까지 기다림
+CHART_DESCRIPTION_MODE로 선택
+"""
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from .. import config
+from ..llm import get_chat_model
+from ..data.tickers import get_ticker_index
+from ..indicators.registry import parse_indicator_spec
+
+
+# 지표 대표 이름 → (표시 이름, 설명 문구)
+INDICATOR_LABELS = {
+    "MA": ("이동평균선", "추세 방향"),
+    "EMA": ("지수이동평균선", "최근 가격에 민감한 추세"),
+    "RSI": ("RSI", "과매수·과매도"),
+    "MACD": ("MACD", "추세 전환과 모멘텀"),
+    "Bollinger": ("볼린저밴드", "변동성 구간"),
+    "ATR": ("ATR", "변동성 크기"),
+    "Stochastic": ("스토캐스틱", "과매수·과매도"),
+    "VWAP": ("VWAP", "거래량 가중 평균 가격"),
+    "OBV": ("OBV", "거래량 흐름"),
+    "Volume": ("거래량", "거래 규모"),
+}
+CHART_TYPE_LABELS = {"candlestick": "캔들스틱", "line": "라인", "bar": "바", "area": "영역"}
+INTERVAL_UNITS = {"m": "분봉", "h": "시간봉", "d": "일봉", "wk": "주봉", "mo": "월봉"}
+PERIOD_UNITS = {"d": "일", "w": "주", "wk": "주", "mo": "개월", "y": "년"}
+
+_pending: List[Tuple[str, Future]] = []   # (차트 파일, LLM 설명 Future)
+_pending_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _josa(word: str, with_final: str, without_final: str) -> str:
+    """앞 단어 받침에 맞는 조사 ('으로'는 ㄹ 받침 뒤에서도 '로', 한글이 아니면 숫자/영문 끝소리로 판단)"""
+    last = word[-1:] if word else ""
+    if "가" <= last <= "힣":
+        final = (ord(last) - 0xAC00) % 28
+        if with_final == "으로" and final == 8:
+            return without_final
+        return with_final if final else without_final
+    return with_final if last in "0136mnMN" else without_final
+
+
+def ticker_label(ticker: str) -> str:
+    """'AAPL' → '애플(AAPL)' (종목 색인에 없으면 티커 그대로)"""
+    info = get_ticker_index().get(ticker)
+    return info.display_name if info is not None else ticker
+
+
+def period_label(period: str) -> str:
+    """'1y' → '1년', '6mo' → '6개월', 'max' → '전체 기간' (날짜 범위 등 그 외는 그대로)"""
+    if period in ("max", "ytd"):
+        return {"max": "전체 기간", "ytd": "올해"}[period]
+    match = re.fullmatch(r"(\d+)(mo|wk|d|w|y)", str(period))
+    return f"{match.group(1)}{PERIOD_UNITS[match.group(2)]}" if match else str(period)
+
+
+def interval_label(interval: str) -> str:
+    """'1d' → '일봉', '5m' → '5분봉', '1h' → '1시간봉'"""
+    match = re.fullmatch(r"(\d+)(mo|wk|m|h|d)", str(interval))
+    if not match:
+        return str(interval)
+    count, unit = match.groups()
+    if unit in ("d", "wk", "mo") and count == "1":
+        return INTERVAL_UNITS[unit]
+    return f"{count}{INTERVAL_UNITS[unit]}"
+
+
+def indicator_label(spec: str) -> Tuple[str, Optional[str]]:
+    """'MA(20,60)' → ('이동평균선(20·60)', '추세 방향'), 등록되지 않은 지표는 (원래 문자열, None)"""
+    indicator, params = parse_indicator_spec(spec)
+    if indicator is None or indicator.name not in INDICATOR_LABELS:
+        return str(spec), None
+    label, meaning = INDICATOR_LABELS[indicator.name]
+    if params.get("windows"):
+        label = f"{label}({'·'.join(str(w) for w in params['windows'])})"
+    return label, meaning
+
+
+def template_description(chart_data: dict) -> str:
+    """chart_data 필드만으로 만드는 설명 (LLM 없음)"""
+    tickers = chart_data.get("tickers") or [chart_data.get("ticker", "Unknown")]
+    names = ", ".join(ticker_label(t) for t in tickers)
+    period = period_label(chart_data.get("period", ""))
+    interval = interval_label(chart_data.get("interval", ""))
+    chart_type = CHART_TYPE_LABELS.get(chart_data.get("chart_type", "candlestick"), chart_data.get("chart_type"))
+
+    if chart_data.get("compare"):
+        lines = [f"{names}의 {period} {interval} 수익률 비교 차트를 생성했습니다. 첫 종가 대비 등락률(%)로 비교할 수 있습니다."]
+    else:
+        lines = [f"{names} 주식의 {period} {interval} 차트를 {chart_type}{_josa(chart_type, '으로', '로')} 생성했습니다."]
+
+    # 비교 차트는 지표를 그리지 않음
+    labels = [] if chart_data.get("compare") else [indicator_label(spec) for spec in chart_data.get("indicators", [])]
+    labels = [(label, meaning) for label, meaning in labels if label != "price"]
+    if labels:
+        meanings = ", ".join(dict.fromkeys(meaning for _, meaning in labels if meaning))
+        shown = ", ".join(label for label, _ in labels)
+        if meanings:
+            lines.append(f"{shown} 지표를 함께 표시해 {meanings}{_josa(meanings, '을', '를')} 살펴볼 수 있습니다.")
+        else:
+            lines.append(f"{shown} 지표를 함께 표시했습니다.")
+    return "\n".join(lines)
+
+
+def llm_description(chart_data: dict) -> str:
+    """LLM이 쓰는 자연스러운 설명 (2-3줄)"""
+    tickers = chart_data.get("tickers") or [chart_data.get("ticker", "Unknown")]
+    indicators = chart_data.get("indicators", [])
+    llm = get_chat_model(temperature=0.0)
+    description_prompt = f"""
+다음 정보를 바탕으로 생성된 차트를 간단하고 자연스럽게 설명해주세요 (2-3줄):
+
+• 종목: {', '.join(tickers)}
+• 기간: {chart_data.get("period", "알 수 없음")}
+• 간격: {chart_data.get("interval", "알 수 없음")}
+• 차트 타입: {chart_data.get("chart_type", "candlestick")}
+• 지표: {', '.join(indicators) if indicators else '없음'}
+
+예시: "애플(AAPL) 주식의 1년간 일봉 차트를 캔들스틱으로 생성했습니다. RSI와 MACD 지표를 포함하여 기술적 분석이 가능합니다."
+"""
+    return llm.invoke([{"role": "user", "content": description_prompt}]).content
+
+
+def _submit(chart_file: str, chart_data: dict):
+    global _executor
+    with _pending_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="chart-description")
+        _pending.append((chart_file, _executor.submit(llm_description, chart_data)))
+
+
+def describe_chart(chart_data: dict, chart_file: str, mode: str = None) -> str:
+    """
+    설정한 방식으로 차트 설명 작성
+    - deferred면 템플릿 설명을 바로 반환하고 LLM 설명은 ready_descriptions()로 나중에 받음
+    - llm 호출이 실패하면 템플릿 설명으로 대체
+    """
+    mode = mode or config.DESCRIPTION_MODE
+    if mode == "llm":
+        try:
+            return llm_description(chart_data)
+        except Exception as e:
+            print(f"⚠️  LLM 차트 설명 실패 (템플릿 설명 사용): {str(e)}")
+    elif mode == "deferred":
+        _submit(chart_file, chart_data)
+    return template_description(chart_data)
+
+
+def ready_descriptions(wait: float = 0.0) -> List[Tuple[str, str]]:
+    """완료된 지연 LLM 설명 [(차트 파일, 설명)] (wait초까지 기다림, 실패한 것은 버림)"""
+    with _pending_lock:
+        pending = list(_pending)
+    results = []
+    for chart_file, future in pending:
+        if wait > 0 and not future.done():
+            try:
+                future.result(timeout=wait)
+            except Exception:
+                pass
+        if not future.done():
+            continue
+        with _pending_lock:
+            _pending.remove((chart_file, future))
+        try:
+            results.append((chart_file, future.result()))
+        except Exception as e:
+            print(f"⚠️  LLM 차트 설명 실패: {str(e)}")
+    return results
@@ -3,58 +3,33 @@ Enhancement Tool: 추가 지표 편집 및 내보내기
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List, Literal
-from langchain.chat_models import init_chat_model
+from typing import Dict, Any, List, Literal, Tuple
+from ..llm import get_chat_model
 from langgraph.types import interrupt, Command
 from langgraph.graph import END
-from ..schemas import State, EditRequestSchema
+from ..schemas import State, EditAction, EditPlanSchema
 from ..prompts import ENHANCE_EDIT_SYSTEM_PROMPT, ENHANCE_INTENT_SYSTEM_PROMPT
 from .yfinance_tool import calculate_technical_indicators
+from ..data.columnar import BASE_COLUMNS, columns_to_frame, frame_to_columns
+from ..indicators.registry import indicator_columns, indicator_name
+from .slash_commands import CHART_TYPE_ALIASES, SlashCommand, parse_slash_command
+from .visualization_tool import export_chart
 
 
 def restore_dataframe_from_chart_data(chart_data: dict) -> pd.DataFrame:
     """chart_data에서 DataFrame 복원"""
-    data = chart_data.get("data", {})
-    
-    df = pd.DataFrame({
-        'Open': data.get('open', []),
-        'High': data.get('high', []),
-        'Low': data.get('low', []),
-        'Close': data.get('close', []),
-        'Volume': data.get('volume', [])
-    })
-    
-    # 날짜 인덱스 설정
-    if 'dates' in data:
-        df.index = pd.to_datetime(data['dates'])
-    
-    # 기존 기술적 지표 복원
-    for col in data:
-        if col not in ['dates', 'open', 'high', 'low', 'close', 'volume']:
-            df[col.upper()] = data[col]
-    
-    return df
+    return columns_to_frame(chart_data.get("data", {}))
 
 
 def convert_dataframe_to_chart_data(df: pd.DataFrame, original_chart_data: dict) -> dict:
     """DataFrame을 chart_data 형태로 변환"""
     chart_data = original_chart_data.copy()
-    
-    # 기본 OHLCV 데이터 업데이트
-    chart_data["data"] = {
-        "dates": df.index.strftime("%Y-%m-%d %H:%M:%S").tolist(),
-        "open": df["Open"].tolist(),
-        "high": df["High"].tolist(),
-        "low": df["Low"].tolist(),
-        "close": df["Close"].tolist(),
-        "volume": df["Volume"].tolist()
-    }
-    
-    # 기술적 지표 데이터 추가
-    for col in df.columns:
-        if col not in ["Open", "High", "Low", "Close", "Volume"]:
-            chart_data["data"][col.lower()] = df[col].tolist()
-    
+    columns = frame_to_columns(df)
+    # 시세 컬럼은 행이 그대로면 기존 배열 유지 (메모리 맵 저장소의 복사 없는 뷰일 수 있음)
+    original = original_chart_data.get("data", {})
+    if len(original.get("dates", [])) == len(columns["dates"]):
+        columns.update({key: original[key] for key in ("dates", "tz", *BASE_COLUMNS) if key in original})
+    chart_data["data"] = columns
     return chart_data
 
 
@@ -62,20 +37,60 @@ def process_edit_request(state: State, user_input: str) -> State:
     """편집 요청을 처리하는 함수"""
     print(f"✨ 편집 요청 처리 중: {user_input}")
     
-    # LLM 초기화
-    llm = init_chat_model("openai:gpt-4o", temperature=0.0)
-    llm_edit = llm.with_structured_output(EditRequestSchema)
+    # 공용 LLM 인스턴스 (프로세스에서 한 번만 생성)
+    llm_edit = get_chat_model(temperature=0.0, schema=EditPlanSchema, cache_site="edit")
     
-    # 편집 요청 파싱
+    # 편집 요청 파싱 (한 문장의 여러 변경은 actions 목록으로)
     result = llm_edit.invoke([
         {"role": "system", "content": ENHANCE_EDIT_SYSTEM_PROMPT},
         {"role": "user", "content": user_input}
     ])
     
     print(f"편집 요청 분석: {result}")
-    
+    return apply_edit_plan(state, result)
+
+
+def plan_indicators(current: List[str], actions: List[EditAction]) -> Tuple[List[str], List[str], List[str]]:
+    """
+    편집 액션을 순서대로 지표 목록에 반영 → (최종 지표 목록, 변경 내역, 문제 목록)
+    - add: 같은 설정이 없으면 뒤에 추가, set: 같은 지표의 기존 설정을 대체, remove: 같은 지표 모두 제거
+    """
+    indicators = list(current)
+    notes, problems = [], []
+    for action in actions:
+        if action.action not in ("add_indicator", "remove_indicator", "set_indicator"):
+            continue
+        name = indicator_name(action.indicator) if action.indicator else None
+        if name is None:
+            problems.append(f"알 수 없는 지표: {action.indicator or '(없음)'}")
+            continue
+        matched = [ind for ind in indicators if indicator_name(ind) == name]
+        if action.action == "add_indicator":
+            if action.indicator not in indicators:
+                indicators.append(action.indicator)
+            notes.append(f"'{action.indicator}' 추가")
+        elif action.action == "remove_indicator":
+            if not matched:
+                notes.append(f"'{action.indicator}'는 차트에 없음")
+                continue
+            indicators = [ind for ind in indicators if ind not in matched]
+            notes.append(f"'{', '.join(matched)}' 제거")
+        else:
+            position = indicators.index(matched[0]) if matched else len(indicators)
+            remaining = [ind for ind in indicators if ind not in matched]
+            indicators = remaining[:position] + [action.indicator] + remaining[position:]
+            notes.append(f"'{action.indicator}'(으)로 변경")
+    return indicators, notes, problems
+
+
+def apply_edit_plan(state: State, plan: EditPlanSchema) -> State:
+    """
+    편집 계획을 chart_data에 반영 (LLM 해석과 슬래시 명령이 함께 사용)
+    - 모든 액션을 먼저 검증하고, 문제가 있으면 아무것도 바꾸지 않음
+    - 지표 컬럼은 한 번에 제거/계산하고, 렌더링은 visualization_node에서 한 번
+    """
     # 편집 요청이 아니면 종료
-    if not result.is_edit_request:
+    if not plan.is_edit_request or not plan.actions:
         return {
             "enhancement_mode": False,
             "chart_output": "편집 요청이 아닙니다. 차트가 완성되었습니다."
@@ -83,91 +98,56 @@ def process_edit_request(state: State, user_input: str) -> State:
     
     try:
         # 기존 chart_data에서 DataFrame 복원
-        chart_data = state.get("chart_data", {})
+        chart_data = dict(state.get("chart_data", {}))
         if not chart_data:
             return {
                 "enhancement_mode": False,
                 "chart_output": "편집할 차트 데이터가 없습니다."
             }
         
-        df = restore_dataframe_from_chart_data(chart_data)
-        print(f"📊 기존 데이터 복원: {len(df)}개 포인트")
-        
-        # 편집 액션별 처리
-        if result.action == "add_indicator":
-            if result.indicator:
-                print(f"➕ 지표 추가: {result.indicator}")
-                df = calculate_technical_indicators(df, [result.indicator])
-                
-                # indicators 목록 업데이트
-                current_indicators = chart_data.get("indicators", [])
-                if result.indicator not in current_indicators:
-                    current_indicators.append(result.indicator)
-                    chart_data["indicators"] = current_indicators
-                
-                # DataFrame을 chart_data로 변환
-                updated_chart_data = convert_dataframe_to_chart_data(df, chart_data)
-                
-                return {
-                    "chart_data": updated_chart_data,
-                    "enhancement_mode": False,  # 편집 완료 후 visualization_node로 이동
-                    "chart_output": f"'{result.indicator}' 지표가 추가되었습니다. 차트를 업데이트합니다."
-                }
-        
-        elif result.action == "remove_indicator":
-            if result.indicator:
-                print(f"➖ 지표 제거: {result.indicator}")
-                # 지표 관련 컬럼 제거
-                indicator_cols = {
-                    "RSI": ["rsi"],
-                    "MACD": ["macd", "macd_signal", "macd_histogram"],
-                    "MA": ["ma20", "ma50"],
-                    "Bollinger": ["bb_upper", "bb_middle", "bb_lower"]
-                }
-                
-                cols_to_remove = indicator_cols.get(result.indicator, [])
-                for col in cols_to_remove:
-                    if col.upper() in df.columns:
-                        df = df.drop(columns=[col.upper()])
-                
-                # indicators 목록에서 제거
-                current_indicators = chart_data.get("indicators", [])
-                if result.indicator in current_indicators:
-                    current_indicators.remove(result.indicator)
-                    chart_data["indicators"] = current_indicators
-                
-                # DataFrame을 chart_data로 변환
-                updated_chart_data = convert_dataframe_to_chart_data(df, chart_data)
-                
-                return {
-                    "chart_data": updated_chart_data,
-                    "enhancement_mode": False,  # 편집 완료 후 visualization_node로 이동
-                    "chart_output": f"'{result.indicator}' 지표가 제거되었습니다. 차트를 업데이트합니다."
-                }
-        
-        elif result.action == "change_chart_type":
-            if result.chart_type:
-                print(f"🔄 차트 타입 변경: {result.chart_type}")
-                chart_data["chart_type"] = result.chart_type
-                
-                return {
-                    "chart_data": chart_data,
-                    "enhancement_mode": False,  # 편집 완료 후 visualization_node로 이동
-                    "chart_output": f"차트 타입이 '{result.chart_type}'으로 변경되었습니다. 차트를 업데이트합니다."
-                }
-        
-        elif result.action == "change_style":
-            print(f"🎨 스타일 변경: {result.style_change}")
-            
+        # 1. 함께 검증 (지표 목록과 차트 타입을 계산만 해 봄)
+        current_indicators = list(chart_data.get("indicators", []))
+        indicators, notes, problems = plan_indicators(current_indicators, plan.actions)
+        chart_type = chart_data.get("chart_type", "candlestick")
+        for action in plan.actions:
+            if action.action == "change_chart_type":
+                new_type = CHART_TYPE_ALIASES.get(str(action.chart_type).lower())
+                if new_type is None:
+                    problems.append(f"지원하지 않는 차트 타입: {action.chart_type}")
+                else:
+                    chart_type = new_type
+                    notes.append(f"차트 타입 '{new_type}'")
+            elif action.action == "change_style":
+                notes.append(f"스타일 '{action.style_change}' (구현 예정)")
+            elif action.action not in ("add_indicator", "remove_indicator", "set_indicator"):
+                problems.append(f"알 수 없는 편집: {action.action}")
+        if problems:
+            print(f"❌ 편집 계획 검증 실패: {problems}")
             return {
-                "enhancement_mode": False,  # 편집 완료 후 visualization_node로 이동
-                "chart_output": f"스타일이 '{result.style_change}'으로 변경되었습니다. (구현 예정) 차트를 업데이트합니다."
+                "enhancement_mode": True,
+                "chart_output": "편집을 적용하지 않았습니다:\n" + "\n".join(f"• {p}" for p in problems)
             }
         
-        # 기본 응답
+        # 2. 지표 컬럼을 한 번에 제거/계산
+        added = [ind for ind in indicators if ind not in current_indicators]
+        removed = [ind for ind in current_indicators if ind not in indicators]
+        print(f"🧩 편집 계획 {len(plan.actions)}개 액션: 추가 {added}, 제거 {removed}, 타입 {chart_type}")
+        if added or removed:
+            df = restore_dataframe_from_chart_data(chart_data)
+            print(f"📊 기존 데이터 복원: {len(df)}개 포인트")
+            keep_columns = {col.upper() for spec in indicators for col in indicator_columns(spec)}
+            cols_to_remove = {col.upper() for spec in removed for col in indicator_columns(spec)} - keep_columns
+            df = df.drop(columns=[col for col in df.columns if col.upper() in cols_to_remove])
+            if added:
+                df = calculate_technical_indicators(df, added)
+            chart_data["indicators"] = indicators
+            chart_data = convert_dataframe_to_chart_data(df, chart_data)
+        chart_data["chart_type"] = chart_type
+        
         return {
+            "chart_data": chart_data,
             "enhancement_mode": False,  # 편집 완료 후 visualization_node로 이동
-            "chart_output": "편집이 완료되었습니다. 차트를 업데이트합니다."
+            "chart_output": f"{', '.join(notes)}. 차트를 업데이트합니다."
         }
         
     except Exception as e:
@@ -194,7 +174,42 @@ def enhance_node(state: State) -> State:
     }
 
 
-def enhance_interrupt_handler(state: State) -> Command[Literal["enhance_node", END]]:
+def edit_destination(edit_result: State) -> str:
+    """편집 결과에 따른 다음 노드 (검증 실패로 바뀐 것이 없으면 다시 렌더링하지 않고 입력 대기)"""
+    if edit_result.get("enhancement_mode") and "chart_data" not in edit_result:
+        return "enhance_node"
+    return "visualization_node"
+
+
+def handle_slash_command(state: State, command: SlashCommand, messages: list, user_input: str) -> Command:
+    """슬래시 명령 처리: 편집은 바로 반영 후 다시 렌더링, 내보내기/도움말은 다시 입력 대기"""
+    print(f"⚡ 슬래시 명령: {command.kind} (LLM 생략)")
+    base_update = {"messages": messages, "user_message": user_input}
+    
+    if command.kind == "done":
+        print("✅ 편집 완료 → END")
+        return Command(goto=END, update={**base_update, "enhancement_mode": False, "chart_output": "편집을 마쳤습니다."})
+    
+    if command.kind == "edit":
+        print(f"편집 요청 분석: {command.edit}")
+        edit_result = apply_edit_plan(state, command.edit)
+        return Command(goto=edit_destination(edit_result), update={**edit_result, **base_update})
+    
+    if command.kind == "export":
+        try:
+            filepath = export_chart(state.get("chart_data", {}), command.export_format, state.get("chart_file", ""))
+            message = f"{command.export_format.upper()} 파일로 내보냈습니다: {filepath}"
+            print(f"📤 내보내기 완료: {filepath}")
+        except Exception as e:
+            message = f"내보내기에 실패했습니다: {str(e)}"
+            print(f"❌ 내보내기 오류: {str(e)}")
+    else:
+        message = command.message
+    # 다시 렌더링하지 않고 편집 입력 대기로
+    return Command(goto="enhance_node", update={**base_update, "chart_output": message})
+
+
+def enhance_interrupt_handler(state: State) -> Command[Literal["enhance_node", "visualization_node", END]]:
     """편집 중 사용자 입력을 받는 interrupt handler"""
     
     # 편집 모드가 아니면 종료
@@ -211,7 +226,7 @@ def enhance_interrupt_handler(state: State) -> Command[Literal["enhance_node", E
     request = {
         "action_request": {
             "action": "차트 편집",
-            "args": {"available_actions": ["지표 추가/제거", "차트 타입 변경", "스타일 변경"]}
+            "args": {"available_actions": ["지표 추가/제거", "차트 타입 변경", "스타일 변경", "/edit", "/export", "/done"]}
         },
         "description": response_message,
     }
@@ -226,8 +241,13 @@ def enhance_interrupt_handler(state: State) -> Command[Literal["enhance_node", E
     existing_messages = state.get("messages", [])
     updated_messages = existing_messages + [{"role": "user", "content": user_input}]
     
+    # 슬래시 명령은 LLM 없이 바로 처리
+    command = parse_slash_command(user_input)
+    if command is not None:
+        return handle_slash_command(state, command, updated_messages, user_input)
+    
     # LLM을 사용해서 사용자 의도 파악
-    intent_llm = init_chat_model("openai:gpt-4o", temperature=0.0)
+    intent_llm = get_chat_model(temperature=0.0, cache_site="intent")
     intent_result = intent_llm.invoke([
         {"role": "system", "content": ENHANCE_INTENT_SYSTEM_PROMPT},
         {"role": "user", "content": f"사용자 입력: {user_input}"}
@@ -254,7 +274,7 @@ def enhance_interrupt_handler(state: State) -> Command[Literal["enhance_node", E
         
         # 편집 결과를 업데이트에 포함
         return Command(
-            goto="visualization_node",
+            goto=edit_destination(edit_result),
             update={
                 **edit_result,
                 "messages": updated_messages, 
@@ -1,8 +1,101 @@
 """
 Guide/Correction Tool: 데이터 오류 시 가이드 및 자동보정 제안
+- 네트워크 없이 보정: 기간-간격 불일치는 허용표에서 가장 가까운 조합으로, 티커 오타는 종목 색인 후보로,
+  분봉 조회 한도를 넘는 기간은 한도 안으로
+- 재수집은 CORRECTION_MAX_ATTEMPTS번까지만 (고칠 것이 없거나 한도에 도달하면 안내 후 종료)
 """
-from typing import Dict, Any
+import math
+from typing import Dict, Any, List, Optional, Tuple
+import pandas as pd
 from ..schemas import State
+from .. import config
+from ..data.periods import PERIOD_OFFSETS, INTERVAL_DELTAS, DateRange, period_start, period_covering, is_intraday
+from ..data.tickers import get_ticker_index
+from .yfinance_tool import PERIOD_INTERVAL_RESTRICTIONS, failed_lookups, lookup_key
+
+
+# 자주 쓰는 표기 → yfinance 표기
+PERIOD_ALIASES = {"1w": "5d", "1wk": "5d", "1m": "1mo", "3m": "3mo", "6m": "6mo", "12mo": "1y", "1yr": "1y",
+                  "24mo": "2y", "2yr": "2y", "5yr": "5y", "all": "max"}
+INTERVAL_ALIASES = {"1w": "1wk", "1min": "1m", "5min": "5m", "15min": "15m", "30min": "30m", "60min": "60m",
+                    "1hr": "1h", "4hr": "4h", "daily": "1d", "weekly": "1wk", "monthly": "1mo"}
+
+# yfinance 분봉 조회 한도 (이보다 긴 기간은 빈 결과) → 한도 안의 가장 긴 기간
+INTRADAY_MAX_PERIOD = {"1m": "5d", "2m": "1mo", "5m": "1mo", "15m": "1mo", "30m": "1mo",
+                       "60m": "2y", "90m": "1mo", "1h": "2y", "4h": "2y"}
+
+# 'max'의 길이 (비교용)
+MAX_PERIOD_SECONDS = 50 * 365 * 86400
+
+
+def period_seconds(period: str) -> float:
+    """기간 길이 (초)"""
+    if period == "max":
+        return MAX_PERIOD_SECONDS
+    now = pd.Timestamp.now(tz="UTC")
+    return max((now - period_start(period, now)).total_seconds(), 86400)
+
+
+def nearest_valid_period_interval(period: str, interval: str, keep_period: bool = False) -> Optional[Tuple[str, str]]:
+    """
+    허용표에서 (period, interval)에 가장 가까운 유효 조합
+    - 간격만 바꾸거나 기간만 바꾸는 후보 중 길이 비율(로그) 차이가 가장 작은 것
+    - keep_period면 간격만 변경 (범위 조회는 기간이 범위로 정해짐)
+    - 알 수 없는 기간/간격이면 None
+    """
+    period = PERIOD_ALIASES.get(period, period)
+    interval = INTERVAL_ALIASES.get(interval, interval)
+    if period not in PERIOD_INTERVAL_RESTRICTIONS and period not in PERIOD_OFFSETS:
+        return None
+    if interval not in INTERVAL_DELTAS:
+        return None
+    if interval in PERIOD_INTERVAL_RESTRICTIONS.get(period, []):
+        return period, interval
+
+    interval_seconds = INTERVAL_DELTAS[interval].total_seconds()
+    target_seconds = period_seconds(period)
+    candidates = []
+    # 기간은 유지하고 간격 변경
+    for valid_interval in PERIOD_INTERVAL_RESTRICTIONS.get(period, []):
+        cost = abs(math.log(INTERVAL_DELTAS[valid_interval].total_seconds() / interval_seconds))
+        candidates.append((cost, period, valid_interval))
+    # 간격은 유지하고 기간 변경
+    for valid_period, intervals in PERIOD_INTERVAL_RESTRICTIONS.items():
+        if interval in intervals and not keep_period:
+            cost = abs(math.log(period_seconds(valid_period) / target_seconds))
+            candidates.append((cost, valid_period, interval))
+    if not candidates:
+        return None
+    _, best_period, best_interval = min(candidates)
+    return best_period, best_interval
+
+
+def suggest_tickers(ticker: str, limit: int = 3) -> List[str]:
+    """종목 색인에서 ticker와 비슷한 종목 후보"""
+    return [info.ticker for info, _ in get_ticker_index().search(ticker, limit=limit) if info.ticker != ticker]
+
+
+def correct_tickers(tickers: List[str], period: str, interval: str,
+                    date_range: Optional[DateRange] = None) -> Dict[str, str]:
+    """색인에 없는 티커 중 확실한 후보(최근 실패하지 않은)가 있는 것 → {원래 티커: 후보}"""
+    index = get_ticker_index()
+    corrections = {}
+    for ticker in tickers:
+        if index.get(ticker) is not None:
+            continue
+        candidate = index.resolve(ticker)
+        if candidate and candidate != ticker and failed_lookups.get(lookup_key(candidate, period, interval, date_range)) is None:
+            corrections[ticker] = candidate
+    return corrections
+
+
+def _give_up(message: str) -> Dict[str, Any]:
+    print("🛑 자동 보정 불가 → 안내 후 종료")
+    return {
+        "correction_applied": False,
+        "chart_output": message,
+        "messages": [{"role": "assistant", "content": message}]
+    }
 
 
 def guide_correction_node(state: State) -> State:
@@ -12,5 +105,64 @@ def guide_correction_node(state: State) -> State:
     - 사용자에게 수정 제안
     """
     print("🔧 Guide Correction Node 실행 중...")
-    # TODO: 구현
-    return {"chart_output": "가이드 및 자동보정 제안"}
+
+    chart_params = dict(state.get("chart_params", {}))
+    tickers = chart_params.get("tickers") or [chart_params.get("ticker")]
+    tickers = [t for t in tickers if t]
+    period = chart_params.get("period", "1y")
+    interval = chart_params.get("interval", "1d")
+    error_type = state.get("error_type", "")
+    attempts = state.get("correction_attempts", 0)
+    error_message = state.get("chart_output", "")
+
+    if error_type == "rate_limited":
+        return _give_up(f"{error_message}\n잠시 후 같은 요청을 다시 보내주세요.")
+    if attempts >= config.CORRECTION_MAX_ATTEMPTS:
+        return _give_up(f"{error_message}\n자동 보정을 {attempts}번 시도했지만 데이터를 가져오지 못했습니다. 종목, 기간, 간격을 확인해주세요.")
+
+    notes = []
+    date_range = DateRange.from_params(chart_params)
+    if error_type == "period_interval_mismatch":
+        if date_range is not None:
+            period = period_covering(date_range.lookback_start(interval))
+        corrected = nearest_valid_period_interval(period, interval, keep_period=date_range is not None)
+        if corrected is None:
+            return _give_up(f"{error_message}\n• 기간: 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max\n"
+                            "• 간격: 1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 4h, 1d, 5d, 1wk, 1mo, 3mo")
+        new_period, new_interval = corrected
+        notes.append(f"기간-간격 {period}+{interval} → {new_period}+{new_interval}")
+        period, interval = new_period, new_interval
+
+    elif error_type in ("no_data", "download_error"):
+        corrections = correct_tickers(tickers, period, interval, date_range)
+        if corrections:
+            tickers = [corrections.get(t, t) for t in tickers]
+            notes.extend(f"종목 {raw} → {fixed}" for raw, fixed in corrections.items())
+        elif date_range is None and is_intraday(interval) and interval in INTRADAY_MAX_PERIOD \
+                and period_seconds(period) > period_seconds(INTRADAY_MAX_PERIOD[interval]):
+            # 분봉은 조회 가능한 기간이 짧아 긴 기간을 요청하면 빈 결과가 옴
+            new_period = INTRADAY_MAX_PERIOD[interval]
+            notes.append(f"{interval} 봉 조회 한도로 기간 {period} → {new_period}")
+            period = new_period
+        else:
+            hints = []
+            for ticker in tickers:
+                candidates = suggest_tickers(ticker)
+                if candidates:
+                    names = ", ".join(get_ticker_index().get(c).display_name for c in candidates)
+                    hints.append(f"• {ticker} → 혹시: {names}")
+            return _give_up("\n".join([error_message] + hints))
+
+    else:
+        return _give_up(error_message or "데이터를 가져오지 못했습니다.")
+
+    chart_params.update({"tickers": list(dict.fromkeys(tickers)), "interval": interval})
+    if date_range is None:
+        chart_params["period"] = period
+    print(f"🛠️  자동 보정 ({attempts + 1}/{config.CORRECTION_MAX_ATTEMPTS}): {'; '.join(notes)}")
+    return {
+        "chart_params": chart_params,
+        "correction_applied": True,
+        "correction_attempts": attempts + 1,
+        "chart_output": "자동 보정: " + "; ".join(notes)
+    }
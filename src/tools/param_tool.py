@@ -1,43 +1,136 @@
 """
 Param Tool: 차트 생성에 필요한 파라미터 점검 및 보완
 """
-from typing import Dict, Any, List, Literal
-from langchain.chat_models import init_chat_model
+import json
+import time
+from typing import Dict, Any, List, Literal, Optional, Tuple
+from .. import config
+from ..llm import get_chat_model
+from ..llm.tokens import count_message_tokens, message_parts, token_usage
 from langgraph.store.base import BaseStore
 from langgraph.types import interrupt, Command
 from ..schemas import State, ParamExtractionSchema
 from ..prompts import PARAM_EXTRACTION_SYSTEM_PROMPT, PARAM_EXTRACTION_USER_PROMPT
+from ..indicators.registry import format_indicator_spec, indicator_name
+from ..data.tickers import get_ticker_index, looks_like_symbol, normalize_ticker
+from ..data.periods import DateRange
+from ..agents.fast_router import router_stats
+from ..memory import ConversationMemory
 
 
 def get_param_conversation(store: BaseStore, namespace: tuple) -> str:
-    """Store에서 파라미터 수집 대화 히스토리 가져오기"""
+    """Store에서 파라미터 수집 대화 히스토리 가져오기 (이전 대화 요약 + 최근 턴)"""
     try:
-        memories = store.search(namespace)
-        if memories:
-            return memories[-1].value
-        return "파라미터 수집 대화 없음"
-    except:
+        return ConversationMemory(store, namespace).render("파라미터 수집 대화 없음")
+    except Exception:
         return "파라미터 수집 대화 없음"
 
 
 def update_param_conversation(store: BaseStore, namespace: tuple, user_message: str, ai_response: str):
-    """Store에 파라미터 수집 대화 업데이트"""
-    import uuid
-    
-    existing_history = get_param_conversation(store, namespace)
-    new_entry = f"사용자: {user_message}\nAI: {ai_response}"
-    updated_history = f"{existing_history}\n{new_entry}" if existing_history != "파라미터 수집 대화 없음" else new_entry
-    
-    memory_id = str(uuid.uuid4())
-    store.put(namespace, memory_id, {"param_conversation": updated_history})
+    """Store에 파라미터 수집 대화 턴 하나 추가 (namespace는 thread_namespace(thread_id, "param_conversation"))"""
+    ConversationMemory(store, namespace).append(user_message, ai_response)
+
+
+def apply_window_params(indicators: List[str], ma_windows: Optional[List[int]], ema_windows: Optional[List[int]]) -> List[str]:
+    """추출된 이동평균 기간을 지표 문자열에 반영 (예: MA + [20, 60] → "MA(20,60)", 1 미만·정수가 아닌 기간은 무시)"""
+    result = list(indicators)
+    for name, windows in (("MA", ma_windows), ("EMA", ema_windows)):
+        valid = [int(w) for w in windows or [] if float(w).is_integer() and w >= 1]
+        if len(valid) != len(windows or []):
+            print(f"⚠️  지원하지 않는 {name} 기간 무시: {[w for w in windows if w not in valid]}")
+        windows = valid
+        if not windows:
+            continue
+        spec = format_indicator_spec(name, {"windows": tuple(sorted(set(windows)))})
+        positions = [i for i, ind in enumerate(result) if indicator_name(ind) == name]
+        if positions:
+            # 기존 위치에 기간이 반영된 지표 하나만 남김
+            result[positions[0]] = spec
+            result = [ind for i, ind in enumerate(result) if i not in positions[1:]]
+        else:
+            result.append(spec)
+    return result
+
+
+def resolve_tickers(tickers: List[str]) -> Tuple[List[str], Dict[str, List[str]]]:
+    """
+    LLM이 추출한 종목을 로컬 색인으로 정규화 (다운로드 전 검증)
+    - 반환: (정규화된 티커 목록, 찾지 못한 입력 → 후보 티커 목록)
+    - 입력이 심볼 형태가 아닌데 색인에서도 하나로 정하지 못한 값(예: 오타가 심한 한글 종목명, 후보가 여럿인 "samsung")은
+      사용자에게 다시 확인 (normalize_ticker가 대문자로 바꾼 값은 심볼처럼 보이므로 원래 입력으로 판단)
+    """
+    index = get_ticker_index()
+    resolved, unresolved = [], {}
+    for raw in tickers or []:
+        ticker = normalize_ticker(raw)
+        if index.get(ticker) is None and not looks_like_symbol(raw):
+            unresolved[raw] = [info.ticker for info, _ in index.search(raw, limit=3)]
+            continue
+        if ticker != raw:
+            print(f"🔎 티커 정규화: {raw} → {ticker}")
+        if ticker not in resolved:
+            resolved.append(ticker)
+    return resolved, unresolved
+
+
+def _compact_params(params: dict) -> str:
+    """파라미터 dict → 한 줄 JSON (값이 없는 항목 제외)"""
+    return json.dumps({k: v for k, v in params.items() if v not in (None, [], "", {})}, ensure_ascii=False)
+
+
+def build_param_messages(state: State, system_prompt: str = PARAM_EXTRACTION_SYSTEM_PROMPT,
+                         budget: int = None, site: str = "param") -> List[dict]:
+    """
+    파라미터 추출 LLM 입력을 토큰 예산(PARAM_TOKEN_BUDGET) 안에서 구성
+    - 항상 포함: 시스템 프롬프트, 현재 요청(마지막 사용자 메시지)
+    - 직전에 확정된 chart_params와 확인 대기 중인 pending_params는 한 줄 JSON으로
+    - 남은 예산만큼 최근 대화를 최신 것부터 (PARAM_CONTEXT_MAX_MESSAGES개까지, 긴 메시지는 잘라서)
+    - 보낸 토큰 수를 출력하고 site별로 집계
+    """
+    budget = budget if budget is not None else config.PARAM_TOKEN_BUDGET
+    history = [message_parts(m) for m in state.get("messages", [])]
+    history = [(role, content) for role, content in history if role in ("user", "assistant") and content]
+
+    # 현재 요청 = 마지막 사용자 메시지 (messages가 비었으면 user_message)
+    last_user = max((i for i, (role, _) in enumerate(history) if role == "user"), default=None)
+    current = history[last_user][1] if last_user is not None else state.get("user_message", "")
+    earlier = history[:last_user] if last_user is not None else history
+
+    head = [{"role": "system", "content": system_prompt}]
+    context_lines = []
+    if state.get("chart_params"):
+        context_lines.append(f"직전에 확정한 차트 파라미터: {_compact_params(state['chart_params'])}")
+    if state.get("pending_params"):
+        context_lines.append(f"사용자 확인을 기다리는 파라미터: {_compact_params(state['pending_params'])}")
+    if context_lines:
+        context_lines.append("현재 요청이 우선이며, 현재 요청에 없는 값만 위 파라미터를 참고하세요.")
+        head.append({"role": "system", "content": "\n".join(context_lines)})
+    tail = [{"role": "user", "content": current}]
+
+    used = count_message_tokens(head + tail)
+    recent: List[dict] = []
+    limit = config.PARAM_CONTEXT_MESSAGE_CHARS
+    candidates = earlier[-config.PARAM_CONTEXT_MAX_MESSAGES:] if config.PARAM_CONTEXT_MAX_MESSAGES > 0 else []
+    for role, content in reversed(candidates):
+        message = {"role": role, "content": content if len(content) <= limit else content[:limit] + "…"}
+        cost = count_message_tokens([message]) - count_message_tokens([])
+        if used + cost > budget:
+            break
+        recent.insert(0, message)
+        used += cost
+
+    token_usage.record(site, used)
+    print(f"🧮 파라미터 추출 입력 {used} 토큰 (예산 {budget}, 이전 대화 {len(recent)}/{len(earlier)}개 메시지, "
+          f"평균 {token_usage.average(site):.0f})")
+    return head + recent + tail
 
 
 def param_tool(state: State, store: BaseStore) -> State:
     """
     Param Tool: 차트 생성에 필요한 파라미터 점검 및 보완
-    - ticker, period, interval 필수 파라미터 추출
+    - tickers, period, interval 필수 파라미터 추출
     - 부족한 파라미터 사용자에게 질의
-    - MessagesState를 통한 대화 히스토리 관리
+    - MessagesState의 대화 중 토큰 예산 안의 최근 대화만 전달 (build_param_messages)
     """
     print("🔧 Param Tool 실행 중...")
     
@@ -45,28 +138,65 @@ def param_tool(state: State, store: BaseStore) -> State:
     user_message = state.get("user_message", "")
     print(f"사용자 메시지: {user_message}")
     
-    # LLM 초기화
-    llm = init_chat_model("openai:gpt-4o", temperature=0.0)
-    llm_param = llm.with_structured_output(ParamExtractionSchema)
+    # 공용 LLM 인스턴스 (프로세스에서 한 번만 생성)
+    llm_param = get_chat_model(temperature=0.0, schema=ParamExtractionSchema, cache_site="param")
     
-    # LLM 호출 - state["messages"]를 사용하여 전체 대화 히스토리 전달
-    # ❓ 전체 대화 히스토리 전달하는게 낫겠지?
-    result = llm_param.invoke([
-        {"role": "system", "content": PARAM_EXTRACTION_SYSTEM_PROMPT}
-    ] + state["messages"])
+    # LLM 호출 - 전체 대화 대신 토큰 예산 안의 현재 요청 + 확정 파라미터 + 최근 대화
+    messages = build_param_messages(state)
+    started = time.perf_counter()
+    result = llm_param.invoke(messages)
+    router_stats.record_latency("param_llm", time.perf_counter() - started)
     
     print(f"파라미터 추출 결과: {result}")
+    return build_param_update(result)
+
+
+def build_param_update(result: ParamExtractionSchema) -> State:
+    """
+    파라미터 추출 결과 → 상태 업데이트 (param_tool과 라우팅+파라미터 통합 호출이 함께 사용)
+    - params_complete가 True면 바로 수집, 아니면 확인/질의 메시지와 함께 param_interrupt로
+    """
+    # 종목 정규화/검증 (다운로드 전에 잘못된 종목을 걸러냄)
+    tickers, unresolved = resolve_tickers(result.tickers)
+    if unresolved:
+        index = get_ticker_index()
+        response = "다음 종목을 찾지 못했습니다. 티커나 정확한 종목명을 알려주세요:\n"
+        for raw, candidates in unresolved.items():
+            hint = ", ".join(index.get(c).display_name for c in candidates)
+            response += f"• {raw}" + (f" (혹시: {hint})" if hint else "") + "\n"
+        print(f"❓ 확인 필요한 종목: {list(unresolved)}")
+        return {
+            "params_complete": False,
+            "chart_output": response,
+            "missing_params": ["tickers"],
+            "messages": [{"role": "assistant", "content": response}]
+        }
     
     # 파라미터 완성도 확인
     if result.is_complete:
         # 모든 파라미터가 있으면 사용자 확인 요청
         chart_params = {
-            "ticker": result.ticker,
+            "tickers": tickers,
             "period": result.period or "1y",
             "interval": result.interval or "1d",
             "chart_type": result.chart_type or "candlestick",
-            "indicators": result.indicators or ["MA", "Volume"]
+            "indicators": apply_window_params(result.indicators or ["MA", "Volume"], result.ma_windows, result.ema_windows)
         }
+        # 날짜 범위/봉 개수가 있으면 period 대신 사용
+        for key in ("start", "end", "bars"):
+            value = getattr(result, key, None)
+            if value:
+                chart_params[key] = value
+        try:
+            date_range = DateRange.from_params(chart_params)
+        except ValueError as e:
+            response = f"조회 범위를 확인해주세요: {str(e)}"
+            return {
+                "params_complete": False,
+                "chart_output": response,
+                "missing_params": ["period"],
+                "messages": [{"role": "assistant", "content": response}]
+            }
         
         print(f"✅ 파라미터 수집 완료: {chart_params}")
         
@@ -78,14 +208,17 @@ def param_tool(state: State, store: BaseStore) -> State:
                 "chart_params": chart_params,
                 "chart_output": "차트를 생성하겠습니다.",
                 "pending_params": {},  # 초기화
+                "correction_attempts": 0,  # 새 요청이므로 자동 보정 횟수 초기화
                 "messages": [{"role": "assistant", "content": "차트를 생성하겠습니다."}]
             }
         else:
             # 사용자 확인 요청
+            index = get_ticker_index()
+            display_names = [index.get(t).display_name if index.get(t) else t for t in tickers]
             confirmation_message = f"""
 차트 설정을 확인해주세요:
-• 종목: {chart_params['ticker']}
-• 기간: {chart_params['period']}
+• 종목: {', '.join(display_names)}
+• 기간: {date_range.label() if date_range else chart_params['period']}
 • 간격: {chart_params['interval']}
 • 차트 타입: {chart_params['chart_type']}
 • 지표: {', '.join(chart_params['indicators'])}
@@ -111,7 +244,7 @@ def param_tool(state: State, store: BaseStore) -> State:
         if "chart_type" in missing_params:
             response += "• 차트 타입을 선택해주세요: 캔들스틱(기본), 라인, 바, 영역\n"
         if "indicators" in missing_params:
-            response += "• 지표를 선택해주세요 (여러 개 선택 가능): 종가, 이동평균, RSI, MACD, 거래량, 볼린저밴드\n"
+            response += "• 지표를 선택해주세요 (여러 개 선택 가능): 종가, 이동평균, EMA, RSI, MACD, 거래량, 볼린저밴드, ATR, 스토캐스틱, VWAP, OBV\n"
         
         print(f"❓ 부족한 파라미터: {missing_params}")
         
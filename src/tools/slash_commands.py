@@ -0,0 +1,128 @@
+"""
+슬래시 명령: 편집 단계의 /edit, /export, /done을 LLM 없이 바로 편집 액션으로 변환
+- /edit add rsi              → 지표 추가 (/edit add ma 5,120 처럼 기간 지정 가능)
+- /edit remove ma            → 지표 제거
+- /edit type line            → 차트 타입 변경 (candle, candlestick, line, bar, area)
+- /edit ma 20,60             → 지표 기간 변경 (기존 같은 지표를 대체)
+- /edit add rsi; type line   → ';'로 이어 쓴 편집은 한 번에 적용
+- /export html|png|csv       → 현재 차트 내보내기
+- /done                      → 편집 완료
+- /help                      → 사용법
+자유 문장은 기존대로 LLM이 해석
+"""
+import re
+from dataclasses import dataclass
+from typing import Optional
+from ..schemas import EditAction, EditPlanSchema
+from ..indicators.registry import format_indicator_spec, parse_indicator_spec
+
+
+CHART_TYPE_ALIASES = {"candle": "candlestick", "candles": "candlestick", "candlestick": "candlestick", "캔들": "candlestick",
+                      "캔들스틱": "candlestick", "line": "line", "라인": "line", "bar": "bar", "바": "bar", "막대": "bar",
+                      "area": "area", "영역": "area"}
+EXPORT_FORMATS = ("html", "png", "csv")
+ADD_WORDS = {"add", "+", "추가"}
+REMOVE_WORDS = {"remove", "rm", "del", "delete", "-", "제거", "삭제"}
+TYPE_WORDS = {"type", "chart", "타입"}
+DONE_WORDS = {"/done", "/finish", "/exit", "/완료"}
+
+SLASH_HELP = """사용 가능한 명령:
+• /edit add rsi | /edit add ma 5,120
+• /edit remove ma
+• /edit type line (candle, line, bar, area)
+• /edit ma 20,60 (기간 변경)
+• /edit add rsi; add macd; type line (여러 편집을 한 번에)
+• /export html | png | csv
+• /done (편집 완료)"""
+
+
+@dataclass
+class SlashCommand:
+    """해석한 슬래시 명령 (kind: edit, export, done, help, invalid)"""
+    kind: str
+    edit: Optional[EditPlanSchema] = None
+    export_format: Optional[str] = None
+    message: str = ""
+
+
+def _indicator_spec(name: str, args: str = "") -> Optional[str]:
+    """'ma', '20,60' → 'MA(20,60)', 'rsi' → 'RSI', 'ma20' → 'MA(20)' (등록되지 않은 지표나 잘못된 기간이면 None)"""
+    indicator, params = parse_indicator_spec(name)
+    if indicator is None:
+        return None
+    numbers = re.findall(r"-?\d+(?:\.\d+)?", args)
+    if numbers:
+        indicator, params = parse_indicator_spec(f"{indicator.name}({','.join(numbers)})")
+        if indicator is None:
+            return None
+    return format_indicator_spec(indicator.name, params)
+
+
+def _edit(action: str, reasoning: str, **fields) -> SlashCommand:
+    plan = EditPlanSchema(reasoning=reasoning, actions=[EditAction(action=action, **fields)], is_edit_request=True)
+    return SlashCommand("edit", edit=plan)
+
+
+def _invalid(message: str) -> SlashCommand:
+    return SlashCommand("invalid", message=f"{message}\n\n{SLASH_HELP}")
+
+
+def parse_slash_command(text: str) -> Optional[SlashCommand]:
+    """슬래시 명령 해석 (슬래시로 시작하지 않으면 None)"""
+    text = str(text).strip()
+    if not text.startswith("/"):
+        return None
+    parts = text.split(None, 1)
+    command = parts[0].lower()
+    rest = parts[1].strip() if len(parts) > 1 else ""
+
+    if command in DONE_WORDS:
+        return SlashCommand("done")
+    if command in ("/help", "/?", "/도움말"):
+        return SlashCommand("help", message=SLASH_HELP)
+
+    if command == "/export":
+        export_format = rest.lower().lstrip(".")
+        if export_format not in EXPORT_FORMATS:
+            return _invalid(f"내보내기 형식을 확인해주세요: {rest or '(없음)'}")
+        return SlashCommand("export", export_format=export_format)
+
+    if command != "/edit":
+        return _invalid(f"알 수 없는 명령입니다: {command}")
+    if ";" in rest:
+        # /edit add rsi; add macd; type line → 한 번에 적용하는 편집 계획
+        commands = [parse_slash_command("/edit " + re.sub(r"^/edit\s*", "", part.strip(), flags=re.IGNORECASE))
+                    for part in rest.split(";") if part.strip()]
+        invalid = next((c for c in commands if c.kind != "edit"), None)
+        if invalid is not None:
+            return invalid
+        actions = [action for c in commands for action in c.edit.actions]
+        return SlashCommand("edit", edit=EditPlanSchema(reasoning=f"slash: {text}", actions=actions, is_edit_request=True))
+
+    words = rest.split(None, 1)
+    if not words:
+        return _invalid("편집 내용을 입력해주세요.")
+    verb = words[0].lower()
+    args = words[1].strip() if len(words) > 1 else ""
+
+    if verb in TYPE_WORDS:
+        chart_type = CHART_TYPE_ALIASES.get(args.lower())
+        if chart_type is None:
+            return _invalid(f"지원하지 않는 차트 타입입니다: {args or '(없음)'}")
+        return _edit("change_chart_type", f"slash: {text}", chart_type=chart_type)
+
+    if verb in ADD_WORDS or verb in REMOVE_WORDS:
+        name_args = args.split(None, 1)
+        if not name_args:
+            return _invalid("지표 이름을 입력해주세요.")
+        spec = _indicator_spec(name_args[0], name_args[1] if len(name_args) > 1 else "")
+        if spec is None:
+            return _invalid(f"지원하지 않는 지표입니다: {' '.join(name_args)}")
+        action = "add_indicator" if verb in ADD_WORDS else "remove_indicator"
+        return _edit(action, f"slash: {text}", indicator=spec)
+
+    # /edit ma 20,60 → 같은 지표를 새 기간으로 대체
+    spec = _indicator_spec(verb, args)
+    if spec is not None and re.search(r"\d", args):
+        return _edit("set_indicator", f"slash: {text}", indicator=spec)
+    return _invalid(f"알 수 없는 편집 명령입니다: {rest}")
@@ -5,11 +5,63 @@ import plotly.graph_objects as go
 import plotly.subplots as sp
 from plotly.offline import plot
 import pandas as pd
+import numpy as np
 import os
+import re
 from datetime import datetime
 from typing import Dict, Any
-from langchain.chat_models import init_chat_model
 from ..schemas import State
+from ..data.columnar import columns_to_frame, plot_columns
+from ..indicators.registry import indicator_name
+from .chart_description import describe_chart
+
+
+# 이동평균선 색상 (기간이 짧은 선부터 순서대로)
+MA_COLORS = ['orange', 'purple', 'green', 'brown', 'magenta', 'olive']
+EMA_COLORS = ['teal', 'darkgoldenrod', 'slateblue', 'crimson']
+
+# 가격 위에 겹쳐 그리는 추가 지표 (키, 이름, 색상)
+PRICE_OVERLAYS = [
+    ('vwap', 'VWAP', 'black'),
+]
+
+
+def moving_average_keys(data: dict, prefix: str) -> list:
+    """data에 있는 이동평균 키를 기간순으로 반환 (prefix='ma' → ['ma5', 'ma20', ...])"""
+    pattern = re.compile(rf'^{prefix}(\d+)$')
+    keys = [key for key in data if pattern.match(key)]
+    return sorted(keys, key=lambda key: int(pattern.match(key).group(1)))
+
+
+def add_moving_averages(fig: go.Figure, data: dict, **position):
+    """MA/EMA 선을 기간 수에 관계없이 추가 (position: 서브플롯 row/col)"""
+    for i, key in enumerate(moving_average_keys(data, 'ma')):
+        fig.add_trace(go.Scatter(
+            x=data['dates'],
+            y=data[key],
+            name=key.upper(),
+            line=dict(color=MA_COLORS[i % len(MA_COLORS)], width=2)
+        ), **position)
+    
+    for i, key in enumerate(moving_average_keys(data, 'ema')):
+        fig.add_trace(go.Scatter(
+            x=data['dates'],
+            y=data[key],
+            name=key.upper(),
+            line=dict(color=EMA_COLORS[i % len(EMA_COLORS)], width=1.5, dash='dot')
+        ), **position)
+
+
+def add_price_overlays(fig: go.Figure, data: dict, **position):
+    """VWAP 등 가격 오버레이 지표 추가 (position: 서브플롯 row/col)"""
+    for key, name, color in PRICE_OVERLAYS:
+        if key in data:
+            fig.add_trace(go.Scatter(
+                x=data['dates'],
+                y=data[key],
+                name=name,
+                line=dict(color=color, width=1.5, dash='dot')
+            ), **position)
 
 
 def create_candlestick_chart(data: dict, ticker: str, indicators: list) -> go.Figure:
@@ -29,21 +81,7 @@ def create_candlestick_chart(data: dict, ticker: str, indicators: list) -> go.Fi
     ))
     
     # 이동평균선 추가
-    if 'ma20' in data:
-        fig.add_trace(go.Scatter(
-            x=data['dates'],
-            y=data['ma20'],
-            name='MA20',
-            line=dict(color='orange', width=2)
-        ))
-    
-    if 'ma50' in data:
-        fig.add_trace(go.Scatter(
-            x=data['dates'],
-            y=data['ma50'],
-            name='MA50',
-            line=dict(color='purple', width=2)
-        ))
+    add_moving_averages(fig, data)
     
     # 볼린저 밴드 추가
     if 'bb_upper' in data:
@@ -64,6 +102,8 @@ def create_candlestick_chart(data: dict, ticker: str, indicators: list) -> go.Fi
             showlegend=False
         ))
     
+    add_price_overlays(fig, data)
+    
     fig.update_layout(
         title=f'{ticker} 주식 차트',
         xaxis_title='날짜',
@@ -87,21 +127,9 @@ def create_line_chart(data: dict, ticker: str, indicators: list) -> go.Figure:
     ))
     
     # 이동평균선 추가
-    if 'ma20' in data:
-        fig.add_trace(go.Scatter(
-            x=data['dates'],
-            y=data['ma20'],
-            name='MA20',
-            line=dict(color='orange', width=2)
-        ))
+    add_moving_averages(fig, data)
     
-    if 'ma50' in data:
-        fig.add_trace(go.Scatter(
-            x=data['dates'],
-            y=data['ma50'],
-            name='MA50',
-            line=dict(color='purple', width=2)
-        ))
+    add_price_overlays(fig, data)
     
     fig.update_layout(
         title=f'{ticker} 주식 차트 (라인)',
@@ -127,6 +155,18 @@ def create_subplot_chart(data: dict, ticker: str, indicators: list) -> go.Figure
         subplot_count += 1
         subplot_titles.append('MACD')
     
+    if 'stoch_k' in data:
+        subplot_count += 1
+        subplot_titles.append('Stochastic')
+    
+    if 'atr' in data:
+        subplot_count += 1
+        subplot_titles.append('ATR')
+    
+    if 'obv' in data:
+        subplot_count += 1
+        subplot_titles.append('OBV')
+    
     if 'volume' in data or 'Volume' in indicators or '거래량' in indicators:
         subplot_count += 1
         subplot_titles.append('거래량')
@@ -154,13 +194,9 @@ def create_subplot_chart(data: dict, ticker: str, indicators: list) -> go.Figure
     ), row=1, col=1)
     
     # 이동평균선
-    if 'ma20' in data:
-        fig.add_trace(go.Scatter(
-            x=data['dates'],
-            y=data['ma20'],
-            name='MA20',
-            line=dict(color='orange', width=2)
-        ), row=1, col=1)
+    add_moving_averages(fig, data, row=1, col=1)
+    
+    add_price_overlays(fig, data, row=1, col=1)
     
     # 서브플롯 행 번호 추적
     current_row = 2
@@ -197,6 +233,46 @@ def create_subplot_chart(data: dict, ticker: str, indicators: list) -> go.Figure
             ), row=current_row, col=1)
         current_row += 1
     
+    # 스토캐스틱 서브플롯
+    if 'stoch_k' in data:
+        fig.add_trace(go.Scatter(
+            x=data['dates'],
+            y=data['stoch_k'],
+            name='%K',
+            line=dict(color='darkcyan', width=2)
+        ), row=current_row, col=1)
+        fig.add_trace(go.Scatter(
+            x=data['dates'],
+            y=data['stoch_d'],
+            name='%D',
+            line=dict(color='orange', width=1.5)
+        ), row=current_row, col=1)
+        
+        # 과매수/과매도 80, 20 라인
+        fig.add_hline(y=80, line_dash="dash", line_color="red", row=current_row, col=1)
+        fig.add_hline(y=20, line_dash="dash", line_color="green", row=current_row, col=1)
+        current_row += 1
+    
+    # ATR 서브플롯
+    if 'atr' in data:
+        fig.add_trace(go.Scatter(
+            x=data['dates'],
+            y=data['atr'],
+            name='ATR',
+            line=dict(color='sienna', width=2)
+        ), row=current_row, col=1)
+        current_row += 1
+    
+    # OBV 서브플롯
+    if 'obv' in data:
+        fig.add_trace(go.Scatter(
+            x=data['dates'],
+            y=data['obv'],
+            name='OBV',
+            line=dict(color='seagreen', width=2)
+        ), row=current_row, col=1)
+        current_row += 1
+    
     # 거래량 서브플롯
     if 'volume' in data:
         fig.add_trace(go.Bar(
@@ -215,6 +291,93 @@ def create_subplot_chart(data: dict, ticker: str, indicators: list) -> go.Figure
     return fig
 
 
+def create_comparison_chart(data: dict, ticker: str, compare: dict) -> go.Figure:
+    """여러 종목 비교 차트 생성 (첫 종가 대비 수익률 %)"""
+    fig = go.Figure()
+    
+    for name, series in [(ticker, data)] + list(compare.items()):
+        closes = np.asarray(series['close'], dtype=np.float64)
+        if len(closes) == 0:
+            continue
+        fig.add_trace(go.Scatter(
+            x=series['dates'],
+            y=(closes / closes[0] - 1) * 100,
+            name=name,
+            line=dict(width=2)
+        ))
+    
+    fig.add_hline(y=0, line_dash="dot", line_color="gray")
+    fig.update_layout(
+        title=f"{', '.join([ticker] + list(compare))} 수익률 비교",
+        xaxis_title='날짜',
+        yaxis_title='수익률 (%)',
+        template='plotly_white'
+    )
+    
+    return fig
+
+
+def build_figure(chart_data: dict) -> go.Figure:
+    """chart_data → plotly Figure (차트 타입/지표/비교 종목에 맞는 형태)"""
+    ticker = chart_data.get("ticker", "Unknown")
+    chart_type = chart_data.get("chart_type", "candlestick")
+    indicators = chart_data.get("indicators", [])
+    data = plot_columns(chart_data.get("data", {}))
+    compare = {t: plot_columns(series) for t, series in chart_data.get("compare", {}).items()}
+
+    # 여러 종목이면 수익률 비교 차트 사용
+    if compare:
+        return create_comparison_chart(data, ticker, compare)
+    # 기술적 지표가 있으면 서브플롯 차트 사용
+    if any(indicator_name(ind) in ['RSI', 'MACD', 'Stochastic', 'ATR', 'OBV', 'Volume'] for ind in indicators):
+        return create_subplot_chart(data, ticker, indicators)
+    # 차트 타입별 생성
+    if chart_type == "line":
+        return create_line_chart(data, ticker, indicators)
+    # 기본은 캔들스틱
+    return create_candlestick_chart(data, ticker, indicators)
+
+
+def chart_filepath(tickers: list, extension: str = "html") -> str:
+    """charts/chart_{종목}_{시각}.{확장자}"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    os.makedirs("charts", exist_ok=True)
+    return os.path.join("charts", f"chart_{'-'.join(tickers)}_{timestamp}.{extension}")
+
+
+def export_chart(chart_data: dict, export_format: str, chart_file: str = "") -> str:
+    """
+    현재 차트 내보내기 → 저장한 파일 경로
+    - html: 이미 렌더링한 파일이 있으면 그대로, 없으면 새로 저장
+    - png: plotly 정적 이미지 (kaleido 필요)
+    - csv: 시세 + 지표 컬럼 (비교 종목은 종목별 종가 컬럼 추가)
+    """
+    tickers = chart_data.get("tickers", [chart_data.get("ticker", "chart")])
+    if export_format == "html":
+        if chart_file and os.path.exists(chart_file):
+            return chart_file
+        filepath = chart_filepath(tickers, "html")
+        plot(build_figure(chart_data), filename=filepath, auto_open=False)
+        return filepath
+    if export_format == "png":
+        filepath = chart_filepath(tickers, "png")
+        try:
+            build_figure(chart_data).write_image(filepath, width=1400, height=900)
+        except (ValueError, ImportError, RuntimeError) as e:
+            raise RuntimeError(f"PNG 저장에는 kaleido 패키지가 필요합니다 (pip install kaleido): {str(e)}")
+        return filepath
+    if export_format == "csv":
+        filepath = chart_filepath(tickers, "csv")
+        frame = columns_to_frame(chart_data.get("data", {}))
+        for compare_ticker, series in chart_data.get("compare", {}).items():
+            compare_frame = columns_to_frame(series)
+            if "Close" in compare_frame:
+                frame[f"{compare_ticker}_Close"] = compare_frame["Close"].reindex(frame.index)
+        frame.to_csv(filepath, index_label="Date")
+        return filepath
+    raise ValueError(f"지원하지 않는 내보내기 형식: {export_format}")
+
+
 def visualization_node(state: State) -> State:
     """
     Visualization Node: HTML 또는 이미지로 차트 렌더링
@@ -234,61 +397,23 @@ def visualization_node(state: State) -> State:
         
         ticker = chart_data.get("ticker", "Unknown")
         chart_type = chart_data.get("chart_type", "candlestick")
+        tickers = chart_data.get("tickers", [ticker])
         indicators = chart_data.get("indicators", [])
-        data = chart_data.get("data", {})
-        
-        print(f"📊 차트 생성: {ticker}, {chart_type}, {indicators}")
-        
-        # 차트 타입별 생성
-        if chart_type == "candlestick":
-            fig = create_candlestick_chart(data, ticker, indicators)
-        elif chart_type == "line":
-            fig = create_line_chart(data, ticker, indicators)
-        else:
-            # 기본은 캔들스틱
-            fig = create_candlestick_chart(data, ticker, indicators)
-        
-        # 기술적 지표가 있으면 서브플롯 차트 사용
-        if any(ind in ['RSI', 'MACD', 'Volume', '거래량'] for ind in indicators):
-            fig = create_subplot_chart(data, ticker, indicators)
-        
-        # 차트 파일 저장
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"chart_{ticker}_{timestamp}.html"
-        filepath = os.path.join("charts", filename)
         
-        # charts 디렉토리 생성
-        os.makedirs("charts", exist_ok=True)
+        print(f"📊 차트 생성: {', '.join(tickers)}, {chart_type}, {indicators}")
+        fig = build_figure(chart_data)
         
-        # HTML 파일로 저장
+        # 차트 파일 저장 (charts 디렉토리, HTML)
+        filepath = chart_filepath(tickers, "html")
         plot(fig, filename=filepath, auto_open=False)
         
         print(f"✅ 차트 생성 완료: {filepath}")
         
-        # LLM을 사용하여 차트 설명 생성
-        period = chart_data.get("period", "알 수 없음")
-        interval = chart_data.get("interval", "알 수 없음")
-        
-        llm = init_chat_model("openai:gpt-4o", temperature=0.0)
-        description_prompt = f"""
-다음 정보를 바탕으로 생성된 차트를 간단하고 자연스럽게 설명해주세요 (2-3줄):
-
-• 종목: {ticker}
-• 기간: {period}
-• 간격: {interval}
-• 차트 타입: {chart_type}
-• 지표: {', '.join(indicators) if indicators else '없음'}
-
-예시: "애플(AAPL) 주식의 1년간 일봉 차트를 캔들스틱으로 생성했습니다. RSI와 MACD 지표를 포함하여 기술적 분석이 가능합니다."
-"""
-        
-        description_result = llm.invoke([
-            {"role": "user", "content": description_prompt}
-        ])
-        chart_description = description_result.content
+        # 차트 설명 (기본은 템플릿, CHART_DESCRIPTION_MODE로 LLM/지연 LLM 선택)
+        chart_description = describe_chart(chart_data, filepath)
         
         return {
-            "chart_output": f"{chart_description}\n\n파일: {filepath}\n\n추가로 편집하고 싶으시면 말씀해주세요:\n• 지표 추가/제거 (RSI, MACD, 이동평균, 볼린저밴드)\n• 차트 타입 변경 (캔들스틱, 라인, 바, 영역)\n• 스타일 변경 (색상, 크기 등)",
+            "chart_output": f"{chart_description}\n\n파일: {filepath}\n\n추가로 편집하고 싶으시면 말씀해주세요:\n• 지표 추가/제거 (RSI, MACD, 이동평균, EMA, 볼린저밴드, ATR, 스토캐스틱, VWAP, OBV)\n• 차트 타입 변경 (캔들스틱, 라인, 바, 영역)\n• 스타일 변경 (색상, 크기 등)\n• 바로 실행: /edit add rsi | /edit type line | /export html | /done",
             "chart_file": filepath,
             "enhancement_mode": True  # 편집 모드 활성화
         }
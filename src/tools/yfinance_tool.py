@@ -1,99 +1,394 @@
 """
 yfinance Tool: 주식 데이터 수집 및 유효성 검증
 """
-import yfinance as yf
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple
 from ..schemas import State
+from .. import config
+from ..data.cache import OHLCVCache, get_default_cache, merge_ohlcv, OHLCV_COLUMNS
+from ..data.periods import period_start, interval_to_timedelta, is_intraday, period_covering, DateRange, slice_range
+from ..data.columnar import frame_to_columns
+from ..data.providers import get_provider, SymbolNotFoundError
+from ..data.singleflight import SingleFlight
+from ..data.negative_cache import NegativeCache
+from ..data.mmap_store import get_default_store, uses_mmap_store
+from ..data.resilience import CircuitOpenError
+from ..data.resample import YFINANCE_INTERVALS, LOCAL_INTERVALS, resample_sources, resample_ohlcv
+from ..indicators.registry import compute_indicators
+from ..indicators.incremental import advance_indicators
+
+
+# 프로세스 공용 시세 수집 합류기 (stats()로 합류 횟수 확인)
+fetch_flights = SingleFlight("fetch_history")
+
+# 프로세스 공용 실패 조회 캐시: (티커, 기간, 간격) → 오류 (stats()로 적중 횟수 확인)
+failed_lookups = NegativeCache(config.NEGATIVE_CACHE_TTL_SECONDS, config.NEGATIVE_CACHE_MAX_ENTRIES)
+
+# 오류 종류별 실패 기억 시간 (요청 제한은 회로 차단기가 따로 관리하므로 기억하지 않음)
+# 빈 응답은 일시적 요청 제한/네트워크 문제일 수 있어 짧게, 종목이 없다고 확인된 경우만 길게
+NEGATIVE_TTL_BY_ERROR = {
+    "not_found": config.NEGATIVE_CACHE_TTL_SECONDS,
+    "no_data": config.NEGATIVE_CACHE_EMPTY_TTL_SECONDS,
+    "download_error": config.NEGATIVE_CACHE_ERROR_TTL_SECONDS,
+}
+
+# 기간별 허용 간격 (yfinance 제약, 4h는 1h 봉을 내려받아 로컬에서 리샘플링)
+PERIOD_INTERVAL_RESTRICTIONS = {
+    "1d": ["1m", "2m", "5m", "15m", "30m", "60m", "90m"],
+    "5d": ["1m", "2m", "5m", "15m", "30m", "60m", "90m"],
+    "1mo": ["2m", "5m", "15m", "30m", "60m", "90m", "1h", "4h"],
+    "3mo": ["1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "4h"],
+    "6mo": ["1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "4h"],
+    "1y": ["1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "4h", "1d"],
+    "2y": ["1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "4h", "1d"],
+    "5y": ["1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "4h", "1d"],
+    "10y": ["1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "4h", "1d"],
+    "ytd": ["1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "4h", "1d"],
+    "max": ["1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "4h", "1d", "5d", "1wk", "1mo", "3mo"]
+}
 
 
 def calculate_technical_indicators(data: pd.DataFrame, indicators: list) -> pd.DataFrame:
-    """기술적 지표 계산"""
-    df = data.copy()
-    
-    for indicator in indicators:
-        if indicator == "MA" or indicator == "이동평균":
-            # 20일, 50일 이동평균
-            df["MA20"] = df["Close"].rolling(window=20).mean()
-            df["MA50"] = df["Close"].rolling(window=50).mean()
-            
-        elif indicator == "RSI":
-            # RSI 계산
-            delta = df["Close"].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            df["RSI"] = 100 - (100 / (1 + rs))
-            
-        elif indicator == "MACD":
-            # MACD 계산
-            exp1 = df["Close"].ewm(span=12).mean()
-            exp2 = df["Close"].ewm(span=26).mean()
-            df["MACD"] = exp1 - exp2
-            df["MACD_Signal"] = df["MACD"].ewm(span=9).mean()
-            df["MACD_Histogram"] = df["MACD"] - df["MACD_Signal"]
-            
-        elif indicator == "Bollinger" or indicator == "볼린저밴드":
-            # 볼린저 밴드 계산
-            df["BB_Middle"] = df["Close"].rolling(window=20).mean()
-            bb_std = df["Close"].rolling(window=20).std()
-            df["BB_Upper"] = df["BB_Middle"] + (bb_std * 2)
-            df["BB_Lower"] = df["BB_Middle"] - (bb_std * 2)
-            
-        elif indicator == "price" or indicator == "종가":
-            # 종가는 기본 데이터에 이미 포함되어 있음 (Close)
-            # 별도 계산 불필요, 기본 데이터에서 사용
-            pass
-            
-        elif indicator == "Volume" or indicator == "거래량":
-            # 거래량은 기본 데이터에 이미 포함되어 있음
-            # 별도 계산 불필요, 기본 데이터에서 사용
-            pass
-    
-    return df
+    """기술적 지표 계산 (지표 레지스트리의 NumPy 커널 사용)"""
+    return compute_indicators(data, indicators)
 
 
 def validate_period_interval(period: str, interval: str) -> bool:
     """기간과 간격의 유효성 검증"""
-    # yfinance 제약사항 검증
-    period_interval_restrictions = {
-        "1d": ["1m", "2m", "5m", "15m", "30m", "60m", "90m"],
-        "5d": ["1m", "2m", "5m", "15m", "30m", "60m", "90m"],
-        "1mo": ["2m", "5m", "15m", "30m", "60m", "90m", "1h"],
-        "3mo": ["1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h"],
-        "6mo": ["1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h"],
-        "1y": ["1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "1d"],
-        "2y": ["1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "1d"],
-        "5y": ["1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "1d"],
-        "10y": ["1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "1d"],
-        "ytd": ["1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "1d"],
-        "max": ["1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "1d", "5d", "1wk", "1mo", "3mo"]
-    }
-    
-    return interval in period_interval_restrictions.get(period, [])
+    return interval in PERIOD_INTERVAL_RESTRICTIONS.get(period, [])
+
+
+def lookup_key(ticker: str, period: str, interval: str, date_range: Optional[DateRange] = None) -> tuple:
+    """실패 조회 캐시 키"""
+    return (ticker.upper(), period, interval, date_range)
+
+
+def flight_key(ticker: str, period: str, interval: str, cache: OHLCVCache,
+               date_range: Optional[DateRange] = None) -> tuple:
+    """합류 키: 같은 조회라도 다른 캐시(디렉터리)를 쓰는 호출은 합류하지 않음 (각자 자기 캐시에 저장)"""
+    return lookup_key(ticker, period, interval, date_range) + (os.path.abspath(cache.cache_dir),)
+
+
+def _cache_covers(meta: Optional[Dict[str, Any]], required_start: Optional[pd.Timestamp]) -> bool:
+    """캐시 항목이 required_start 이후 전체를 덮는지 여부"""
+    if meta is None:
+        return False
+    covered_from = pd.Timestamp(meta["covered_from"]) if meta.get("covered_from") else None
+    return covered_from is None or (required_start is not None and covered_from <= required_start)
+
+
+def _resample_source(cache: OHLCVCache, ticker: str, interval: str, required_start: Optional[pd.Timestamp]) -> Optional[str]:
+    """
+    interval 봉을 로컬에서 만들 원본 간격 선택
+    - 요청 간격의 캐시가 기간을 덮으면 None (그대로 사용)
+    - 기간을 덮는 더 짧은 일봉 미만 간격의 캐시가 있으면 그 간격 (네트워크 생략, 일봉 이상은 항상 직접 수집)
+    - yfinance가 제공하지 않는 간격(4h 등)은 지정된 원본 간격
+    """
+    if interval in YFINANCE_INTERVALS and _cache_covers(cache.get_meta(ticker, interval), required_start):
+        return None
+    for source in resample_sources(interval):
+        if _cache_covers(cache.get_meta(ticker, source), required_start):
+            return source
+    return LOCAL_INTERVALS.get(interval)
+
+
+def fetch_history(ticker: str, period: str, interval: str, cache: Optional[OHLCVCache] = None,
+                  date_range: Optional[DateRange] = None) -> pd.DataFrame:
+    """
+    시세 수집 (같은 (티커, 기간, 간격, 범위, 캐시)의 동시 요청은 한 번만 수집하고 결과를 공유)
+    - date_range가 있으면 period 대신 명시적 시작/종료/최근 N개 봉 범위로 조회
+    - 공유되는 DataFrame은 수정하지 말고 새 DataFrame을 만들어 사용
+    """
+    cache = cache or get_default_cache()
+    key = flight_key(ticker, period, interval, cache, date_range)
+    return fetch_flights.do(key, lambda: _fetch_history(ticker, period, interval, cache, date_range))
+
+
+async def fetch_history_async(ticker: str, period: str, interval: str, cache: Optional[OHLCVCache] = None,
+                              date_range: Optional[DateRange] = None) -> pd.DataFrame:
+    """
+    asyncio 버전: 같은 루프의 동시 요청은 한 번의 수집에 합류, 수집은 스레드에서 실행
+    - 스레드에서는 _fetch_history를 바로 호출 (fetch_history를 거치면 같은 요청이 합류 집계에 두 번 잡힘)
+    """
+    cache = cache or get_default_cache()
+    key = flight_key(ticker, period, interval, cache, date_range)
+    return await fetch_flights.do_async(
+        key, lambda: asyncio.to_thread(_fetch_history, ticker, period, interval, cache, date_range))
+
+
+def _fetch_history(ticker: str, period: str, interval: str, cache: Optional[OHLCVCache] = None,
+                   date_range: Optional[DateRange] = None) -> pd.DataFrame:
+    """
+    캐시를 거쳐 시세 수집
+    - 캐시가 요청 기간을 덮고 있으면 마지막 봉 이후만 내려받아 병합 (증분 갱신)
+    - 방금 갱신된 캐시는 네트워크 없이 그대로 사용
+    - 더 짧은 간격의 캐시가 기간을 덮으면 내려받지 않고 로컬에서 리샘플링 (일봉 미만끼리만, 4h 등 yfinance 미지원 간격 포함)
+    - 캐시가 없거나 기간이 부족하면 전체 기간을 내려받아 캐시에 저장
+    - 범위 조회(date_range)는 캐시의 정렬된 시각 인덱스를 이진 탐색해 잘라냄 (모자란 앞/뒤 구간만 수집)
+    """
+    cache = cache or get_default_cache()
+    now = pd.Timestamp.now(tz="UTC")
+    if date_range is None:
+        return _fetch_span(ticker, period, interval, cache, period_start(period, now))
+
+    # 최근 N개 봉은 필요한 시작 시점을 추정해서 조회, 봉이 모자라면 더 앞에서부터 다시 조회
+    for factor in (1, 2, 4, 8):
+        required_start = date_range.lookback_start(interval, now, factor)
+        data = _fetch_span(ticker, None, interval, cache, required_start, date_range.fetch_end())
+        sliced = slice_range(data, date_range)
+        if date_range.start is not None or not date_range.bars or len(sliced) >= date_range.bars or data.empty:
+            break
+        # 상장 전까지 거슬러 올라갔으면 더 찾을 봉이 없음
+        if len(data) and data.index[0] > required_start + interval_to_timedelta(interval) * date_range.bars:
+            break
+    return sliced
+
+
+def _fetch_span(ticker: str, period: Optional[str], interval: str, cache: OHLCVCache,
+                required_start: Optional[pd.Timestamp], end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """required_start 이후 시세 (period가 None이면 시작 시점 기준으로 수집)"""
+    source = _resample_source(cache, ticker, interval, required_start)
+    if source is not None:
+        print(f"🧮 로컬 리샘플링: {ticker} {source} → {interval}")
+        # 구간 경계가 잘리지 않도록 기간으로 자르기 전의 원본 전체를 집계한 뒤 자름 (시작이 잘린 구간은 제외)
+        fine = _load_or_download(ticker, period, source, cache, required_start, end)
+        data = resample_ohlcv(fine.dropna(subset=["Close"]), interval)
+    else:
+        data = _load_or_download(ticker, period, interval, cache, required_start, end)
+
+    # 잘못된 티커 등으로 빈 결과면 인덱스가 날짜가 아닐 수 있으므로 자르지 않음
+    if required_start is not None and not data.empty:
+        data = slice_range(data, DateRange(start=required_start))
+    return data
+
+
+def _load_or_download(ticker: str, period: Optional[str], interval: str, cache: OHLCVCache,
+                      required_start: Optional[pd.Timestamp], end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """
+    캐시 적중/증분 갱신/전체 수집 중 하나로 interval 시세 전체를 반환 (기간으로 자르지 않음)
+    - 캐시가 required_start보다 늦게 시작하면 모자란 앞 구간만 받아 이어 붙임
+    - end가 캐시의 마지막 봉 이전이면 (과거 범위 조회) 갱신 없이 캐시 사용
+    """
+    meta = cache.get_meta(ticker, interval)
+    cached = None
+    covered_from = None
+    if _cache_covers(meta, required_start):
+        covered_from = pd.Timestamp(meta["covered_from"]) if meta.get("covered_from") else None
+        cached = cache.load(ticker, interval)
+    elif meta is not None and required_start is not None:
+        cached = _extend_left(ticker, interval, cache, meta, required_start)
+        covered_from = required_start
+
+    if cached is not None and not cached.empty:
+        fresh_seconds = min(config.CACHE_FRESH_SECONDS, interval_to_timedelta(interval).total_seconds())
+        if end is not None and cached.index[-1] >= end:
+            print(f"⚡ 캐시 범위 적중: {ticker} {interval} (네트워크 생략)")
+            data = cached
+        elif time.time() - meta["fetched_at"] < fresh_seconds:
+            print(f"⚡ 캐시 적중: {ticker} {interval} (네트워크 생략)")
+            data = cached
+        else:
+            # 마지막 봉은 아직 진행 중일 수 있으므로 마지막 봉부터 다시 받아 덮어씀
+            last_ts = cached.index[-1]
+            try:
+                new_data = get_provider().history(ticker, interval, start=last_ts)
+                if new_data.empty:
+                    # 마지막 봉부터 받으면 최소 그 봉은 돌아와야 함 → 빈 응답은 실패로 보고 수집 시각을 갱신하지 않음
+                    print(f"⚠️  증분 갱신 빈 응답, 캐시된 시세 사용 (다음 요청에서 다시 갱신): {ticker} {interval}")
+                    data = cached
+                else:
+                    data = merge_ohlcv(cached, new_data[OHLCV_COLUMNS])
+                    print(f"⚡ 캐시 증분 갱신: {ticker} {interval} (+{len(new_data)}개)")
+                    cache.save(ticker, interval, data, covered_from)
+            except CircuitOpenError as e:
+                # 시세 서버가 차단 중이면 갱신 없이 캐시된 시세로 응답
+                print(f"⚠️  {str(e)} 캐시된 시세를 사용합니다: {ticker} {interval}")
+                data = cached
+            except Exception as e:
+                # 증분 구간이 yfinance 조회 한도를 넘는 등의 경우 전체 재수집
+                print(f"⚠️  증분 갱신 실패, 전체 재수집: {str(e)}")
+                cached = None
+
+    if cached is None or cached.empty:
+        if period is None:
+            # 범위 조회: 시작 시점부터 현재까지 받아 캐시가 끊김 없이 이어지게 함
+            data = get_provider().history(ticker, interval, start=required_start) if required_start is not None \
+                else get_provider().history(ticker, interval, period="max")
+        else:
+            data = get_provider().history(ticker, interval, period=period)
+        if data.empty:
+            return data
+        data = data[OHLCV_COLUMNS]
+        cache.save(ticker, interval, data, required_start)
+    return data
+
+
+def _extend_left(ticker: str, interval: str, cache: OHLCVCache, meta: Dict[str, Any],
+                 required_start: pd.Timestamp) -> Optional[pd.DataFrame]:
+    """캐시보다 앞선 구간 [required_start, covered_from)만 받아 캐시 앞에 이어 붙임 (실패하거나 빈 응답이면 None → 전체 수집)"""
+    cached = cache.load(ticker, interval)
+    if cached is None or cached.empty or not meta.get("covered_from"):
+        return None
+    covered_from = pd.Timestamp(meta["covered_from"])
+    try:
+        left = get_provider().history(ticker, interval, start=required_start, end=covered_from)
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        # 조회 한도를 넘는 구간 등
+        print(f"⚠️  앞 구간 수집 실패, 전체 재수집: {str(e)}")
+        return None
+    if left.empty:
+        # 실패한 수집일 수 있으므로 앞 구간을 덮었다고 기록하지 않고 전체 재수집
+        print(f"⚠️  앞 구간 빈 응답, 전체 재수집: {ticker} {interval}")
+        return None
+    merged = merge_ohlcv(left[OHLCV_COLUMNS], cached)
+    print(f"⬅️  앞 구간만 수집: {ticker} {interval} {required_start:%Y-%m-%d}~{covered_from:%Y-%m-%d} (+{len(left)}개)")
+    # 뒤쪽은 받지 않았으므로 기존 수집 시각을 유지 (갱신 여부는 호출한 쪽이 그 시각으로 판단)
+    cache.save(ticker, interval, merged, required_start, fetched_at=meta["fetched_at"])
+    return merged
+
+
+def poll_new_bars(ticker: str, period: str, interval: str, indicators: list,
+                  cache: Optional[OHLCVCache] = None) -> pd.DataFrame:
+    """
+    폴링/실시간 갱신용: 캐시를 증분 갱신하고, 새 봉의 시세와 지표만 반환
+    - 지표는 캐시 옆에 저장된 증분 상태로 새 봉만큼만 계산 (전체 이력 재계산 없음)
+    - 마지막 봉은 진행 중일 수 있어 다음 호출에서 다시 반환될 수 있음
+    """
+    cache = cache or get_default_cache()
+    data = fetch_history(ticker, period, interval, cache=cache).dropna()
+    if data.empty:
+        return data
+    new_values = advance_indicators(cache, ticker, interval, indicators, data)
+    if new_values.empty:
+        return data.iloc[:0]
+    return pd.concat([data.loc[new_values.index], new_values], axis=1)
+
+
+def store_matches_frame(columns: dict, data: pd.DataFrame) -> bool:
+    """저장소 슬라이스의 시각과 OHLCV 값이 DataFrame과 같은지 (지표는 DataFrame 기준으로 계산되므로)"""
+    if len(columns["dates"]) != len(data):
+        return False
+    if not np.array_equal(columns["dates"], pd.DatetimeIndex(data.index).as_unit("ns").asi8):
+        return False
+    for key in ("open", "high", "low", "close"):
+        if not np.array_equal(columns[key], data[key.capitalize()].to_numpy(dtype=np.float64), equal_nan=True):
+            return False
+    return np.array_equal(columns["volume"], np.rint(data["Volume"].to_numpy(dtype=np.float64)).astype(np.int64))
+
+
+def series_columns(ticker: str, interval: str, data: pd.DataFrame) -> dict:
+    """
+    chart_data 컬럼 dict 생성
+    - 분봉(CHART_MMAP_INTERVALS)은 메모리 맵 저장소에 이어 붙인 뒤 그 위의 복사 없는 슬라이스를 사용
+      (지표 컬럼만 새 배열) → 긴 이력도 프로세스마다 사본을 두지 않음
+    - 그 밖의 간격은 DataFrame 배열을 그대로 사용
+    """
+    if not uses_mmap_store(interval) or data.empty:
+        return frame_to_columns(data)
+    store = get_default_store()
+    try:
+        store.append(ticker, interval, data)
+        columns = store.read(ticker, interval, start=data.index[0], end=data.index[-1] + pd.Timedelta(1, "ns"))
+    except OSError as e:
+        print(f"⚠️  시계열 저장소 사용 실패 ({ticker} {interval}): {str(e)}")
+        return frame_to_columns(data)
+    # 저장소가 같은 구간에서 다른 봉/값을 갖고 있으면 (다른 프로세스의 수정 등) DataFrame을 그대로 사용
+    if columns is None or not store_matches_frame(columns, data):
+        return frame_to_columns(data)
+    for col in data.columns:
+        if col not in OHLCV_COLUMNS:
+            columns[col.lower()] = data[col].to_numpy(dtype=np.float64)
+    return columns
+
+
+def fetch_many(tickers: List[str], period: str, interval: str,
+               date_range: Optional[DateRange] = None) -> Tuple[Dict[str, pd.DataFrame], Dict[str, dict]]:
+    """
+    여러 종목을 스레드 풀로 동시에 수집
+    - 종목별 실패는 errors에 {"error_type", "message"}로 모아서 반환 (일부 실패해도 나머지는 사용)
+    - 최근 실패한 조회는 내려받지 않고 기록된 오류로 바로 응답 (실패 조회 캐시)
+    - frames는 요청한 종목 순서를 유지
+    """
+    results: Dict[str, pd.DataFrame] = {}
+    errors: Dict[str, dict] = {}
+
+    pending = []
+    for ticker in tickers:
+        cached_error = failed_lookups.get(lookup_key(ticker, period, interval, date_range))
+        if cached_error is not None:
+            print(f"🚫 최근 실패한 조회 (네트워크 생략): {ticker} {period} {interval}")
+            errors[ticker] = cached_error
+        else:
+            pending.append(ticker)
+
+    def record_failure(ticker: str, error: dict):
+        errors[ticker] = error
+        ttl = NEGATIVE_TTL_BY_ERROR.get(error["error_type"], 0)
+        failed_lookups.put(lookup_key(ticker, period, interval, date_range), error, ttl)
+
+    if pending:
+        max_workers = max(1, min(config.FETCH_MAX_WORKERS, len(pending)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(fetch_history, ticker, period, interval, None, date_range): ticker for ticker in pending}
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    data = future.result()
+                except CircuitOpenError as e:
+                    print(f"🚧 요청 차단 ({ticker}): {str(e)}")
+                    record_failure(ticker, {"error_type": "rate_limited", "message": str(e)})
+                    continue
+                except SymbolNotFoundError as e:
+                    print(f"❌ 없는 종목: {ticker} ({str(e)})")
+                    record_failure(ticker, {"error_type": "not_found", "message": "데이터를 찾을 수 없습니다. 티커 심볼을 확인해주세요."})
+                    continue
+                except Exception as e:
+                    print(f"❌ yfinance 오류 ({ticker}): {str(e)}")
+                    record_failure(ticker, {"error_type": "download_error", "message": f"데이터 수집 중 오류가 발생했습니다: {str(e)}"})
+                    continue
+                if data.empty:
+                    print(f"❌ 데이터 없음: {ticker}")
+                    record_failure(ticker, {"error_type": "no_data", "message": "데이터를 찾을 수 없습니다. 티커 심볼을 확인해주세요."})
+                    continue
+                results[ticker] = data
+
+    frames = {ticker: results[ticker] for ticker in tickers if ticker in results}
+    return frames, errors
 
 
 def yfinance_node(state: State) -> State:
     """
     yfinance Node: 주식 데이터 수집 및 유효성 검증
-    - yfinance를 통한 데이터 다운로드
+    - yfinance를 통한 데이터 다운로드 (여러 종목은 동시 수집)
     - 무자료/제약 위반 체크 (interval-period 불일치 등)
+    - 첫 번째로 수집에 성공한 종목이 대표 종목, 나머지는 비교 종목
     """
     print("📊 yfinance Node 실행 중...")
     
     try:
         # 파라미터 추출
         chart_params = state.get("chart_params", {})
-        ticker = chart_params.get("ticker")
+        tickers = chart_params.get("tickers") or [chart_params.get("ticker")]
+        tickers = list(dict.fromkeys(t for t in tickers if t))  # 중복 제거, 순서 유지
         period = chart_params.get("period", "1y")
         interval = chart_params.get("interval", "1d")
         indicators = chart_params.get("indicators", [])
+        date_range = DateRange.from_params(chart_params)
+        if date_range is not None:
+            # 범위 조회: 범위를 덮는 가장 짧은 기간으로 분봉 조회 한도를 확인
+            period = period_covering(date_range.lookback_start(interval))
         
-        print(f"📈 데이터 수집: {ticker}, {period}, {interval}")
+        print(f"📈 데이터 수집: {', '.join(tickers)}, {date_range.label() if date_range else period}, {interval}")
         
-        # 1. 기간-간격 유효성 검증
-        if not validate_period_interval(period, interval):
+        # 1. 기간-간격 유효성 검증 (범위 조회의 일봉 이상은 기간 제약 없음)
+        if not validate_period_interval(period, interval) and (date_range is None or is_intraday(interval)):
             print(f"❌ 기간-간격 불일치: {period} + {interval}")
             return {
                 "data_available": False,
@@ -102,65 +397,68 @@ def yfinance_node(state: State) -> State:
             }
         
         # 2. yfinance로 데이터 다운로드
-        try:
-            stock = yf.Ticker(ticker)
-            data = stock.history(period=period, interval=interval)
-            
-            if data.empty:
-                print(f"❌ 데이터 없음: {ticker}")
+        frames, errors = fetch_many(tickers, period, interval, date_range)
+        
+        if not frames:
+            failed = ", ".join(f"'{ticker}'" for ticker in tickers)
+            rate_limited = [error["message"] for error in errors.values() if error["error_type"] == "rate_limited"]
+            if rate_limited:
+                return {
+                    "data_available": False,
+                    "chart_output": rate_limited[0],
+                    "error_type": "rate_limited"
+                }
+            download_errors = [error["message"] for error in errors.values() if error["error_type"] == "download_error"]
+            if download_errors:
                 return {
                     "data_available": False,
-                    "chart_output": f"'{ticker}' 주식 데이터를 찾을 수 없습니다. 티커 심볼을 확인해주세요.",
-                    "error_type": "no_data"
+                    "chart_output": f"{failed} " + "; ".join(download_errors),
+                    "error_type": "download_error"
                 }
-            
-            print(f"✅ 데이터 수집 성공: {len(data)}개 데이터 포인트")
-            
-        except Exception as e:
-            print(f"❌ yfinance 오류: {str(e)}")
             return {
                 "data_available": False,
-                "chart_output": f"데이터 수집 중 오류가 발생했습니다: {str(e)}",
-                "error_type": "download_error"
+                "chart_output": f"{failed} 주식 데이터를 찾을 수 없습니다. 티커 심볼을 확인해주세요.",
+                "error_type": "no_data"
             }
         
+        print(f"✅ 데이터 수집 성공: {', '.join(f'{t} {len(d)}개' for t, d in frames.items())}")
+        
         # 3. 데이터 전처리
         # 결측값 제거
-        data = data.dropna()
+        frames = {ticker: data.dropna() for ticker, data in frames.items()}
+        ticker, *compare_tickers = frames
+        data = frames[ticker]
         
-        # 4. 기술적 지표 계산
+        # 4. 기술적 지표 계산 (대표 종목)
         if indicators:
             print(f"📊 기술적 지표 계산: {indicators}")
             data = calculate_technical_indicators(data, indicators)
         
-        # 5. 데이터를 JSON 직렬화 가능한 형태로 변환
+        # 5. 데이터를 컬럼 배열 형태로 변환
         chart_data = {
             "ticker": ticker,
-            "period": period,
+            "tickers": list(frames),
+            "period": date_range.label() if date_range else period,
             "interval": interval,
             "chart_type": chart_params.get("chart_type", "candlestick"),
             "indicators": indicators,
-            "data": {
-                "dates": data.index.strftime("%Y-%m-%d %H:%M:%S").tolist(),
-                "open": data["Open"].tolist(),
-                "high": data["High"].tolist(),
-                "low": data["Low"].tolist(),
-                "close": data["Close"].tolist(),
-                "volume": data["Volume"].tolist()
-            }
+            "data": series_columns(ticker, interval, data),
+            "compare": {t: series_columns(t, interval, frames[t]) for t in compare_tickers},
+            "errors": errors
         }
         
-        # 기술적 지표 데이터 추가
-        for col in data.columns:
-            if col not in ["Open", "High", "Low", "Close", "Volume"]:
-                chart_data["data"][col.lower()] = data[col].tolist()
+        print(f"✅ 데이터 처리 완료: {len(data)}개 포인트, {len(indicators)}개 지표, 비교 종목 {len(compare_tickers)}개")
         
-        print(f"✅ 데이터 처리 완료: {len(data)}개 포인트, {len(indicators)}개 지표")
+        chart_output = f"{', '.join(repr(t) for t in frames)} 주식 데이터를 성공적으로 수집했습니다. ({len(data)}개 데이터 포인트)"
+        if errors:
+            chart_output += "\n⚠️ 수집 실패: " + ", ".join(f"'{t}' ({error['message']})" for t, error in errors.items())
         
         return {
             "data_available": True,
             "chart_data": chart_data,
-            "chart_output": f"'{ticker}' 주식 데이터를 성공적으로 수집했습니다. ({len(data)}개 데이터 포인트)"
+            "chart_output": chart_output,
+            "error_type": "",
+            "correction_attempts": 0
         }
         
     except Exception as e:
@@ -7,8 +7,12 @@ from ..schemas import State
 
 
 def should_route_to_chart(state: State) -> str:
-    """라우팅 조건: 차트 요청인지 확인"""
-    return "param_tool" if state.get("is_chart_request") else "general_chat"
+    """라우팅 조건: 차트 요청인지 확인 (통합 호출로 파라미터까지 추출했으면 param_tool 생략)"""
+    if not state.get("is_chart_request"):
+        return "general_chat"
+    if state.get("params_extracted"):
+        return should_request_params(state)
+    return "param_tool"
 
 
 def should_request_params(state: State) -> str:
@@ -21,6 +25,11 @@ def should_guide_correction(state: State) -> str:
     return "visualization_node" if state.get("data_available") else "guide_correction"
 
 
+def should_retry_after_correction(state: State) -> str:
+    """자동 보정이 적용되었으면 재수집, 아니면 종료 (재수집 횟수는 보정 단계에서 제한)"""
+    return "yfinance_node" if state.get("correction_applied") else END
+
+
 def should_enhance(state: State) -> str:
     """추가 편집 모드 확인"""
     return "enhance_node" if state.get("enhancement_mode") else END
@@ -5,6 +5,7 @@ from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.store.memory import InMemoryStore
 from ..schemas import State
+from ..data.columnar import ChartDataSerializer
 from ..agents.router_agent import router_agent
 from ..agents.general_chat_agent import general_chat_agent
 from ..tools.param_tool import param_tool, param_interrupt_handler
@@ -16,6 +17,7 @@ from .conditions import (
     should_route_to_chart,
     should_request_params,
     should_guide_correction,
+    should_retry_after_correction,
     should_enhance
 )
 
@@ -23,7 +25,7 @@ from .conditions import (
 def create_workflow():
     """LangGraph 워크플로우 생성"""
     # Checkpointer와 Store 설정
-    checkpointer = InMemorySaver()
+    checkpointer = InMemorySaver(serde=ChartDataSerializer())  # chart_data 배열을 원시 바이트로 저장
     store = InMemoryStore()
     
     workflow = (
@@ -42,7 +44,9 @@ def create_workflow():
         .add_edge(START, "router")
         .add_conditional_edges("router", should_route_to_chart, {
             "param_tool": "param_tool",
-            "general_chat": "general_chat"
+            "general_chat": "general_chat",
+            "yfinance_node": "yfinance_node",
+            "param_interrupt": "param_interrupt"
         })
         .add_edge("general_chat", END)
         .add_conditional_edges("param_tool", should_request_params, {
@@ -53,7 +57,10 @@ def create_workflow():
             "visualization_node": "visualization_node",
             "guide_correction": "guide_correction"
         })
-        .add_edge("guide_correction", "yfinance_node")  # 수정 후 데이터 재시도
+        .add_conditional_edges("guide_correction", should_retry_after_correction, {
+            "yfinance_node": "yfinance_node",  # 보정 후 데이터 재시도 (횟수 제한)
+            END: END
+        })
         .add_conditional_edges("visualization_node", should_enhance, {
             "enhance_node": "enhance_node",
             END: END
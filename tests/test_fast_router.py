@@ -0,0 +1,58 @@
+"""
+빠른 라우터 분류 테스트: 라벨을 붙인 메시지로 오분류가 없는지, 분명한 메시지는 LLM 없이 결정되는지 확인
+- ROUTER_FAST_MIN_CONFIDENCE나 어휘를 바꿀 때 LABELED_CASES에 사례를 추가해 기준을 조정
+"""
+from src import config
+from src.agents.fast_router import classify_fast
+
+# (메시지, 차트 요청 여부, 빠른 경로로 결정되어야 하는지)
+LABELED_CASES = [
+    ("NVDA 1년 봉차트", True, True),
+    ("엔비디아 주가 보여줘", True, True),
+    ("삼성전자 일봉 차트 보여줘", True, True),
+    ("draw TSLA candlestick 6mo", True, True),
+    ("MSFT vs AAPL 비교 차트", True, True),
+    ("캔들차트 그려줘", True, True),
+    ("이동평균선 20일 60일로 그려줘", True, True),
+    ("안녕하세요", False, True),
+    ("고마워", False, True),
+    ("hello", False, True),
+    # 애매한 메시지는 LLM에 맡겨야 함
+    ("show me a plot of sin(x)", False, False),
+    ("show me a graph of sin(x)", False, False),
+    ("sin(x) 그래프 그려줘", False, False),
+    ("엑셀 데이터로 차트 만드는 법", False, False),
+    ("RSI가 뭐야?", False, False),
+    ("애플 주식 사도 될까?", False, False),
+]
+
+
+def fast_decision(message: str):
+    """빠른 경로 결정 (임계값 미만이면 None → LLM 라우터)"""
+    route = classify_fast(message)
+    if route.is_chart_request is None or route.confidence < config.ROUTER_FAST_MIN_CONFIDENCE:
+        return None
+    return route.is_chart_request
+
+
+def test_fast_decisions_match_labels():
+    wrong = [(message, label, fast_decision(message)) for message, label, _ in LABELED_CASES
+             if fast_decision(message) not in (None, label)]
+    assert not wrong, f"빠른 경로 오분류: {wrong}"
+
+
+def test_clear_messages_skip_llm():
+    missed = [message for message, _, expect_fast in LABELED_CASES if expect_fast and fast_decision(message) is None]
+    assert not missed, f"LLM으로 넘어간 분명한 메시지: {missed}"
+
+
+def test_ambiguous_messages_go_to_llm():
+    decided = [message for message, _, expect_fast in LABELED_CASES if not expect_fast and fast_decision(message) is not None]
+    assert not decided, f"빠른 경로로 결정된 애매한 메시지: {decided}"
+
+
+def test_generic_visualization_without_ticker_is_not_a_chart_request():
+    # "plot"은 표시 요청 표현일 뿐 차트 용어로 중복 계산하지 않음
+    route = classify_fast("show me a plot of sin(x)")
+    assert route.is_chart_request is None
+    assert route.confidence < config.ROUTER_FAST_MIN_CONFIDENCE
@@ -0,0 +1,57 @@
+"""
+지표 파라미터 검증 테스트 (잘못된 창 길이는 지원하지 않는 지표로 처리)
+"""
+import numpy as np
+import pandas as pd
+from src.indicators.registry import compute_indicators, parse_indicator_spec
+from src.tools.param_tool import apply_window_params
+from src.tools.slash_commands import parse_slash_command
+
+
+def close_frame(bars: int = 51) -> pd.DataFrame:
+    index = pd.date_range("2024-01-02", periods=bars, freq="D")
+    close = np.linspace(100.0, 150.0, bars)
+    return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1, "Close": close,
+                         "Volume": np.full(bars, 1000)}, index=index)
+
+
+def test_invalid_windows_are_unsupported():
+    for spec in ("MA(0)", "RSI(0)", "EMA(0)", "MA(2.5)", "MA(-5)", "MA0", "Bollinger(20,0)", "MACD(12,0,9)"):
+        assert parse_indicator_spec(spec) == (None, {}), spec
+
+
+def test_valid_windows_still_parse():
+    assert parse_indicator_spec("MA(20,60)")[1] == {"windows": (20, 60)}
+    assert parse_indicator_spec("MA(20.0)")[1] == {"windows": (20,)}
+    assert parse_indicator_spec("Bollinger(20,2.5)")[1] == {"window": 20, "num_std": 2.5}
+
+
+def test_compute_indicators_skips_invalid_windows():
+    data = close_frame()
+    result = compute_indicators(data, ["MA(0)", "RSI(0)", "EMA(0)", "MA(2.5)", "RSI(14)"])
+    assert list(result.columns) == list(data.columns) + ["RSI"]
+
+
+def test_window_params_ignore_invalid_values():
+    assert apply_window_params(["MA"], [0], None) == ["MA"]
+    assert apply_window_params(["MA"], [0, 20], None) == ["MA(20)"]
+
+
+def test_slash_edit_rejects_invalid_window():
+    assert parse_slash_command("/edit add ma 0").kind == "invalid"
+    assert parse_slash_command("/edit add ma 2.5").kind == "invalid"
+    assert parse_slash_command("/edit add ma 20").edit.actions[0].indicator == "MA(20)"
+
+
+def test_kernels_reject_windows_below_one():
+    from src.indicators import kernels
+    close = close_frame()["Close"].to_numpy()
+    for call in (lambda: kernels.rolling_mean(close, 0), lambda: kernels.rolling_means(close, (20, 0)),
+                 lambda: kernels.rolling_std(close, 0), lambda: kernels.rolling_max(close, 0),
+                 lambda: kernels.rolling_min(close, -1), lambda: kernels.ewm_mean(close, span=0)):
+        try:
+            call()
+        except ValueError as e:
+            assert ">= 1" in str(e)
+        else:
+            raise AssertionError("ValueError not raised")
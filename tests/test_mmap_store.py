@@ -0,0 +1,84 @@
+"""
+메모리 맵 시계열 저장소 테스트 (진행 중 봉 꼬리 기록, 세대 재작성)
+"""
+import json
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from src.data.mmap_store import MmapSeriesStore
+
+
+def minute_frame(bars: int, start: str = "2024-01-02 14:30", close_offset: float = 0.0) -> pd.DataFrame:
+    index = pd.date_range(start, periods=bars, freq="min", tz="UTC")
+    close = np.arange(bars, dtype=np.float64) + 100.0
+    close[-1] += close_offset
+    return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1, "Close": close,
+                         "Volume": np.full(bars, 1000)}, index=index)
+
+
+def store_files(store: MmapSeriesStore) -> dict:
+    directory = store._dir("AAPL", "1m")
+    with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    sizes = {name: os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)
+             if name.endswith(".bin")}
+    return {"meta": meta, "sizes": sizes}
+
+
+def test_updated_last_bar_only_rewrites_tail():
+    with tempfile.TemporaryDirectory() as root:
+        store = MmapSeriesStore(root)
+        store.append("AAPL", "1m", minute_frame(1000))
+        before = store_files(store)
+        view = store.read("AAPL", "1m")
+
+        # 같은 구간, 마지막(진행 중) 봉 값만 바뀜
+        assert store.append("AAPL", "1m", minute_frame(1000, close_offset=0.5)) == 0
+        after = store_files(store)
+        assert after["meta"]["generation"] == before["meta"]["generation"]
+        assert after["meta"]["rows"] == before["meta"]["rows"] == 999
+        assert after["sizes"] == before["sizes"]
+        assert after["meta"]["tail"]["close"] == 1099.5
+
+        # 이미 나간 뷰는 그대로, 새로 읽으면 갱신된 꼬리 봉
+        assert view["close"][-1] == 1099.0
+        assert store.read("AAPL", "1m")["close"][-1] == 1099.5
+
+
+def test_next_bar_commits_previous_tail():
+    with tempfile.TemporaryDirectory() as root:
+        store = MmapSeriesStore(root)
+        store.append("AAPL", "1m", minute_frame(1000))
+        store.append("AAPL", "1m", minute_frame(1000, close_offset=0.5))
+        assert store.append("AAPL", "1m", minute_frame(1001)) == 1
+        files = store_files(store)
+        assert files["meta"]["generation"] == 0
+        assert files["meta"]["rows"] == 1000
+        columns = store.read("AAPL", "1m")
+        assert len(columns["dates"]) == store.rows("AAPL", "1m") == 1001
+        # 마감된 봉은 새 시세의 값으로 커밋
+        assert columns["close"][999] == 1099.0
+
+
+def test_read_bounds_include_tail():
+    with tempfile.TemporaryDirectory() as root:
+        store = MmapSeriesStore(root)
+        data = minute_frame(10)
+        store.append("AAPL", "1m", data)
+        assert list(store.read("AAPL", "1m", bars=3)["close"]) == [107.0, 108.0, 109.0]
+        assert list(store.read("AAPL", "1m", bars=1)["close"]) == [109.0]
+        assert len(store.read("AAPL", "1m", end=data.index[-1])["dates"]) == 9
+
+
+def test_changed_closed_bar_rewrites_new_generation():
+    with tempfile.TemporaryDirectory() as root:
+        store = MmapSeriesStore(root)
+        store.append("AAPL", "1m", minute_frame(10))
+        view = store.read("AAPL", "1m")
+        adjusted = minute_frame(10)
+        adjusted[["Open", "High", "Low", "Close"]] *= 0.5
+        store.append("AAPL", "1m", adjusted)
+        assert store_files(store)["meta"]["generation"] == 1
+        assert view["close"][0] == 100.0
+        assert store.read("AAPL", "1m")["close"][0] == 50.0
@@ -0,0 +1,47 @@
+"""
+조회 범위(DateRange) 해석과 자르기 테스트
+"""
+import pandas as pd
+from src.data.periods import DateRange, slice_range
+
+
+def daily_frame(tz: str, start: str = "2023-02-27", days: int = 8) -> pd.DataFrame:
+    """거래소 현지 자정 기준 일봉 (yfinance 일봉 인덱스 형태)"""
+    index = pd.date_range(start, periods=days, freq="D", tz=tz)
+    return pd.DataFrame({"Close": range(days)}, index=index)
+
+
+def test_date_only_range_uses_exchange_local_dates_krx():
+    # KRX 일봉 D의 시각은 D-1 15:00Z → UTC 자정으로 자르면 첫날이 빠지고 다음 날이 들어옴
+    data = daily_frame("Asia/Seoul")
+    date_range = DateRange.from_params({"start": "2023-03-01", "end": "2023-03-03"})
+    sliced = slice_range(data, date_range)
+    assert [d.strftime("%Y-%m-%d") for d in sliced.index] == ["2023-03-01", "2023-03-02", "2023-03-03"]
+
+
+def test_date_only_range_us_exchange():
+    data = daily_frame("America/New_York")
+    sliced = slice_range(data, DateRange.from_params({"start": "2023-03-01", "end": "2023-03-03"}))
+    assert [d.strftime("%Y-%m-%d") for d in sliced.index] == ["2023-03-01", "2023-03-02", "2023-03-03"]
+
+
+def test_fetch_bounds_cover_local_dates():
+    # 수집 경계는 UTC로, 어느 거래소든 현지 날짜 전체가 들어오도록 넓게
+    date_range = DateRange.from_params({"start": "2023-03-01", "end": "2023-03-03"})
+    first_krx_bar = pd.Timestamp("2023-03-01", tz="Asia/Seoul")
+    last_krx_bar = pd.Timestamp("2023-03-03", tz="Asia/Seoul")
+    assert date_range.fetch_start() <= first_krx_bar
+    assert date_range.lookback_start("1d") <= first_krx_bar
+    assert date_range.fetch_end() > last_krx_bar
+
+
+def test_timestamp_bounds_are_utc():
+    data = daily_frame("Asia/Seoul")
+    date_range = DateRange.from_params({"start": "2023-02-28T15:00:00Z"})
+    assert slice_range(data, date_range).index[0].strftime("%Y-%m-%d") == "2023-03-01"
+
+
+def test_bars_with_date_only_end():
+    data = daily_frame("Asia/Seoul")
+    sliced = slice_range(data, DateRange.from_params({"end": "2023-03-03", "bars": 2}))
+    assert [d.strftime("%Y-%m-%d") for d in sliced.index] == ["2023-03-02", "2023-03-03"]
@@ -0,0 +1,15 @@
+"""
+리샘플링 원본 간격 선택 테스트 (일봉 이상은 직접 수집)
+"""
+from src.data.resample import resample_sources
+
+
+def test_daily_and_longer_are_never_resampled():
+    for interval in ("1d", "5d", "1wk", "1mo", "3mo"):
+        assert resample_sources(interval) == [], interval
+
+
+def test_intraday_sources_divide_target():
+    assert resample_sources("1h") == ["30m", "15m", "5m", "2m", "1m"]
+    assert resample_sources("4h")[0] == "1h"
+    assert resample_sources("1m") == []
@@ -0,0 +1,17 @@
+"""
+LLM이 추출한 종목 정규화 테스트 (모호한 이름은 후보로 되묻기)
+"""
+from src.tools.param_tool import resolve_tickers
+
+
+def test_ambiguous_ascii_name_is_unresolved():
+    resolved, unresolved = resolve_tickers(["samsung"])
+    assert resolved == []
+    # 대문자 "SAMSUNG"을 심볼로 받아들이지 않고 삼성 계열 후보를 돌려줌
+    assert unresolved["samsung"] and all(ticker.endswith(".KS") for ticker in unresolved["samsung"])
+
+
+def test_symbols_and_known_names_resolve():
+    resolved, unresolved = resolve_tickers(["AAPL", "aapl", "엔비디아", "005930", "PLTR"])
+    assert resolved == ["AAPL", "NVDA", "005930.KS", "PLTR"]
+    assert unresolved == {}